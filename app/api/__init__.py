@@ -0,0 +1,6 @@
+"""헤드리스 영상 / 판독 HTTP API (python -m api)
+
+Streamlit UI 없이 RIS · 워크리스트 도구 등에서 스터디 업로드, 뷰 렌더링,
+LLM 판독을 호출하기 위한 서비스. 디코딩 · 렌더링은 코어 수만큼의 프로세스
+풀에서, LLM 호출은 요청 스레드에서 실행한다.
+"""
@@ -0,0 +1,72 @@
+"""헤드리스 영상 / 판독 API 실행
+
+Usage (app/ 디렉터리에서):
+    python -m api                                  # 127.0.0.1:8600, 워커 = 코어 수
+    python -m api --host 0.0.0.0 --port 8600 --workers 8 --cache-dir /cache
+
+    curl -X POST --data-binary @ct.nii.gz "localhost:8600/studies?filename=ct.nii.gz"
+    curl -o a.webp "localhost:8600/studies/<id>/render?plane=axial&index=60&preset=Lung&format=webp"
+    curl -N -d '{"provider": "Fake", "stream": true}' localhost:8600/studies/<id>/analyze
+"""
+
+import argparse
+import os
+import signal
+import sys
+import tempfile
+import threading
+
+# 앱 루트를 sys.path에 추가 (core / llm 임포트 보장)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.server import ApiService, make_server  # noqa: E402
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m api", description="헤드리스 영상 / 판독 HTTP API")
+    parser.add_argument("--host", default=os.getenv("API_HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("API_PORT", "8600")))
+    parser.add_argument("--workers", type=int, default=int(os.getenv("API_WORKERS", "0")),
+                        help="디코딩 / 렌더링 프로세스 수 (0이면 코어 수)")
+    parser.add_argument(
+        "--cache-dir",
+        default=os.getenv("API_CACHE_DIR") or os.path.join(tempfile.gettempdir(), "medical-api-cache"),
+        help="스터디 볼륨 캐시 폴더",
+    )
+    parser.add_argument("--cache-mb", type=int, default=int(os.getenv("API_CACHE_MB", "20480")),
+                        help="캐시 볼륨 합계 상한 (MB, 초과 시 오래된 스터디부터 삭제)")
+    parser.add_argument("--volume-cache", type=int, default=int(os.getenv("API_VOLUME_CACHE", "8")),
+                        help="워커별로 열어 두는 볼륨 수 (mmap)")
+    parser.add_argument("--max-upload-mb", type=int,
+                        default=int(os.getenv("API_MAX_UPLOAD_MB", "2048")))
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    service = ApiService(
+        args.cache_dir,
+        workers_count=args.workers or os.cpu_count() or 1,
+        cache_bytes=args.cache_mb * 1024 * 1024,
+        volume_cache=args.volume_cache,
+        task_timeout=float(os.getenv("API_TASK_TIMEOUT", "300")),
+        llm_retries=int(os.getenv("API_LLM_RETRIES", "2")),
+    )
+    service.warm_up()
+    server = make_server(service, args.host, args.port, args.max_upload_mb * 1024 * 1024)
+    print(f"API: http://{args.host}:{server.server_address[1]} "
+          f"(워커 {service.workers_count}, 캐시 {args.cache_dir})", flush=True)
+    # docker stop(SIGTERM) → serve_forever 종료 후 워커 정리
+    signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=server.shutdown).start())
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,448 @@
+"""헤드리스 HTTP API 서버 (표준 라이브러리 ``ThreadingHTTPServer``)
+
+엔드포인트:
+  GET  /health
+  POST /studies?filename=<이름>          본문 = .nii / .nii.gz / .zip(DICOM 시리즈) / .dcm
+  GET  /studies/<id>                     메타데이터 (종류, 크기, 간격, 기본 W/L)
+  GET  /studies/<id>/render              plane, index, wc, ww | preset, format(png|webp), quality
+  POST /studies/<id>/analyze             JSON {provider, model, prompt | template, stream, ...}
+
+디코딩 · 렌더링은 ``ProcessPoolExecutor``(spawn, 기본 코어 수)에서 실행하고,
+LLM 호출은 요청 스레드에서 공급자별 limiter(``llm.rate_limit``)를 거쳐
+실행한다. ``stream: true``면 판독을 SSE(``text/event-stream``)로 보낸다.
+
+인증이 없으므로 내부 네트워크에서만 노출한다.
+"""
+
+import hashlib
+import json
+import multiprocessing
+import os
+import re
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlparse
+
+from . import workers
+from .store import StudyStore
+
+_STUDY_RE = re.compile(r"^/studies/([^/]+)(?:/(render|analyze))?$")
+
+
+class ApiError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class ApiService:
+    """프로세스 풀 + 스터디 캐시 (HTTP 처리와 분리)"""
+
+    def __init__(
+        self,
+        cache_dir: str,
+        workers_count: int,
+        cache_bytes: int,
+        volume_cache: int = 8,
+        task_timeout: float = 300.0,
+        llm_retries: int = 2,
+    ):
+        self.store = StudyStore(cache_dir, cache_bytes)
+        self.workers_count = workers_count
+        self.volume_cache = volume_cache
+        self.task_timeout = task_timeout
+        self.llm_retries = llm_retries
+        self._pool_lock = threading.Lock()
+        self._ingest_lock = threading.Lock()
+        self._ingesting: dict = {}   # study_id → Future (같은 파일 동시 업로드 병합)
+        self._pool = self._new_pool()
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        # fork는 요청 스레드 / HTTP 클라이언트 상태를 복제하므로 spawn 사용
+        return ProcessPoolExecutor(
+            max_workers=self.workers_count,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=workers.init_worker,
+            initargs=(self.store.root, self.volume_cache),
+        )
+
+    def submit(self, fn, *args):
+        with self._pool_lock:
+            pool = self._pool
+        try:
+            return pool.submit(fn, *args)
+        except BrokenProcessPool:
+            self._restart(pool)
+            raise ApiError(503, "워커 프로세스가 재시작되었습니다. 다시 시도하세요.")
+
+    def run(self, fn, *args):
+        """풀에서 실행 후 결과 대기 (워커 비정상 종료 시 풀 재생성 → 503)"""
+        future = self.submit(fn, *args)
+        try:
+            return future.result(timeout=self.task_timeout)
+        except BrokenProcessPool:
+            self._restart(self._pool)
+            raise ApiError(503, "워커 프로세스가 재시작되었습니다. 다시 시도하세요.")
+
+    def _restart(self, broken: ProcessPoolExecutor) -> None:
+        with self._pool_lock:
+            if self._pool is broken:
+                self._pool = self._new_pool()
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def warm_up(self) -> None:
+        """워커를 미리 띄우고 렌더러 로드 (첫 요청의 spawn / 임포트 지연 제거)"""
+        futures = [self.submit(workers.warm) for _ in range(self.workers_count)]
+        for future in futures:
+            future.result()
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    # ── 스터디 ─────────────────────────────────────────────────────────────
+    def ingest(self, path: str, filename: str, study_id: str) -> dict:
+        with self._ingest_lock:
+            future = self._ingesting.get(study_id)
+            if future is None:
+                future = self.submit(workers.ingest, path, filename, study_id)
+                self._ingesting[study_id] = future
+        try:
+            meta = future.result(timeout=self.task_timeout)
+        except BrokenProcessPool:
+            self._restart(self._pool)
+            raise ApiError(503, "워커 프로세스가 재시작되었습니다. 다시 시도하세요.")
+        except ApiError:
+            raise
+        except Exception as e:
+            raise ApiError(400, f"스터디 디코딩 실패: {type(e).__name__}: {e}")
+        finally:
+            with self._ingest_lock:
+                if self._ingesting.get(study_id) is future:
+                    self._ingesting.pop(study_id, None)
+        if self.store.get(study_id) is None:
+            self.store.put(meta)
+        return meta
+
+    def study(self, study_id: str) -> dict:
+        meta = self.store.get(study_id)
+        if meta is None:
+            raise ApiError(404, f"스터디 없음: {study_id}")
+        return meta
+
+
+def _view_params(meta: dict, query: dict) -> dict:
+    """render / analyze 공통 — W/L(preset 우선)과 평면별 기본 인덱스(중앙)"""
+    from core.image_processor import get_window_presets
+
+    def number(name, cast, default):
+        value = query.get(name)
+        if value is None or value == "":
+            return default
+        try:
+            return cast(value)
+        except (TypeError, ValueError):
+            raise ApiError(400, f"{name} 값이 잘못되었습니다: {value}")
+
+    wc, ww = meta["window"]
+    preset = query.get("preset")
+    if preset:
+        presets = get_window_presets()
+        if preset not in presets:
+            raise ApiError(400, f"알 수 없는 preset: {preset} (가능: {', '.join(presets)})")
+        wc, ww = presets[preset]
+    n_z, n_y, n_x = meta["shape"]
+    return {
+        "wc": number("wc", float, float(wc)),
+        "ww": max(1.0, number("ww", float, float(ww))),
+        "axial": number("axial", int, n_z // 2),
+        "sagittal": number("sagittal", int, n_x // 2),
+        "coronal": number("coronal", int, n_y // 2),
+    }
+
+
+def _default_prompt(kind: str, language: str) -> str:
+    from utils.prompt_templates import PROMPT_TEMPLATES
+
+    modality = "X-ray" if kind == "xray" else "CT"
+    return PROMPT_TEMPLATES[f"{modality} ({'한국어' if language == 'ko' else 'English'})"]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    service: ApiService = None          # make_server에서 서브클래스로 지정
+    max_upload_bytes: int = 0
+
+    def log_message(self, fmt, *args):  # 요청별 stderr 로그 끔
+        pass
+
+    # ── 응답 헬퍼 ──────────────────────────────────────────────────────────
+    def _send(self, status: int, body: bytes, content_type: str, headers: Optional[dict] = None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _send_json(self, status: int, payload: dict) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self._send(status, body, "application/json; charset=utf-8")
+
+    def _read_json(self) -> dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        try:
+            payload = json.loads(self.rfile.read(length))
+        except ValueError:
+            raise ApiError(400, "JSON 본문을 해석할 수 없습니다")
+        if not isinstance(payload, dict):
+            raise ApiError(400, "JSON 객체가 필요합니다")
+        return payload
+
+    def _dispatch(self, route) -> None:
+        try:
+            route()
+        except ApiError as e:
+            self._send_json(e.status, {"error": str(e)})
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+        except Exception as e:
+            self._send_json(500, {"error": f"{type(e).__name__}: {e}"})
+
+    # ── 라우팅 ─────────────────────────────────────────────────────────────
+    def do_GET(self):
+        self._dispatch(self._route_get)
+
+    def do_POST(self):
+        self._dispatch(self._route_post)
+
+    def _route_get(self) -> None:
+        url = urlparse(self.path)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        if url.path == "/health":
+            self._send_json(200, {"status": "ok", "workers": self.service.workers_count})
+            return
+        match = _STUDY_RE.match(url.path)
+        if match and match.group(2) is None:
+            self._send_json(200, self.service.study(match.group(1)))
+        elif match and match.group(2) == "render":
+            self._render(match.group(1), query)
+        else:
+            raise ApiError(404, f"경로 없음: {url.path}")
+
+    def _route_post(self) -> None:
+        url = urlparse(self.path)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        if url.path == "/studies":
+            self._upload(query)
+            return
+        match = _STUDY_RE.match(url.path)
+        if match and match.group(2) == "analyze":
+            self._analyze(match.group(1))
+        else:
+            raise ApiError(404, f"경로 없음: {url.path}")
+
+    # ── 스터디 업로드 ──────────────────────────────────────────────────────
+    def _upload(self, query: dict) -> None:
+        filename = query.get("filename") or self.headers.get("X-Filename") or "study.dcm"
+        length = self.headers.get("Content-Length")
+        if length is None:
+            raise ApiError(411, "Content-Length가 필요합니다")
+        length = int(length)
+        if length > self.max_upload_bytes:
+            self.close_connection = True   # 본문을 읽지 않았으므로 연결 재사용 불가
+            raise ApiError(413, f"업로드 상한 초과 ({self.max_upload_bytes // (1024 * 1024)}MB)")
+
+        # 본문을 디스크로 바로 기록하며 해시 → 같은 내용이면 디코딩 생략
+        store = self.service.store
+        path = store.new_upload()
+        digest = hashlib.sha256()
+        try:
+            with open(path, "wb") as f:
+                remaining = length
+                while remaining:
+                    chunk = self.rfile.read(min(remaining, 1 << 20))
+                    if not chunk:
+                        raise ApiError(400, "업로드 본문이 중간에 끊겼습니다")
+                    digest.update(chunk)
+                    f.write(chunk)
+                    remaining -= len(chunk)
+            study_id = digest.hexdigest()[:24]
+            meta = store.get(study_id)
+            if meta is not None:
+                self._send_json(200, {**meta, "cached": True})
+                return
+            meta = self.service.ingest(path, filename, study_id)
+            self._send_json(201, {**meta, "cached": False})
+        finally:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+    # ── 뷰 렌더링 ──────────────────────────────────────────────────────────
+    def _render(self, study_id: str, query: dict) -> None:
+        meta = self.service.study(study_id)
+        plane = query.get("plane", "axial")
+        fmt = query.get("format", "png").lower()
+        if plane not in workers.PLANES + ("3plane",):
+            raise ApiError(400, f"plane은 axial / sagittal / coronal / 3plane 중 하나입니다: {plane}")
+        if fmt not in ("png", "webp"):
+            raise ApiError(400, f"format은 png / webp 중 하나입니다: {fmt}")
+        try:
+            quality = min(100, max(1, int(query.get("quality", 90))))
+        except ValueError:
+            raise ApiError(400, f"quality 값이 잘못되었습니다: {query.get('quality')}")
+
+        params = _view_params(meta, {**query, plane: query.get("index", query.get(plane))})
+        if plane in workers.PLANES and meta["kind"] == "ct":
+            n_z, n_y, n_x = meta["shape"]
+            size = {"axial": n_z, "sagittal": n_x, "coronal": n_y}[plane]
+            if not 0 <= params[plane] < size:
+                raise ApiError(400, f"{plane} index 범위: 0 ~ {size - 1}")
+
+        # study_id는 내용 해시라 같은 파라미터의 결과는 변하지 않음 → ETag
+        key = (f"{study_id}:{plane}:{params[plane] if plane in params else '-'}:"
+               f"{params['wc']:g}:{params['ww']:g}:{fmt}:{quality}")
+        if plane == "3plane":
+            key += f":{params['axial']}:{params['sagittal']}:{params['coronal']}"
+        etag = '"' + hashlib.sha1(key.encode()).hexdigest()[:20] + '"'
+        cache_headers = {"ETag": etag, "Cache-Control": "private, max-age=86400"}
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            for k, v in cache_headers.items():
+                self.send_header(k, v)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        self.service.store.touch(study_id)
+        if plane == "3plane":
+            body = self.service.run(
+                workers.render_overview, study_id, meta["kind"],
+                (params["axial"], params["sagittal"], params["coronal"]),
+                params["wc"], params["ww"],
+            )
+            fmt = "png"
+        else:
+            body = self.service.run(
+                workers.render_view, study_id, meta["kind"], plane, params[plane],
+                params["wc"], params["ww"], fmt, quality,
+            )
+        self._send(200, body, f"image/{fmt}", cache_headers)
+
+    # ── 판독 ───────────────────────────────────────────────────────────────
+    def _analyze(self, study_id: str) -> None:
+        from llm.factory import create_client
+        from llm.rate_limit import get_provider_limiter
+        from llm.retry import call_with_retry, get_status_code
+        from utils.prompt_templates import PROMPT_TEMPLATES
+
+        body = self._read_json()
+        meta = self.service.study(study_id)
+        provider = body.get("provider", "GPT")
+        params = {k: body[k] for k in ("model", "temperature") if body.get(k) is not None}
+        try:
+            client = create_client(provider, **params)
+        except ValueError as e:
+            raise ApiError(400, str(e))
+
+        template = body.get("template")
+        if template and template not in PROMPT_TEMPLATES:
+            raise ApiError(400, f"알 수 없는 template: {template} (가능: {', '.join(PROMPT_TEMPLATES)})")
+        prompt = (
+            body.get("prompt")
+            or (PROMPT_TEMPLATES[template] if template else None)
+            or _default_prompt(meta["kind"], body.get("language", "en"))
+        )
+
+        view = _view_params(meta, {k: body.get(k) for k in
+                                   ("wc", "ww", "preset", "axial", "sagittal", "coronal")})
+        self.service.store.touch(study_id)
+        image = self.service.run(
+            workers.render_overview, study_id, meta["kind"],
+            (view["axial"], view["sagittal"], view["coronal"]), view["wc"], view["ww"],
+        )
+        limiter = get_provider_limiter(provider)
+        started = time.perf_counter()
+        result = {"study_id": study_id, "provider": provider, "model": client.model_name}
+
+        if body.get("stream"):
+            self._stream_analysis(client, limiter, image, prompt, result, started)
+            return
+
+        def call() -> str:
+            with limiter.slot():
+                return client.analyze(image, prompt)
+
+        try:
+            report, attempts = call_with_retry(call, max_retries=self.service.llm_retries)
+        except Exception as e:
+            self._send_json(502, {
+                **result,
+                "error": f"{type(e).__name__}: {e}",
+                "status_code": get_status_code(e),
+            })
+            return
+        self._send_json(200, {
+            **result,
+            "report": report,
+            "attempts": attempts,
+            "elapsed_s": round(time.perf_counter() - started, 3),
+        })
+
+    def _stream_analysis(self, client, limiter, image, prompt, result, started) -> None:
+        """SSE: data {"text"} 반복 → event done (또는 error). 연결이 끊기면 스트림 중단"""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream; charset=utf-8")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        def event(payload: dict, name: Optional[str] = None) -> None:
+            prefix = f"event: {name}\n" if name else ""
+            data = json.dumps(payload, ensure_ascii=False)
+            self.wfile.write(f"{prefix}data: {data}\n\n".encode("utf-8"))
+            self.wfile.flush()
+
+        event(result, "start")
+        with limiter.slot():
+            stream = client.stream_analyze(image, prompt)
+            try:
+                chars = 0
+                for chunk in stream:
+                    if chunk:
+                        chars += len(chunk)
+                        event({"text": chunk})
+                event({"chars": chars, "elapsed_s": round(time.perf_counter() - started, 3)}, "done")
+            except (BrokenPipeError, ConnectionResetError):
+                pass   # 클라이언트가 끊음 → finally에서 스트림 닫기 (텔레메트리는 cancelled)
+            except Exception as e:
+                event({"error": f"{type(e).__name__}: {e}"}, "error")
+            finally:
+                close = getattr(stream, "close", None)
+                if close is not None:
+                    close()
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+def make_server(
+    service: ApiService, host: str, port: int, max_upload_bytes: int
+) -> ThreadingHTTPServer:
+    handler = type("Handler", (_Handler,), {
+        "service": service,
+        "max_upload_bytes": max_upload_bytes,
+    })
+    return _Server((host, port), handler)
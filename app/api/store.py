@@ -0,0 +1,107 @@
+"""스터디 디스크 캐시 (볼륨 .npy + 메타데이터 .json)
+
+업로드된 스터디는 워커가 디코딩해 ``<study_id>.npy``(float32, Z x Y x X)로
+저장한다. study_id는 업로드 내용의 SHA-256 앞부분이라 같은 파일을 다시
+올리면 디코딩 없이 기존 스터디를 돌려준다. 전체 .npy 크기가 상한을 넘으면
+가장 오래 사용하지 않은 스터디부터 지운다.
+"""
+
+import json
+import os
+import re
+import tempfile
+import threading
+from typing import Dict, Optional
+
+_ID_RE = re.compile(r"^[0-9a-f]{24}$")
+
+
+def volume_path(root: str, study_id: str) -> str:
+    return os.path.join(root, f"{study_id}.npy")
+
+
+def meta_path(root: str, study_id: str) -> str:
+    return os.path.join(root, f"{study_id}.json")
+
+
+class StudyStore:
+    def __init__(self, root: str, max_bytes: int):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._meta: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(root, "uploads"), exist_ok=True)
+
+    @staticmethod
+    def valid_id(study_id: str) -> bool:
+        return bool(_ID_RE.match(study_id))
+
+    def new_upload(self, suffix: str = "") -> str:
+        """업로드 본문을 받을 임시 파일 경로"""
+        fd, path = tempfile.mkstemp(suffix=suffix, dir=os.path.join(self.root, "uploads"))
+        os.close(fd)
+        return path
+
+    def get(self, study_id: str) -> Optional[dict]:
+        if not self.valid_id(study_id):
+            return None
+        with self._lock:
+            meta = self._meta.get(study_id)
+        if meta is not None:
+            return meta if os.path.exists(volume_path(self.root, study_id)) else None
+        try:
+            with open(meta_path(self.root, study_id)) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not os.path.exists(volume_path(self.root, study_id)):
+            return None
+        with self._lock:
+            self._meta[study_id] = meta
+        return meta
+
+    def put(self, meta: dict) -> None:
+        """워커가 볼륨을 저장한 뒤 메타데이터 기록 + 용량 정리"""
+        study_id = meta["study_id"]
+        tmp = meta_path(self.root, study_id) + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(tmp, meta_path(self.root, study_id))
+        with self._lock:
+            self._meta[study_id] = meta
+        self.evict(keep=study_id)
+
+    def touch(self, study_id: str) -> None:
+        """최근 사용 시각 갱신 (정리 순서 기준)"""
+        try:
+            os.utime(volume_path(self.root, study_id))
+        except OSError:
+            pass
+
+    def evict(self, keep: Optional[str] = None) -> None:
+        """.npy 합계가 max_bytes를 넘으면 오래 사용하지 않은 스터디부터 삭제
+
+        워커가 이미 mmap으로 연 볼륨은 삭제 후에도 매핑이 유지된다.
+        """
+        entries = []
+        for name in os.listdir(self.root):
+            if name.endswith(".npy"):
+                try:
+                    st = os.stat(os.path.join(self.root, name))
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, name[:-4]))
+        total = sum(size for _, size, _ in entries)
+        for _, size, study_id in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if study_id == keep:
+                continue
+            for path in (volume_path(self.root, study_id), meta_path(self.root, study_id)):
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+            with self._lock:
+                self._meta.pop(study_id, None)
+            total -= size
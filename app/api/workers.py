@@ -0,0 +1,160 @@
+"""프로세스 풀 작업 (디코딩 / 뷰 렌더링 / LLM 입력 렌더링)
+
+워커 프로세스에서 실행된다. 볼륨은 ``StudyStore``가 저장한 .npy를 읽기 전용
+mmap으로 열어 워커별 LRU에 보관한다. 페이지는 OS 페이지 캐시를 거치므로
+같은 스터디를 여러 워커가 렌더링해도 메모리에는 한 번만 올라간다.
+"""
+
+import os
+from collections import OrderedDict
+from io import BytesIO
+from typing import Optional, Tuple
+
+import numpy as np
+
+from core.ct_volume import get_axial_slice, get_coronal_slice, get_sagittal_slice
+from core.image_processor import apply_windowing, get_window_presets
+
+from .store import volume_path
+
+PLANES = ("axial", "sagittal", "coronal")
+
+_cache_dir: Optional[str] = None
+_cache_size = 8
+_volumes: "OrderedDict[str, np.ndarray]" = OrderedDict()
+
+
+def init_worker(cache_dir: str, cache_size: int) -> None:
+    """풀 initializer — 캐시 위치 / 워커별 mmap LRU 크기 설정"""
+    global _cache_dir, _cache_size
+    _cache_dir = cache_dir
+    _cache_size = max(1, cache_size)
+
+
+def warm() -> int:
+    """matplotlib / Agg / 폰트 캐시를 미리 로드 (첫 3-plane 렌더 지연 제거)"""
+    from core.renderer import render_xray_png
+
+    render_xray_png(np.zeros((8, 8), dtype=np.uint8))
+    return os.getpid()
+
+
+def _volume(study_id: str) -> np.ndarray:
+    volume = _volumes.get(study_id)
+    if volume is not None:
+        _volumes.move_to_end(study_id)
+        return volume
+    volume = np.load(volume_path(_cache_dir, study_id), mmap_mode="r")
+    _volumes[study_id] = volume
+    while len(_volumes) > _cache_size:
+        _volumes.popitem(last=False)
+    return volume
+
+
+def _decode(path: str, filename: str) -> Tuple[str, np.ndarray, tuple, tuple]:
+    """업로드 파일 → (종류, 볼륨, 간격, 기본 W/L)"""
+    from core.dicom_loader import (
+        extract_pixel_array,
+        get_window_defaults,
+        load_ct_series,
+        load_nifti,
+        load_xray,
+    )
+
+    name = filename.lower()
+    with open(path, "rb") as f:
+        data = f.read()
+
+    if name.endswith(".nii") or name.endswith(".nii.gz"):
+        volume, spacing = load_nifti(data, filename)
+        return "ct", volume, spacing, get_window_presets()["Default"]
+
+    if name.endswith(".zip"):
+        from core.ct_volume import build_volume
+        from utils.file_utils import cleanup_temp_dir, extract_zip_to_temp
+
+        folder = extract_zip_to_temp(data)
+        try:
+            volume, spacing = build_volume(load_ct_series(folder))
+        finally:
+            cleanup_temp_dir(folder)
+        return "ct", volume, spacing, get_window_presets()["Default"]
+
+    # 그 외(.dcm 등)는 단일 X-ray DICOM으로 해석 — 1 x Y x X 볼륨으로 저장
+    ds = load_xray(data)
+    pixels = extract_pixel_array(ds)
+    row, col = getattr(ds, "PixelSpacing", None) or getattr(ds, "ImagerPixelSpacing", [1.0, 1.0])
+    return "xray", pixels[np.newaxis], (1.0, float(row), float(col)), get_window_defaults(ds)
+
+
+def ingest(path: str, filename: str, study_id: str) -> dict:
+    """업로드 파일 디코딩 → <study_id>.npy 저장, 메타데이터 반환"""
+    kind, volume, spacing, window = _decode(path, filename)
+    volume = np.ascontiguousarray(volume, dtype=np.float32)
+
+    target = volume_path(_cache_dir, study_id)
+    tmp = f"{target}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        np.save(f, volume)
+    os.replace(tmp, target)
+    return {
+        "study_id": study_id,
+        "kind": kind,
+        "filename": filename,
+        "shape": list(volume.shape),
+        "spacing": [float(s) for s in spacing],
+        "window": [float(window[0]), float(window[1])],
+        "value_range": [float(volume.min()), float(volume.max())],
+    }
+
+
+def _encode(array: np.ndarray, fmt: str, quality: int) -> bytes:
+    """uint8 그레이스케일 → PNG / WebP (quality 100이면 무손실 WebP)"""
+    from PIL import Image
+
+    buf = BytesIO()
+    img = Image.fromarray(array)
+    if fmt == "webp":
+        img.save(buf, format="WEBP", quality=quality, lossless=quality >= 100, method=4)
+    else:
+        img.save(buf, format="PNG", compress_level=3)
+    return buf.getvalue()
+
+
+def render_view(
+    study_id: str,
+    kind: str,
+    plane: str,
+    index: int,
+    wc: float,
+    ww: float,
+    fmt: str = "png",
+    quality: int = 90,
+) -> bytes:
+    """단일 평면 슬라이스 (원본 해상도) → 이미지 bytes
+
+    시상면 / 관상면은 뷰어와 같이 위아래를 뒤집는다.
+    """
+    volume = _volume(study_id)
+    if kind == "xray":
+        image = volume[0]
+    elif plane == "axial":
+        image = get_axial_slice(volume, index)
+    elif plane == "sagittal":
+        image = np.flipud(get_sagittal_slice(volume, index))
+    else:
+        image = np.flipud(get_coronal_slice(volume, index))
+    return _encode(np.ascontiguousarray(apply_windowing(image, wc, ww)), fmt, quality)
+
+
+def render_overview(
+    study_id: str, kind: str, indices: Tuple[int, int, int], wc: float, ww: float
+) -> bytes:
+    """뷰어 / 배치 판독과 같은 LLM 입력 PNG (CT는 3-plane 합성)"""
+    from core.renderer import render_ct_png, render_xray_png
+
+    volume = _volume(study_id)
+    if kind == "xray":
+        return render_xray_png(apply_windowing(volume[0], wc, ww))
+    axial, sagittal, coronal = indices
+    return render_ct_png(volume, axial, sagittal, coronal, wc, ww)
@@ -0,0 +1,87 @@
+"""배치 판독 CLI
+
+Usage (app/ 디렉터리에서):
+    python -m batch /data/worklist -o results.jsonl --provider GPT --model gpt-4o
+    python -m batch /data/worklist -o results.jsonl --provider Fake   # 로컬 테스트
+"""
+
+import argparse
+import os
+import sys
+
+# 앱 루트를 sys.path에 추가 (core / llm 임포트 보장)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from batch.runner import BatchRunner  # noqa: E402
+from batch.studies import discover_studies  # noqa: E402
+from llm.factory import create_client, list_providers  # noqa: E402
+from utils.prompt_templates import PROMPT_TEMPLATES  # noqa: E402
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m batch",
+        description="DICOM/NIfTI 스터디 디렉터리 배치 판독 (중단 후 재실행 시 이어서 진행)",
+    )
+    parser.add_argument("input_dir", help="스터디 디렉터리 (.dcm / .nii[.gz] / DICOM 시리즈 폴더)")
+    parser.add_argument("-o", "--output", required=True, help="결과 JSONL 경로 (append-only)")
+    parser.add_argument("--provider", default="GPT", choices=list_providers())
+    parser.add_argument("--model", default=None, help="모델 이름 (미지정 시 클라이언트 기본값)")
+    parser.add_argument("--temperature", type=float, default=None)
+    parser.add_argument(
+        "--template", default=None, choices=list(PROMPT_TEMPLATES),
+        help="모든 스터디에 사용할 프롬프트 템플릿 (미지정 시 스터디 종류별 기본값)",
+    )
+    parser.add_argument("--language", default="en", choices=["en", "ko"])
+    parser.add_argument("--preset", default="Default", help="CT Window preset")
+    parser.add_argument("--concurrency", type=int, default=None, help="공급자 동시 요청 수")
+    parser.add_argument("--rate", type=float, default=None, help="초당 최대 요청 수")
+    parser.add_argument("--burst", type=float, default=None, help="토큰 버킷 최대 burst")
+    parser.add_argument("--max-retries", type=int, default=5)
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+
+    params = {}
+    if args.model:
+        params["model"] = args.model
+    if args.temperature is not None:
+        params["temperature"] = args.temperature
+    client = create_client(args.provider, **params)
+
+    studies = discover_studies(args.input_dir)
+
+    def progress(record: dict) -> None:
+        status = "OK " if record["status"] == "ok" else "ERR"
+        detail = "" if record["status"] == "ok" else f"  {record.get('error')}"
+        print(
+            f"[{status}] {record['study_id']}  "
+            f"({record['elapsed_s']:.1f}s, {record['attempts']} attempt(s)){detail}",
+            flush=True,
+        )
+
+    runner = BatchRunner(
+        client,
+        args.output,
+        provider=args.provider,
+        prompt=PROMPT_TEMPLATES[args.template] if args.template else None,
+        language=args.language,
+        preset=args.preset,
+        concurrency=args.concurrency,
+        rate=args.rate,
+        burst=args.burst,
+        max_retries=args.max_retries,
+        progress=progress,
+    )
+    summary = runner.run(studies)
+    print(
+        f"total={summary.total} skipped={summary.skipped} "
+        f"ok={summary.succeeded} failed={summary.failed} elapsed={summary.elapsed_s:.1f}s"
+    )
+    return 0 if summary.failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,191 @@
+"""헤드리스 배치 판독 실행기
+
+스터디 목록을 렌더링하여 임의의 ``BaseLLMClient``로 병렬 판독하고,
+결과를 append-only JSONL로 기록한다. 같은 출력 파일로 다시 실행하면
+이미 성공한 스터디는 건너뛰므로 중단된 실행을 이어서 진행할 수 있다.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, Iterable, Optional, Set
+
+from llm.base import BaseLLMClient
+from llm.rate_limit import get_provider_limiter
+from llm.retry import call_with_retry, get_status_code
+
+from .studies import Study, default_prompt, render_study
+
+
+@dataclass
+class BatchSummary:
+    total: int = 0
+    skipped: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    elapsed_s: float = 0.0
+
+
+class JsonlWriter:
+    """스레드 안전한 append-only JSONL 기록기 (레코드마다 flush + fsync)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._repair_tail()
+
+    def _repair_tail(self) -> None:
+        # 기록 도중 중단되어 마지막 줄이 개행 없이 끝난 경우 개행 보정
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            return
+        with open(self.path, "rb+") as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                f.write(b"\n")
+
+    def write(self, record: dict) -> None:
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+
+
+def read_records(path: str) -> Iterable[dict]:
+    """JSONL 레코드 순회 (깨진 줄은 무시)"""
+    if not os.path.exists(path):
+        return
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+class BatchRunner:
+    def __init__(
+        self,
+        client: BaseLLMClient,
+        output_path: str,
+        provider: Optional[str] = None,
+        prompt: Optional[str] = None,
+        language: str = "en",
+        preset: str = "Default",
+        concurrency: Optional[int] = None,
+        rate: Optional[float] = None,
+        burst: Optional[float] = None,
+        max_retries: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        progress: Optional[Callable[[dict], None]] = None,
+    ):
+        self.client = client
+        self.output_path = output_path
+        # create_client는 텔레메트리 래퍼를 돌려주므로 래퍼의 공급자 이름을 우선 사용
+        self.provider = provider or getattr(client, "provider", None) or type(client).__name__
+        self.prompt = prompt
+        self.language = language
+        self.preset = preset
+        self.limiter = get_provider_limiter(self.provider, concurrency, rate, burst)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.progress = progress
+
+    def _prompt(self, study: Study) -> str:
+        return self.prompt or default_prompt(study, self.language)
+
+    def _key(self, study: Study) -> str:
+        """재실행 시 건너뛸지 판단하는 키 — 프롬프트나 프리셋이 바뀌면 다시 판독"""
+        digest = hashlib.sha256(
+            f"{self.preset}\0{self._prompt(study)}".encode("utf-8")
+        ).hexdigest()[:12]
+        return f"{self.provider}:{self.client.model_name}:{digest}:{study.study_id}"
+
+    def completed_keys(self) -> Set[str]:
+        """출력 파일에서 이미 성공한 레코드 키 집합"""
+        return {
+            r["key"]
+            for r in read_records(self.output_path)
+            if r.get("status") == "ok" and "key" in r
+        }
+
+    def _process(self, study: Study) -> dict:
+        started = time.perf_counter()
+        record = {
+            "key": self._key(study),
+            "study_id": study.study_id,
+            "path": study.path,
+            "kind": study.kind,
+            "provider": self.provider,
+            "model": self.client.model_name,
+            "preset": self.preset,
+        }
+        attempts = 0
+        try:
+            image_bytes = render_study(study, self.preset)
+            prompt = self._prompt(study)
+
+            def call() -> str:
+                nonlocal attempts
+                attempts += 1
+                with self.limiter.slot():
+                    return self.client.analyze(image_bytes, prompt)
+
+            report, _ = call_with_retry(
+                call,
+                max_retries=self.max_retries,
+                base_delay=self.base_delay,
+                max_delay=self.max_delay,
+            )
+            record.update(status="ok", report=report)
+        except Exception as e:
+            record.update(
+                status="error",
+                error=f"{type(e).__name__}: {e}",
+                status_code=get_status_code(e),
+            )
+        record.update(
+            attempts=attempts,
+            elapsed_s=round(time.perf_counter() - started, 3),
+            finished_at=datetime.now(timezone.utc).isoformat(),
+        )
+        return record
+
+    def run(self, studies: Iterable[Study]) -> BatchSummary:
+        """스터디 판독 실행 (이미 성공한 스터디는 건너뜀)"""
+        started = time.perf_counter()
+        studies = list(studies)
+        done = self.completed_keys()
+        pending = [s for s in studies if self._key(s) not in done]
+        summary = BatchSummary(total=len(studies), skipped=len(studies) - len(pending))
+        writer = JsonlWriter(self.output_path)
+
+        # 렌더링이 API 대기와 겹치도록 동시성 슬롯보다 약간 많은 워커 사용
+        workers = max(1, self.limiter.concurrency * 2)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="batch") as pool:
+            futures = [pool.submit(self._process, s) for s in pending]
+            for future in as_completed(futures):
+                record = future.result()
+                writer.write(record)
+                if record["status"] == "ok":
+                    summary.succeeded += 1
+                else:
+                    summary.failed += 1
+                if self.progress is not None:
+                    self.progress(record)
+
+        summary.elapsed_s = round(time.perf_counter() - started, 3)
+        return summary
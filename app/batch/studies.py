@@ -0,0 +1,83 @@
+"""배치 판독 대상 스터디 탐색 및 LLM 입력 이미지 렌더링"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+from core.ct_volume import build_volume
+from core.dicom_loader import (
+    extract_pixel_array,
+    get_window_defaults,
+    load_ct_series,
+    load_nifti,
+    load_xray,
+)
+from core.image_processor import apply_windowing, get_window_presets
+from core.renderer import render_ct_png, render_xray_png
+
+
+@dataclass(frozen=True)
+class Study:
+    study_id: str     # 입력 디렉터리 기준 상대 경로
+    path: str
+    kind: str         # "xray" | "ct_dicom" | "nifti"
+
+
+def _is_nifti(path: Path) -> bool:
+    name = path.name.lower()
+    return name.endswith(".nii") or name.endswith(".nii.gz")
+
+
+def discover_studies(root: str) -> List[Study]:
+    """root 바로 아래 항목을 스터디로 해석
+
+    - ``*.dcm`` 파일: X-ray 단일 DICOM
+    - ``*.nii`` / ``*.nii.gz`` 파일: CT NIfTI 볼륨
+    - 하위 디렉터리: CT DICOM 시리즈
+    """
+    root_path = Path(root)
+    if not root_path.is_dir():
+        raise ValueError(f"입력 디렉터리가 아닙니다: {root}")
+
+    studies = []
+    for entry in sorted(root_path.iterdir()):
+        study_id = entry.relative_to(root_path).as_posix()
+        if entry.is_dir():
+            studies.append(Study(study_id, str(entry), "ct_dicom"))
+        elif _is_nifti(entry):
+            studies.append(Study(study_id, str(entry), "nifti"))
+        elif entry.suffix.lower() == ".dcm":
+            studies.append(Study(study_id, str(entry), "xray"))
+    return studies
+
+
+def render_study(study: Study, preset: Optional[str] = "Default") -> bytes:
+    """스터디 → LLM 입력 PNG (뷰어와 동일한 렌더링)
+
+    X-ray는 DICOM 헤더의 W/L, CT는 preset W/L과 각 축 중앙 슬라이스를 사용한다.
+    """
+    if study.kind == "xray":
+        ds = load_xray(Path(study.path).read_bytes())
+        pixel = extract_pixel_array(ds)
+        wc, ww = get_window_defaults(ds)
+        return render_xray_png(apply_windowing(pixel, wc, ww))
+
+    if study.kind == "nifti":
+        volume, _ = load_nifti(Path(study.path).read_bytes(), Path(study.path).name)
+    elif study.kind == "ct_dicom":
+        volume, _ = build_volume(load_ct_series(study.path))
+    else:
+        raise ValueError(f"알 수 없는 스터디 종류: {study.kind}")
+
+    wc, ww = get_window_presets()[preset or "Default"]
+    n_z, n_y, n_x = volume.shape
+    return render_ct_png(volume, n_z // 2, n_x // 2, n_y // 2, wc, ww)
+
+
+def default_prompt(study: Study, language: str = "en") -> str:
+    """스터디 종류 / 언어에 맞는 기본 판독 프롬프트"""
+    from utils.prompt_templates import PROMPT_TEMPLATES
+
+    modality = "X-ray" if study.kind == "xray" else "CT"
+    lang = "한국어" if language == "ko" else "English"
+    return PROMPT_TEMPLATES[f"{modality} ({lang})"]
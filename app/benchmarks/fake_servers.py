@@ -0,0 +1,630 @@
+"""로컬 가짜 LLM 서버 (네트워크 경로 검증 / 부하 측정용)
+
+실제 모델 없이 HTTP 프로토콜과 지연 특성만 흉내 낸다. 표준 라이브러리
+``ThreadingHTTPServer``만 사용하며 한 프로세스에서 여러 개를 띄울 수 있다.
+모든 서버는 첫 토큰 지연(ttft), 토큰 간격(token_delay), 토큰 수, 오류 주입
+(error_rate 확률로 error_status 응답)을 설정할 수 있다.
+
+FakeOllamaServer:
+  /api/tags      설치 모델 목록
+  /api/ps        메모리 상주 모델 (요청 시 로드, keep_alive 만료 시 언로드)
+  /api/chat      스트리밍(NDJSON) / 비스트리밍 응답
+  /api/generate  prompt 없으면 모델 로드 + keep_alive 갱신만 수행
+  콜드 로드 지연(load_delay) 설정 가능
+
+FakeOpenAIServer (OPENAI_BASE_URL=<url>/v1):
+  /v1/models             모델 목록
+  /v1/chat/completions   SSE 스트리밍 (stream_options.include_usage 지원) / 비스트리밍
+
+FakeGeminiServer (GEMINI_API_ENDPOINT=<url>, REST 전송):
+  /v1beta/models/<모델>:generateContent
+  /v1beta/models/<모델>:streamGenerateContent   JSON 배열 스트림 (alt=sse면 SSE)
+
+공통 측정용 엔드포인트:
+  /_bench/stats   처리 요청 수 / 서버 측 처리 시간 (클라이언트 오버헤드 계산용)
+  /_bench/reset   통계 초기화
+
+Usage (app/ 디렉터리에서):
+    python -m benchmarks.fake_servers --ollama 3 --port 11501
+    python -m benchmarks.fake_servers --ollama 1 --openai 1 --gemini 1 --error-rate 0.05
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Sequence
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from llm.ollama_pool import keep_alive_seconds  # noqa: E402
+
+
+class _QuietHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # 기본 backlog(5)는 동시 연결이 몰리면 SYN 재전송(~1초) 지연을 만든다
+    request_queue_size = 512
+
+    def handle_error(self, request, client_address):
+        # 클라이언트가 스트림 도중 끊는 경우(취소 / 종료)는 정상 동작
+        exc = sys.exc_info()[1]
+        if not isinstance(exc, (ConnectionResetError, BrokenPipeError)):
+            super().handle_error(request, client_address)
+
+
+class _FakeServer:
+    """백그라운드 스레드에서 동작하는 HTTP 서버 기반 클래스
+
+    Args:
+        ttft: 요청 수신 → 첫 토큰 지연 (초)
+        token_delay: 토큰 간격 (초)
+        num_tokens: 응답 토큰 수
+        error_rate: 요청을 error_status로 실패시킬 확률
+    """
+
+    handler_class: type = BaseHTTPRequestHandler
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        ttft: float = 0.05,
+        token_delay: float = 0.005,
+        num_tokens: int = 20,
+        error_rate: float = 0.0,
+        error_status: int = 429,
+        seed: Optional[int] = None,
+    ):
+        handler = type("Handler", (self.handler_class,), {"server_state": self})
+        self.httpd = _QuietHTTPServer((host, port), handler)
+        self._thread: Optional[threading.Thread] = None
+        self.ttft = ttft
+        self.token_delay = token_delay
+        self.num_tokens = num_tokens
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.requests = 0
+        self.errors = 0
+        self._handle_times: List[float] = []
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def should_fail(self) -> bool:
+        """오류 주입 여부 (error_rate 확률)"""
+        with self._lock:
+            failed = self.error_rate > 0 and self._rng.random() < self.error_rate
+            self.errors += failed
+            return failed
+
+    def tokens(self) -> List[str]:
+        return [f"token{i} " for i in range(self.num_tokens)]
+
+    @staticmethod
+    def prompt_tokens(texts: Sequence[str], images: int) -> int:
+        """입력 토큰 수 추정 (문자 4개당 1토큰 + 이미지당 258)"""
+        return sum(len(t) for t in texts) // 4 + 258 * images
+
+    def record(self, seconds: float) -> None:
+        """성공 요청의 서버 측 처리 시간 (본문 수신 후 → 응답 끝)"""
+        with self._lock:
+            self._handle_times.append(seconds)
+
+    def stats(self) -> dict:
+        with self._lock:
+            times = list(self._handle_times)
+            return {
+                "requests": self.requests,
+                "errors": self.errors,
+                "handled": len(times),
+                "mean_s": statistics.fmean(times) if times else None,
+                "p50_s": statistics.median(times) if times else None,
+            }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.requests = self.errors = 0
+            self._handle_times.clear()
+
+    def start(self) -> "_FakeServer":
+        self._thread = threading.Thread(
+            target=self.httpd.serve_forever, name=type(self).__name__, daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class _JsonHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_state: _FakeServer
+
+    def log_message(self, format, *args):  # noqa: A002 - 기본 stderr 로그 비활성
+        pass
+
+    def _read_json(self) -> dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        return json.loads(body) if body else {}
+
+    def _send_json(self, data, status: int = 200) -> None:
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _start_chunked(self, content_type: str) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+    def _write_chunk(self, data: bytes) -> None:
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def _end_chunked(self) -> None:
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+    def _write_sse(self, data) -> None:
+        payload = data if isinstance(data, str) else json.dumps(data)
+        self._write_chunk(f"data: {payload}\n\n".encode())
+
+    def _handle_bench(self) -> bool:
+        """측정용 엔드포인트 처리 여부"""
+        state = self.server_state
+        if self.path == "/_bench/stats":
+            self._send_json(state.stats())
+        elif self.path == "/_bench/reset":
+            state.reset_stats()
+            self._send_json({"ok": True})
+        else:
+            return False
+        return True
+
+
+class _OllamaHandler(_JsonHandler):
+    def do_GET(self):
+        state: FakeOllamaServer = self.server_state
+        if self._handle_bench():
+            return
+        if self.path == "/api/tags":
+            self._send_json({"models": [{"name": m, "model": m} for m in state.models]})
+        elif self.path == "/api/ps":
+            self._send_json({"models": [{"name": m, "model": m} for m in state.resident()]})
+        else:
+            self._send_json({"error": "not found"}, 404)
+
+    def do_POST(self):
+        state: FakeOllamaServer = self.server_state
+        payload = self._read_json()
+        model = payload.get("model", "")
+        if self.path not in ("/api/chat", "/api/generate"):
+            self._send_json({"error": "not found"}, 404)
+            return
+        if model not in state.models:
+            self._send_json({"error": f"model '{model}' not found"}, 404)
+            return
+
+        state.count_request()
+        if state.should_fail():
+            self._send_json({"error": "fake injected error"}, state.error_status)
+            return
+        with state.slot():
+            started = time.perf_counter()
+            load_s = state.ensure_loaded(model, payload.get("keep_alive"))
+            if self.path == "/api/generate" and not payload.get("prompt"):
+                self._send_json({"model": model, "response": "", "done": True})
+                return
+
+            time.sleep(state.ttft)
+            tokens = state.tokens()
+            messages = payload.get("messages") or []
+            done = {
+                "model": model,
+                "done": True,
+                "prompt_eval_count": state.prompt_tokens(
+                    [m.get("content", "") for m in messages],
+                    sum(len(m.get("images") or []) for m in messages),
+                ),
+                "eval_count": len(tokens),
+                "load_duration": int(load_s * 1e9),
+            }
+            if not payload.get("stream", True):
+                time.sleep(state.token_delay * len(tokens))
+                done["message"] = {"role": "assistant", "content": "".join(tokens)}
+                done["total_duration"] = int((time.perf_counter() - started) * 1e9)
+                self._send_json(done)
+                state.record(time.perf_counter() - started)
+                return
+
+            self._start_chunked("application/x-ndjson")
+            for token in tokens:
+                line = {"model": model, "message": {"role": "assistant", "content": token}, "done": False}
+                self._write_chunk((json.dumps(line) + "\n").encode())
+                time.sleep(state.token_delay)
+            done["total_duration"] = int((time.perf_counter() - started) * 1e9)
+            self._write_chunk((json.dumps(done) + "\n").encode())
+            self._end_chunked()
+            state.record(time.perf_counter() - started)
+
+
+class FakeOllamaServer(_FakeServer):
+    """Ollama API 흉내 (모델 상주 / 콜드 로드 / 동시 처리 슬롯)
+
+    Args:
+        models: 설치된 모델 이름
+        preloaded: 시작 시 메모리에 올라가 있는 모델
+        load_delay: 상주하지 않은 모델 요청 시 추가 지연 (콜드 로드)
+        parallel: 동시에 생성하는 요청 수 (초과 요청은 대기, OLLAMA_NUM_PARALLEL)
+    """
+
+    handler_class = _OllamaHandler
+
+    def __init__(
+        self,
+        models: Sequence[str] = ("llava:13b",),
+        preloaded: Sequence[str] = (),
+        ttft: float = 0.05,
+        token_delay: float = 0.005,
+        num_tokens: int = 20,
+        load_delay: float = 1.0,
+        parallel: int = 4,
+        default_keep_alive: float = 300.0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        **options,
+    ):
+        super().__init__(host, port, ttft, token_delay, num_tokens, **options)
+        self.models = list(models)
+        self.load_delay = load_delay
+        self.default_keep_alive = default_keep_alive
+        self.loads = 0
+        self._expires: Dict[str, float] = {
+            m: time.monotonic() + default_keep_alive for m in preloaded
+        }
+        self._load_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(parallel)
+
+    def slot(self):
+        return self._slots
+
+    def resident(self) -> List[str]:
+        now = time.monotonic()
+        with self._lock:
+            return [m for m, expires in self._expires.items() if expires > now]
+
+    def ensure_loaded(self, model: str, keep_alive=None) -> float:
+        """모델 상주 보장, 콜드 로드에 걸린 시간(초) 반환"""
+        ttl = self.default_keep_alive if keep_alive is None else keep_alive_seconds(keep_alive)
+        load_s = 0.0
+        with self._load_lock:
+            if model not in self.resident():
+                time.sleep(self.load_delay)
+                self.loads += 1
+                load_s = self.load_delay
+            with self._lock:
+                self._expires[model] = time.monotonic() + (ttl if ttl is not None else 1e9)
+        return load_s
+
+
+class _OpenAIHandler(_JsonHandler):
+    def do_GET(self):
+        state: FakeOpenAIServer = self.server_state
+        if self._handle_bench():
+            return
+        if self.path == "/v1/models":
+            self._send_json({
+                "object": "list",
+                "data": [{"id": m, "object": "model", "created": 0, "owned_by": "fake"}
+                         for m in state.models],
+            })
+        else:
+            self._send_json({"error": {"message": "not found", "type": "invalid_request_error"}}, 404)
+
+    def do_POST(self):
+        state: FakeOpenAIServer = self.server_state
+        if self.path != "/v1/chat/completions":
+            self._send_json({"error": {"message": "not found", "type": "invalid_request_error"}}, 404)
+            return
+        payload = self._read_json()
+        state.count_request()
+        if state.should_fail():
+            self._send_json(
+                {"error": {"message": "fake injected error", "type": "server_error", "code": None}},
+                state.error_status,
+            )
+            return
+
+        started = time.perf_counter()
+        texts, images = [], 0
+        for message in payload.get("messages", []):
+            content = message.get("content")
+            parts = content if isinstance(content, list) else [{"type": "text", "text": content or ""}]
+            for part in parts:
+                if part.get("type") == "image_url":
+                    images += 1
+                else:
+                    texts.append(part.get("text", ""))
+        tokens = state.tokens()
+        usage = {
+            "prompt_tokens": state.prompt_tokens(texts, images),
+            "completion_tokens": len(tokens),
+        }
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        base = {
+            "id": f"chatcmpl-fake{state.requests}",
+            "created": int(time.time()),
+            "model": payload.get("model", ""),
+        }
+
+        time.sleep(state.ttft)
+        if not payload.get("stream"):
+            time.sleep(state.token_delay * len(tokens))
+            self._send_json({
+                **base,
+                "object": "chat.completion",
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": "".join(tokens)},
+                    "finish_reason": "stop",
+                }],
+                "usage": usage,
+            })
+            state.record(time.perf_counter() - started)
+            return
+
+        def chunk(choices, **extra):
+            return {**base, "object": "chat.completion.chunk", "choices": choices, **extra}
+
+        self._start_chunked("text/event-stream")
+        for i, token in enumerate(tokens):
+            if i:
+                time.sleep(state.token_delay)
+            delta = {"content": token, **({"role": "assistant"} if i == 0 else {})}
+            self._write_sse(chunk([{"index": 0, "delta": delta, "finish_reason": None}]))
+        self._write_sse(chunk([{"index": 0, "delta": {}, "finish_reason": "stop"}]))
+        if (payload.get("stream_options") or {}).get("include_usage"):
+            self._write_sse(chunk([], usage=usage))
+        self._write_sse("[DONE]")
+        self._end_chunked()
+        state.record(time.perf_counter() - started)
+
+
+class FakeOpenAIServer(_FakeServer):
+    """OpenAI Chat Completions API 흉내 (OPENAI_BASE_URL=<url>/v1)"""
+
+    handler_class = _OpenAIHandler
+
+    def __init__(
+        self,
+        models: Sequence[str] = ("gpt-4o", "gpt-4o-mini"),
+        host: str = "127.0.0.1",
+        port: int = 0,
+        **options,
+    ):
+        super().__init__(host, port, **options)
+        self.models = list(models)
+
+
+_GEMINI_STATUS = {429: "RESOURCE_EXHAUSTED", 500: "INTERNAL", 503: "UNAVAILABLE", 504: "DEADLINE_EXCEEDED"}
+
+
+class _GeminiHandler(_JsonHandler):
+    def do_GET(self):
+        if not self._handle_bench():
+            self._send_json({"error": {"code": 404, "message": "not found", "status": "NOT_FOUND"}}, 404)
+
+    def do_POST(self):
+        state: FakeGeminiServer = self.server_state
+        url = urlsplit(self.path)
+        model, _, method = url.path.rpartition("/")[2].partition(":")
+        if not url.path.startswith(("/v1beta/models/", "/v1/models/")) or method not in (
+            "generateContent", "streamGenerateContent"
+        ):
+            self._send_json({"error": {"code": 404, "message": "not found", "status": "NOT_FOUND"}}, 404)
+            return
+        payload = self._read_json()
+        state.count_request()
+        if state.should_fail():
+            self._send_json(
+                {"error": {
+                    "code": state.error_status,
+                    "message": "fake injected error",
+                    "status": _GEMINI_STATUS.get(state.error_status, "UNKNOWN"),
+                }},
+                state.error_status,
+            )
+            return
+
+        started = time.perf_counter()
+        texts, images = [], 0
+        for content in payload.get("contents", []):
+            for part in content.get("parts", []):
+                if "text" in part:
+                    texts.append(part["text"])
+                elif "inlineData" in part or "inline_data" in part:
+                    images += 1
+        tokens = state.tokens()
+        usage = {
+            "promptTokenCount": state.prompt_tokens(texts, images),
+            "candidatesTokenCount": len(tokens),
+        }
+        usage["totalTokenCount"] = usage["promptTokenCount"] + usage["candidatesTokenCount"]
+
+        def response(text: str, last: bool) -> dict:
+            candidate = {"content": {"parts": [{"text": text}], "role": "model"}, "index": 0}
+            if last:
+                candidate["finishReason"] = "STOP"
+            data = {"candidates": [candidate], "modelVersion": model}
+            if last:
+                data["usageMetadata"] = usage
+            return data
+
+        time.sleep(state.ttft)
+        if method == "generateContent":
+            time.sleep(state.token_delay * len(tokens))
+            self._send_json(response("".join(tokens), last=True))
+            state.record(time.perf_counter() - started)
+            return
+
+        # REST 전송은 JSON 배열 스트림, alt=sse 요청은 SSE
+        sse = parse_qs(url.query).get("alt") == ["sse"]
+        self._start_chunked("text/event-stream" if sse else "application/json")
+        if not sse:
+            self._write_chunk(b"[")
+        for i, token in enumerate(tokens):
+            if i:
+                time.sleep(state.token_delay)
+            data = response(token, last=i == len(tokens) - 1)
+            if sse:
+                self._write_sse(data)
+            else:
+                self._write_chunk(((",\n" if i else "") + json.dumps(data)).encode())
+        if not sse:
+            self._write_chunk(b"]")
+        self._end_chunked()
+        state.record(time.perf_counter() - started)
+
+
+class FakeGeminiServer(_FakeServer):
+    """Gemini generateContent REST API 흉내 (GEMINI_API_ENDPOINT=<url>)"""
+
+    handler_class = _GeminiHandler
+
+
+def start_servers(
+    ollama: int = 0,
+    openai: int = 0,
+    gemini: int = 0,
+    host: str = "127.0.0.1",
+    port: int = 0,
+    ollama_models: Sequence[str] = ("llava:13b", "llava:7b"),
+    load_delay: float = 1.0,
+    parallel: int = 4,
+    **options,
+) -> Dict[str, List[_FakeServer]]:
+    """종류별 가짜 서버 시작 (port=0이면 임의 포트, 아니면 port부터 순서대로)
+
+    options: ttft / token_delay / num_tokens / error_rate / error_status / seed
+    """
+    ports = iter(range(port, port + ollama + openai + gemini)) if port else None
+
+    def next_port() -> int:
+        return next(ports) if ports is not None else 0
+
+    return {
+        "ollama": [
+            FakeOllamaServer(
+                ollama_models, load_delay=load_delay, parallel=parallel,
+                host=host, port=next_port(), **options,
+            ).start()
+            for _ in range(ollama)
+        ],
+        "openai": [FakeOpenAIServer(host=host, port=next_port(), **options).start()
+                   for _ in range(openai)],
+        "gemini": [FakeGeminiServer(host=host, port=next_port(), **options).start()
+                   for _ in range(gemini)],
+    }
+
+
+def serve(conn, **kwargs) -> None:
+    """별도 프로세스용 진입점 — 서버 URL을 conn으로 보내고 종료 신호까지 대기
+
+    벤치마크 클라이언트와 GIL / CPU를 나눠 쓰지 않도록 서버를 다른 프로세스에서
+    띄울 때 사용한다 (``multiprocessing`` Pipe).
+    """
+    servers = start_servers(**kwargs)
+    conn.send({kind: [s.url for s in group] for kind, group in servers.items()})
+    try:
+        conn.recv()
+    except EOFError:
+        pass
+    for group in servers.values():
+        for server in group:
+            server.stop()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="로컬 가짜 LLM 서버")
+    parser.add_argument("--ollama", type=int, default=1, help="가짜 Ollama 서버 수")
+    parser.add_argument("--openai", type=int, default=0, help="가짜 OpenAI 서버 수")
+    parser.add_argument("--gemini", type=int, default=0, help="가짜 Gemini 서버 수")
+    parser.add_argument("--port", type=int, default=11501, help="첫 포트 (서버마다 +1)")
+    parser.add_argument("--models", nargs="+", default=["llava:13b", "llava:7b"])
+    parser.add_argument("--ttft", type=float, default=0.05)
+    parser.add_argument("--token-delay", type=float, default=0.005)
+    parser.add_argument("--num-tokens", type=int, default=20)
+    parser.add_argument("--load-delay", type=float, default=1.0)
+    parser.add_argument("--parallel", type=int, default=4, help="Ollama 서버당 동시 생성 수")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=429)
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    servers = start_servers(
+        ollama=args.ollama,
+        openai=args.openai,
+        gemini=args.gemini,
+        host="0.0.0.0",
+        port=args.port,
+        ollama_models=args.models,
+        load_delay=args.load_delay,
+        parallel=args.parallel,
+        ttft=args.ttft,
+        token_delay=args.token_delay,
+        num_tokens=args.num_tokens,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+    )
+
+    def local(server: _FakeServer) -> str:
+        return f"http://localhost:{server.httpd.server_address[1]}"
+
+    if servers["ollama"]:
+        hosts = ",".join(local(s) for s in servers["ollama"])
+        print(f"가짜 Ollama {len(servers['ollama'])}대 실행 중 — OLLAMA_HOSTS={hosts}")
+    for server in servers["openai"]:
+        print(f"가짜 OpenAI 실행 중 — OPENAI_BASE_URL={local(server)}/v1")
+    for server in servers["gemini"]:
+        print(f"가짜 Gemini 실행 중 — GEMINI_API_ENDPOINT={local(server)}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        for group in servers.values():
+            for server in group:
+                server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,341 @@
+"""핵심 영상 처리 벤치마크 (로더 / 볼륨 / W-L / 슬라이싱 / 렌더링)
+
+합성 데이터(``benchmarks.synthetic``)를 임시 폴더에 만들고 다음을 측정한다.
+
+  ct.load_series[raw|rle]   load_ct_series — 파일 읽기 + 픽셀 디코드 + 정렬
+  ct.build_volume           build_volume — rescale + 3D 스택 (디코드는 캐시됨)
+  nifti.load[nii|nii.gz]    load_nifti
+  xray.load                 load_xray + extract_pixel_array
+  windowing.<대상>          apply_windowing (X-ray 전체 / 평면별 슬라이스)
+  slice.<평면>              get_*_slice (뷰 반환) + 연속 배열 복사
+  render.xray / render.ct   뷰어 렌더 경로 (matplotlib → PNG)
+
+항목마다 지연 백분위(p50 / p95), 처리량, tracemalloc 기준 최대 메모리를
+기록한다. 결과 JSON을 같은 머신에서 다시 실행한 결과와 ``--compare``로
+비교하면 회귀가 보인다 (``--check``는 회귀 시 종료 코드 1).
+
+pydicom / nibabel / matplotlib가 없으면 해당 항목은 건너뛰고 결과에 남긴다.
+
+Usage (app/ 디렉터리에서):
+    python -m benchmarks.imaging --json before.json
+    python -m benchmarks.imaging --slices 300 --matrix 512 --dtype uint16
+    python -m benchmarks.imaging --json after.json --compare before.json --check
+    python -m benchmarks.imaging --only windowing slice
+"""
+
+import argparse
+import functools
+import gc
+import json
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Callable, Iterator, List
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import synthetic  # noqa: E402
+from core.profiling import percentile  # noqa: E402
+
+# 한 번 실행이 이보다 짧으면 여러 번 묶어 측정 (타이머 해상도 보정)
+MIN_SAMPLE_SEC = 0.02
+
+
+@dataclass
+class Case:
+    name: str
+    fn: Callable[[], object]
+    work: float        # 1회 실행당 처리량 단위 수
+    unit: str          # 처리량 단위 (slices, MB, Mpx, frames)
+
+
+def _loops(fn: Callable[[], object]) -> int:
+    """MIN_SAMPLE_SEC 이상 걸리도록 묶을 호출 수"""
+    started = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - started
+    return max(1, int(MIN_SAMPLE_SEC / elapsed) + 1) if elapsed < MIN_SAMPLE_SEC else 1
+
+
+def _peak_mb(fn: Callable[[], object]) -> float:
+    """1회 실행 중 Python / numpy 할당 최대치 (MB, 실행 전 상주분 제외)"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1e6
+
+
+def measure(case: Case, repeat: int) -> dict:
+    loops = _loops(case.fn)   # 첫 호출은 워밍업 겸 보정
+    samples = []
+    gc.collect()
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(loops):
+            case.fn()
+        samples.append((time.perf_counter() - started) / loops)
+    p50 = percentile(samples, 50)
+    return {
+        "case": case.name,
+        "loops": loops,
+        "runs": len(samples),
+        "p50_ms": p50 * 1000,
+        "p95_ms": percentile(samples, 95) * 1000,
+        "min_ms": min(samples) * 1000,
+        "mean_ms": sum(samples) / len(samples) * 1000,
+        "throughput": case.work / p50 if p50 > 0 else None,
+        "unit": f"{case.unit}/s",
+        "peak_mb": _peak_mb(case.fn),
+    }
+
+
+# ── 측정 항목 ────────────────────────────────────────────────────────────────
+@functools.lru_cache(maxsize=1)
+def _phantom(slices: int, matrix: int) -> np.ndarray:
+    """그룹 간 공유하는 팬텀 (int16 HU)"""
+    return synthetic.phantom_volume(slices, matrix)
+
+
+def ct_cases(args, workdir: str) -> Iterator[Case]:
+    from core.ct_volume import build_volume
+    from core.dicom_loader import load_ct_series
+
+    volume = _phantom(args.slices, args.matrix)
+    datasets = None
+    for label, compressed in (("raw", False), ("rle", True)):
+        if label not in args.ct_codecs:
+            continue
+        folder = os.path.join(workdir, f"ct_{label}")
+        synthetic.write_ct_series(folder, volume, dtype=args.dtype, compressed=compressed)
+        yield Case(
+            f"ct.load_series[{label}]", lambda f=folder: load_ct_series(f), args.slices, "slices"
+        )
+        if datasets is None:
+            datasets = load_ct_series(folder)
+    if datasets is not None:
+        yield Case("ct.build_volume", lambda: build_volume(datasets), args.slices, "slices")
+
+
+def nifti_cases(args, workdir: str) -> Iterator[Case]:
+    from core.dicom_loader import load_nifti
+
+    volume = _phantom(args.slices, args.matrix)
+    for name, gz in (("ct.nii", False), ("ct.nii.gz", True)):
+        data = synthetic.nifti_bytes(volume, gz=gz)
+        yield Case(
+            f"nifti.load[{name.split('.', 1)[1]}]",
+            lambda d=data, n=name: load_nifti(d, n),
+            len(data) / 1e6,
+            "MB",
+        )
+
+
+def xray_cases(args, workdir: str) -> Iterator[Case]:
+    from core.dicom_loader import extract_pixel_array, load_xray
+
+    data = synthetic.xray_dicom_bytes(args.xray_rows, args.xray_cols)
+    yield Case(
+        "xray.load", lambda: extract_pixel_array(load_xray(data)), len(data) / 1e6, "MB"
+    )
+
+
+def windowing_cases(args, workdir: str) -> Iterator[Case]:
+    from core.ct_volume import get_axial_slice, get_coronal_slice, get_sagittal_slice
+    from core.image_processor import apply_windowing
+
+    xray = synthetic.xray_image(args.xray_rows, args.xray_cols).astype(np.float32)
+    yield Case(
+        "windowing.xray", lambda: apply_windowing(xray, 2048, 4096), xray.size / 1e6, "Mpx"
+    )
+    volume = _phantom(args.slices, args.matrix).astype(np.float32)
+    center = [n // 2 for n in volume.shape]
+    for plane, get, idx in (
+        ("axial", get_axial_slice, center[0]),
+        ("sagittal", get_sagittal_slice, center[2]),
+        ("coronal", get_coronal_slice, center[1]),
+    ):
+        view = get(volume, idx)
+        yield Case(
+            f"windowing.{plane}",
+            lambda g=get, i=idx: apply_windowing(g(volume, i), 40, 400),
+            view.size / 1e6,
+            "Mpx",
+        )
+
+
+def slice_cases(args, workdir: str) -> Iterator[Case]:
+    from core.ct_volume import get_axial_slice, get_coronal_slice, get_sagittal_slice
+
+    volume = _phantom(args.slices, args.matrix).astype(np.float32)
+    n_z, n_y, n_x = volume.shape
+    # 슬라이더 이동처럼 인덱스를 바꿔 가며 추출, 뷰는 연속 배열로 복사해 실제 메모리 접근 포함
+    for plane, get, n in (
+        ("axial", get_axial_slice, n_z),
+        ("sagittal", get_sagittal_slice, n_x),
+        ("coronal", get_coronal_slice, n_y),
+    ):
+        state = {"i": 0}
+
+        def step(g=get, n=n, state=state):
+            state["i"] = (state["i"] + 7) % n
+            return np.ascontiguousarray(g(volume, state["i"]))
+
+        yield Case(f"slice.{plane}", step, 1, "slices")
+
+
+def render_cases(args, workdir: str) -> Iterator[Case]:
+    from core.image_processor import apply_windowing
+    from core.renderer import render_ct_png, render_xray_png
+
+    windowed = apply_windowing(
+        synthetic.xray_image(args.xray_rows, args.xray_cols).astype(np.float32), 2048, 4096
+    )
+    yield Case("render.xray", lambda: render_xray_png(windowed), 1, "frames")
+    volume = _phantom(args.slices, args.matrix).astype(np.float32)
+    n_z, n_y, n_x = volume.shape
+    yield Case(
+        "render.ct",
+        lambda: render_ct_png(volume, n_z // 2, n_x // 2, n_y // 2, 40, 400),
+        1,
+        "frames",
+    )
+
+
+GROUPS = {
+    "ct": ct_cases,
+    "nifti": nifti_cases,
+    "xray": xray_cases,
+    "windowing": windowing_cases,
+    "slice": slice_cases,
+    "render": render_cases,
+}
+
+
+# ── 비교 ─────────────────────────────────────────────────────────────────────
+def compare(current: dict, baseline: dict, threshold: float) -> List[dict]:
+    """p50 / 최대 메모리가 threshold 비율 이상 늘어난 항목 (같은 머신 결과끼리만 의미 있음)"""
+    before = {r["case"]: r for r in baseline.get("results", []) if "p50_ms" in r}
+    rows = []
+    for r in current["results"]:
+        old = before.get(r["case"])
+        if old is None or "p50_ms" not in r:
+            continue
+        time_ratio = r["p50_ms"] / old["p50_ms"] if old["p50_ms"] > 0 else None
+        mem_ratio = r["peak_mb"] / old["peak_mb"] if old["peak_mb"] > 1 else None
+        rows.append({
+            "case": r["case"],
+            "p50_before_ms": old["p50_ms"],
+            "p50_after_ms": r["p50_ms"],
+            "time_ratio": time_ratio,
+            "mem_ratio": mem_ratio,
+            "regressed": bool(
+                (time_ratio and time_ratio > 1 + threshold)
+                or (mem_ratio and mem_ratio > 1 + threshold)
+            ),
+        })
+    return rows
+
+
+def machine_info() -> dict:
+    return {
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpus": os.cpu_count(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="핵심 영상 처리 벤치마크")
+    parser.add_argument("--only", nargs="*", choices=list(GROUPS), help="측정할 그룹")
+    parser.add_argument("--slices", type=int, default=128, help="CT 슬라이스 수")
+    parser.add_argument("--matrix", type=int, default=512, help="CT 슬라이스 크기 (정사각)")
+    parser.add_argument("--dtype", choices=list(synthetic.CT_DTYPES), default="int16")
+    parser.add_argument("--ct-codecs", nargs="*", default=["raw", "rle"], choices=["raw", "rle"])
+    parser.add_argument("--xray-rows", type=int, default=3000)
+    parser.add_argument("--xray-cols", type=int, default=2500)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--workdir", help="합성 파일 보관 폴더 (기본: 임시 폴더, 종료 시 삭제)")
+    parser.add_argument("--json", help="결과 JSON 저장 경로")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON")
+    parser.add_argument("--threshold", type=float, default=0.10, help="회귀 판정 비율 (기본 10%%)")
+    parser.add_argument("--check", action="store_true", help="회귀가 있으면 종료 코드 1")
+    return parser.parse_args(argv)
+
+
+def run(args, workdir: str) -> List[dict]:
+    results = []
+    for group in args.only or list(GROUPS):
+        try:
+            for case in GROUPS[group](args, workdir):
+                r = measure(case, args.repeat)
+                results.append(r)
+                tp = f"{r['throughput']:.1f} {r['unit']}" if r["throughput"] else "-"
+                print(f"{r['case']:<24} p50 {r['p50_ms']:>9.2f}ms  p95 {r['p95_ms']:>9.2f}ms  "
+                      f"{tp:>18}  peak {r['peak_mb']:>8.1f}MB", flush=True)
+        except ImportError as e:
+            results.append({"case": group, "skipped": f"{e.name or e} 미설치"})
+            print(f"{group:<24} 건너뜀 ({e.name or e} 미설치)", flush=True)
+    return results
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    if args.workdir:
+        os.makedirs(args.workdir, exist_ok=True)
+        results = run(args, args.workdir)
+    else:
+        with tempfile.TemporaryDirectory(prefix="imaging-bench-") as workdir:
+            results = run(args, workdir)
+
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "machine": machine_info(),
+        "config": {
+            k: getattr(args, k)
+            for k in ("slices", "matrix", "dtype", "ct_codecs", "xray_rows", "xray_cols", "repeat")
+        },
+        "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "results": results,
+    }
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+    if not args.compare:
+        return 0
+    with open(args.compare) as f:
+        baseline = json.load(f)
+    if baseline.get("machine") != report["machine"]:
+        print("\n주의: 다른 머신 / 환경의 결과와 비교 중 — 수치 차이를 회귀로 보기 어렵습니다.")
+    if baseline.get("config") != report["config"]:
+        print("주의: 데이터 크기 등 설정이 다른 결과와 비교 중입니다.")
+
+    rows = compare(report, baseline, args.threshold)
+    print(f"\n{'항목':<24} {'이전 p50':>10} {'현재 p50':>10} {'시간':>7} {'메모리':>7}")
+    for row in rows:
+        mem = f"{row['mem_ratio']:.2f}x" if row["mem_ratio"] else "-"
+        print(f"{row['case']:<24} {row['p50_before_ms']:>8.2f}ms {row['p50_after_ms']:>8.2f}ms "
+              f"{(row['time_ratio'] or 0):>6.2f}x {mem:>7}{'  회귀' if row['regressed'] else ''}")
+    regressed = [row["case"] for row in rows if row["regressed"]]
+    if args.check and regressed:
+        print(f"\n회귀 ({args.threshold:.0%} 초과): {', '.join(regressed)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
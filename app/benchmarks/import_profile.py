@@ -0,0 +1,182 @@
+"""페이지별 콜드 스타트 임포트 시간 프로파일 (``-X importtime``)
+
+각 페이지 스크립트의 최상위 import 문만 추출해 새 인터프리터에서
+``python -X importtime``으로 실행하고, 페이지가 추가로 임포트하는 모듈의
+누적 시간을 패키지별로 분해한다. Streamlit 서버 프로세스에는 streamlit이
+이미 로드되어 있으므로 기준선으로 먼저 임포트하고 측정에서 제외한다.
+
+``--check``는 페이지별 예산(ms)을 넘으면 종료 코드 1로 끝난다 (CI / 배포 전 확인).
+
+Usage (app/ 디렉터리에서):
+    python -m benchmarks.import_profile
+    python -m benchmarks.import_profile --top 15 --repeat 5
+    python -m benchmarks.import_profile --check --budget-ms 300
+"""
+
+import argparse
+import ast
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PAGES = ("main.py", "pages/1_Viewer.py", "pages/2_LLM_Analysis.py")
+
+# 페이지별 기본 예산 (ms, streamlit 제외) — IMPORT_BUDGET_MS / --budget-ms 로 덮어씀
+DEFAULT_BUDGET_MS = {
+    "main.py": 100,
+    "pages/1_Viewer.py": 400,
+    "pages/2_LLM_Analysis.py": 400,
+}
+
+# 서버 프로세스에 이미 로드된 것으로 간주하는 기준선
+BASELINE = ("streamlit",)
+
+MARKER = "--page-imports--"
+_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def page_imports(path: str) -> List[str]:
+    """페이지 스크립트의 최상위 import 문 (소스 그대로)"""
+    with open(path, encoding="utf-8") as f:
+        source = f.read()
+    tree = ast.parse(source)
+    return [
+        ast.get_source_segment(source, node)
+        for node in tree.body
+        if isinstance(node, (ast.Import, ast.ImportFrom))
+    ]
+
+
+def _probe_script(statements: List[str]) -> str:
+    lines = [
+        "import sys, json",
+        f"sys.path.insert(0, {APP_ROOT!r})",
+        "missing = []",
+    ]
+    for module in BASELINE:
+        lines += [
+            "try:",
+            f"    import {module}",
+            "except ImportError:",
+            f"    missing.append({module!r})",
+        ]
+    lines.append(f"sys.stderr.write({MARKER!r} + '\\n'); sys.stderr.flush()")
+    for stmt in statements:
+        lines += [
+            "try:",
+            f"    {stmt}",
+            "except ImportError as e:",
+            "    missing.append(e.name or str(e))",
+        ]
+    lines.append("print(json.dumps({'missing': missing}))")
+    return "\n".join(lines)
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int, int]]:
+    """MARKER 이후 importtime 출력 → [(모듈, 깊이, self us, cumulative us)]"""
+    _, _, after = stderr.partition(MARKER)
+    rows = []
+    for line in after.splitlines():
+        m = _LINE.match(line)
+        if m:
+            self_us, cum_us, indent, name = m.groups()
+            rows.append((name, (len(indent) - 1) // 2, int(self_us), int(cum_us)))
+    return rows
+
+
+def profile_page(page: str) -> dict:
+    """페이지 1회 콜드 임포트 측정"""
+    statements = page_imports(os.path.join(APP_ROOT, page))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _probe_script(statements)],
+        capture_output=True, text=True, cwd=APP_ROOT,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"{page} 프로파일 실패:\n{proc.stderr[-2000:]}")
+    rows = parse_importtime(proc.stderr)
+    missing = json.loads(proc.stdout.strip().splitlines()[-1])["missing"]
+
+    by_package: Dict[str, int] = defaultdict(int)
+    for name, depth, _, cum in rows:
+        if depth == 0:
+            by_package[name.split(".")[0]] += cum
+    return {
+        "page": page,
+        "total_ms": sum(by_package.values()) / 1000,
+        "by_package_ms": {k: v / 1000 for k, v in sorted(by_package.items(), key=lambda kv: -kv[1])},
+        "top_self_ms": [
+            (name, s / 1000) for name, _, s, _ in sorted(rows, key=lambda r: -r[2])
+        ],
+        "missing": missing,
+    }
+
+
+def profile(page: str, repeat: int) -> dict:
+    """repeat회 측정 중 전체 시간 중앙값에 해당하는 실행 (첫 실행은 .pyc 생성용으로 버림)"""
+    profile_page(page)
+    runs = sorted((profile_page(page) for _ in range(repeat)), key=lambda r: r["total_ms"])
+    result = runs[len(runs) // 2]
+    result["runs_ms"] = [round(r["total_ms"], 1) for r in runs]
+    result["median_ms"] = statistics.median(r["total_ms"] for r in runs)
+    return result
+
+
+def budget_for(page: str, override: float = None) -> float:
+    if override is not None:
+        return override
+    env = os.getenv("IMPORT_BUDGET_MS")
+    return float(env) if env else DEFAULT_BUDGET_MS.get(page, 400)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="페이지별 임포트 시간 프로파일 / 예산 확인")
+    parser.add_argument("pages", nargs="*", default=list(PAGES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10, help="self 시간 상위 모듈 수")
+    parser.add_argument("--check", action="store_true", help="예산 초과 시 종료 코드 1")
+    parser.add_argument("--budget-ms", type=float, help="모든 페이지 공통 예산 (ms)")
+    parser.add_argument("--strict", action="store_true", help="미설치 모듈이 있으면 실패 처리")
+    parser.add_argument("--json", help="결과 JSON 저장 경로")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    failed = []
+    results = []
+    for page in args.pages:
+        r = profile(page, args.repeat)
+        r["budget_ms"] = budget_for(page, args.budget_ms)
+        results.append(r)
+
+        over = r["median_ms"] > r["budget_ms"]
+        print(f"\n{page}: {r['median_ms']:.1f}ms (예산 {r['budget_ms']:.0f}ms) "
+              f"{'초과' if over else 'OK'}  runs={r['runs_ms']}")
+        for package, ms in r["by_package_ms"].items():
+            print(f"  {package:<28} {ms:8.1f}ms")
+        print("  -- self 시간 상위 --")
+        for name, ms in r["top_self_ms"][:args.top]:
+            print(f"  {name.strip():<40} {ms:8.1f}ms")
+        if r["missing"]:
+            print(f"  미설치 (측정 제외): {', '.join(sorted(set(r['missing'])))}")
+        if over or (args.strict and r["missing"]):
+            failed.append(page)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"results": results}, f, indent=2, ensure_ascii=False)
+    if args.check and failed:
+        print(f"\n임포트 예산 초과: {', '.join(failed)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
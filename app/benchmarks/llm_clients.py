@@ -0,0 +1,285 @@
+"""LLM 클라이언트 오버헤드 / 처리량 벤치마크 (가짜 공급자 서버 사용)
+
+가짜 OpenAI / Gemini / Ollama 서버(``benchmarks.fake_servers``)를 별도
+프로세스에서 띄우고, ``GPTClient`` / ``GeminiClient`` / ``OllamaClient``
+(선택 시 ``RouterClient``)로 동시성을 늘려 가며 스트리밍 요청을 보낸다.
+
+측정 항목 (공급자 · 모드 · 동시성별):
+  - 처리량 (req/s, 토큰/s), 오류 수
+  - TTFT / 전체 지연 p50 / p95 / p99
+  - 클라이언트 오버헤드: 클라이언트 평균 지연 - 서버 측 평균 처리 시간
+    (이미지 인코딩, 커넥션 풀 대기, SDK 파싱, 스레드 전환 등)
+  - 요청당 클라이언트 CPU 시간 (서버는 다른 프로세스라 포함되지 않음)
+
+API 비용 없이 커넥션 풀 · async · 라우팅 변경의 효과를 비교하는 용도다.
+openai / google-generativeai SDK가 없으면 해당 공급자는 건너뛴다.
+
+Usage (app/ 디렉터리에서):
+    python -m benchmarks.llm_clients
+    python -m benchmarks.llm_clients --providers Ollama GPT --concurrency 1 8 32 --mode both
+    python -m benchmarks.llm_clients --error-rate 0.05 --json out.json
+    python -m benchmarks.llm_clients --providers Router --router-backends Ollama GPT
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import fake_servers  # noqa: E402
+from core.profiling import percentile  # noqa: E402
+
+PROVIDERS = ("GPT", "Gemini", "Ollama", "Router")
+
+# 공급자 → (가짜 서버 종류, 모델)
+SERVER_KIND = {"GPT": "openai", "Gemini": "gemini", "Ollama": "ollama"}
+MODELS = {"GPT": "gpt-4o-mini", "Gemini": "gemini-1.5-flash", "Ollama": "llava:7b"}
+
+PROMPT = "Describe the findings in this chest radiograph."
+
+
+def start_servers(args) -> tuple:
+    """가짜 서버 프로세스 시작 → (프로세스, 부모 쪽 Pipe, 종류별 URL)"""
+    ctx = multiprocessing.get_context("spawn")
+    parent, child = ctx.Pipe()
+    kinds = {SERVER_KIND[p] for p in args.providers + args.router_backends if p in SERVER_KIND}
+    process = ctx.Process(
+        target=fake_servers.serve,
+        args=(child,),
+        kwargs={
+            "ollama": int("ollama" in kinds),
+            "openai": int("openai" in kinds),
+            "gemini": int("gemini" in kinds),
+            "ollama_models": [MODELS["Ollama"]],
+            "load_delay": 0.0,
+            "parallel": max(args.concurrency),   # 서버 큐 대기가 오버헤드로 잡히지 않도록
+            "ttft": args.ttft,
+            "token_delay": args.token_delay,
+            "num_tokens": args.num_tokens,
+            "error_rate": args.error_rate,
+            "error_status": args.error_status,
+            "seed": 0,
+        },
+        daemon=True,
+    )
+    process.start()
+    urls = parent.recv()
+    return process, parent, {kind: group[0] for kind, group in urls.items() if group}
+
+
+def configure_env(urls: Dict[str, str]) -> None:
+    """클라이언트가 가짜 서버로 연결되도록 환경변수 설정"""
+    os.environ.pop("OLLAMA_HOSTS", None)
+    os.environ["OPENAI_API_KEY"] = "fake-key"
+    os.environ["GOOGLE_API_KEY"] = "fake-key"
+    if "openai" in urls:
+        os.environ["OPENAI_BASE_URL"] = f"{urls['openai']}/v1"
+    if "gemini" in urls:
+        os.environ["GEMINI_API_ENDPOINT"] = urls["gemini"]
+    if "ollama" in urls:
+        os.environ["OLLAMA_HOST"] = urls["ollama"]
+
+
+def make_client(provider: str, router_backends: List[str]):
+    if provider == "GPT":
+        from llm.gpt_client import GPTClient
+        return GPTClient(model=MODELS["GPT"])
+    if provider == "Gemini":
+        from llm.gemini_client import GeminiClient
+        return GeminiClient(model=MODELS["Gemini"])
+    if provider == "Ollama":
+        from llm.ollama_client import OllamaClient
+        return OllamaClient(model=MODELS["Ollama"])
+    from llm.router import RouterClient
+    return RouterClient({name: make_client(name, []) for name in router_backends})
+
+
+def _server_stats(url: str, reset: bool = False) -> dict:
+    from llm import transport
+
+    path = "/_bench/reset" if reset else "/_bench/stats"
+    return transport.get_session().get(f"{url}{path}", timeout=5).json()
+
+
+def _one_sync(client, image: bytes) -> dict:
+    started = time.perf_counter()
+    ttft = None
+    try:
+        for chunk in client.stream_analyze(image, PROMPT):
+            if chunk and ttft is None:
+                ttft = time.perf_counter() - started
+    except Exception as e:
+        return {"ok": False, "error": type(e).__name__, "total": time.perf_counter() - started}
+    return {"ok": True, "ttft": ttft, "total": time.perf_counter() - started}
+
+
+async def _one_async(client, image: bytes, semaphore: asyncio.Semaphore) -> dict:
+    async with semaphore:
+        started = time.perf_counter()
+        ttft = None
+        try:
+            async for chunk in client.astream_analyze(image, PROMPT):
+                if chunk and ttft is None:
+                    ttft = time.perf_counter() - started
+        except Exception as e:
+            return {"ok": False, "error": type(e).__name__, "total": time.perf_counter() - started}
+        return {"ok": True, "ttft": ttft, "total": time.perf_counter() - started}
+
+
+def run_level(client, mode: str, concurrency: int, requests: int, image: bytes) -> tuple:
+    """동시성 1단계 실행 → (요청별 결과, wall 시간, CPU 시간)"""
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    if mode == "sync":
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(lambda _: _one_sync(client, image), range(requests)))
+    else:
+        async def run_all():
+            from llm import transport
+
+            semaphore = asyncio.Semaphore(concurrency)
+            try:
+                return await asyncio.gather(
+                    *(_one_async(client, image, semaphore) for _ in range(requests))
+                )
+            finally:
+                await transport.aclose_async_clients()
+        results = asyncio.run(run_all())
+    return results, time.perf_counter() - wall_start, time.process_time() - cpu_start
+
+
+def summarize(provider, mode, concurrency, results, wall, cpu, server, num_tokens) -> dict:
+    ok = [r for r in results if r["ok"]]
+    totals = [r["total"] for r in ok]
+    ttfts = [r["ttft"] for r in ok if r["ttft"] is not None]
+    errors: Dict[str, int] = {}
+    for r in results:
+        if not r["ok"]:
+            errors[r["error"]] = errors.get(r["error"], 0) + 1
+    server_mean = server.get("mean_s") if server else None
+    return {
+        "provider": provider,
+        "mode": mode,
+        "concurrency": concurrency,
+        "requests": len(results),
+        "errors": sum(errors.values()),
+        "error_classes": errors,
+        "req_per_s": len(ok) / wall if wall else None,
+        "tokens_per_s": len(ok) * num_tokens / wall if wall else None,
+        "ttft_p50_ms": _ms(percentile(ttfts, 50)),
+        "ttft_p95_ms": _ms(percentile(ttfts, 95)),
+        "total_p50_ms": _ms(percentile(totals, 50)),
+        "total_p95_ms": _ms(percentile(totals, 95)),
+        "total_p99_ms": _ms(percentile(totals, 99)),
+        "server_mean_ms": _ms(server_mean),
+        "overhead_ms": (
+            _ms(statistics.fmean(totals) - server_mean) if totals and server_mean else None
+        ),
+        "cpu_ms_per_req": cpu / len(results) * 1000 if results else None,
+        "server_requests": server.get("requests") if server else None,
+    }
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    return None if seconds is None else seconds * 1000
+
+
+def _fmt(value, digits: int = 1) -> str:
+    return "-" if value is None else f"{value:.{digits}f}"
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="LLM 클라이언트 오버헤드 벤치마크 (가짜 서버)")
+    parser.add_argument("--providers", nargs="+", choices=PROVIDERS,
+                        default=["GPT", "Gemini", "Ollama"])
+    parser.add_argument("--router-backends", nargs="+", choices=list(SERVER_KIND),
+                        default=["Ollama", "GPT"], help="Router 선택 시 백엔드")
+    parser.add_argument("--mode", choices=["sync", "async", "both"], default="sync")
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 4, 16, 64])
+    parser.add_argument("--requests", type=int, default=0,
+                        help="단계별 요청 수 (기본: max(20, 동시성 × 4))")
+    parser.add_argument("--ttft", type=float, default=0.05)
+    parser.add_argument("--token-delay", type=float, default=0.002)
+    parser.add_argument("--num-tokens", type=int, default=50)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=429)
+    parser.add_argument("--image-size", type=int, default=512, help="입력 PNG 한 변 (px)")
+    parser.add_argument("--json", help="결과 JSON 저장 경로")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    import numpy as np
+
+    from core.image_processor import array_to_png_bytes
+
+    rng = np.random.default_rng(0)
+    image = array_to_png_bytes(
+        rng.integers(0, 256, size=(args.image_size, args.image_size), dtype=np.uint8)
+    )
+    modes = ["sync", "async"] if args.mode == "both" else [args.mode]
+
+    process, conn, urls = start_servers(args)
+    configure_env(urls)
+    rows = []
+    try:
+        for provider in args.providers:
+            try:
+                client = make_client(provider, args.router_backends)
+                # 워밍업: 커넥션 / 이미지 캐시 / SDK 임포트 (미설치 SDK는 여기서 ImportError)
+                "".join(client.stream_analyze(image, PROMPT))
+            except ImportError as e:
+                print(f"{provider:<8} 건너뜀 ({e.name or e} 미설치)")
+                rows.append({"provider": provider, "skipped": f"{e.name or e} 미설치"})
+                continue
+            server_urls = [
+                urls[SERVER_KIND[p]]
+                for p in ([provider] if provider in SERVER_KIND else args.router_backends)
+            ]
+            for mode in modes:
+                for concurrency in args.concurrency:
+                    requests = args.requests or max(20, concurrency * 4)
+                    for url in server_urls:
+                        _server_stats(url, reset=True)
+                    results, wall, cpu = run_level(client, mode, concurrency, requests, image)
+                    stats = [_server_stats(url) for url in server_urls]
+                    handled = sum(s["handled"] for s in stats)
+                    server = {
+                        "requests": sum(s["requests"] for s in stats),
+                        "mean_s": (
+                            sum(s["mean_s"] * s["handled"] for s in stats if s["mean_s"]) / handled
+                            if handled else None
+                        ),
+                    }
+                    row = summarize(provider, mode, concurrency, results, wall, cpu,
+                                    server, args.num_tokens)
+                    rows.append(row)
+                    print(
+                        f"{provider:<8} {mode:<5} c={concurrency:<4} "
+                        f"{_fmt(row['req_per_s']):>7} req/s  "
+                        f"TTFT p50 {_fmt(row['ttft_p50_ms']):>7}ms p95 {_fmt(row['ttft_p95_ms']):>7}ms  "
+                        f"total p50 {_fmt(row['total_p50_ms']):>7}ms p99 {_fmt(row['total_p99_ms']):>7}ms  "
+                        f"overhead {_fmt(row['overhead_ms']):>6}ms  cpu {_fmt(row['cpu_ms_per_req'], 2):>6}ms/req"
+                        + (f"  errors {row['error_classes']}" if row["errors"] else ""),
+                        flush=True,
+                    )
+    finally:
+        conn.send("stop")
+        process.join(timeout=5)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"config": vars(args), "results": rows}, f, indent=2, ensure_ascii=False)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,469 @@
+"""Streamlit 다중 세션 부하 테스트 (AppTest 기반, 가짜 Ollama 서버 사용)
+
+한 앱 프로세스가 동시 판독의 몇 명까지 감당하는지 보기 위해, 이 프로세스
+안에서 세션 N개를 스레드로 동시에 돌린다. 각 세션은 Streamlit
+``AppTest``로 실제 페이지 스크립트를 실행한다 (서버의 세션별 스크립트
+스레드와 같은 구조 — 캐시 · 커넥션 풀 · 작업 관리자 등 프로세스 전역
+객체를 세션끼리 공유).
+
+세션 시나리오 (``--duration`` 동안 반복):
+  1. ``pages/1_Viewer.py`` 열기 → CT 선택 → 합성 NIfTI 업로드
+  2. Axial 슬라이더를 ``--scrub-hz`` 속도로 ``--scrub-steps``번 이동, W/L 조정
+  3. ``pages/2_LLM_Analysis.py``에서 Ollama(가짜 서버)로 판독 요청 → 스트림 완료까지
+  4. ``--think`` 초 쉬고 2로
+
+측정 항목 (동시 세션 수별):
+  - 상호작용(open / upload / scrub / window / analysis ...)별 p50 / p95 / p99
+  - 초당 상호작용 수, 오류 수
+  - 세션당 CPU (프로세스 CPU 사용률 / N), 세션당 RSS 증가량
+  - 포화 지점: scrub p95가 ``--slo-ms``를 넘거나 처리량 증가가 10% 미만이 되는 첫 단계
+
+브라우저 ↔ 서버 웹소켓 전송(델타 직렬화)은 포함하지 않는다.
+LLM 작업 동시 실행 수는 ``LLM_JOB_WORKERS``를 따른다 (판독 대기도 지연에 포함).
+
+Usage (app/ 디렉터리에서):
+    python -m benchmarks.load_test
+    python -m benchmarks.load_test --sessions 1 4 8 16 --duration 60 --json bench/load.json
+    python -m benchmarks.load_test --json after.json --compare before.json --check
+"""
+
+import argparse
+import gc
+import importlib.util
+import json
+import logging
+import multiprocessing
+import os
+import random
+import resource
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import fake_servers, synthetic  # noqa: E402
+from core.profiling import percentile  # noqa: E402
+
+APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+VIEWER_PAGE = os.path.join(APP_ROOT, "pages", "1_Viewer.py")
+ANALYSIS_PAGE = os.path.join(APP_ROOT, "pages", "2_LLM_Analysis.py")
+
+OLLAMA_MODEL = "llava:7b"
+
+# 세션 시나리오의 상호작용 이름 (출력 순서)
+INTERACTIONS = (
+    "open", "modality", "upload", "scrub", "window",
+    "analysis.open", "analysis.select", "analysis",
+)
+
+# 포화 판정: 이전 단계 대비 처리량 증가가 이 비율 미만이면 포화
+PLATEAU_GAIN = 0.10
+
+
+def _rss_mb() -> float:
+    """현재 RSS (MB) — /proc 없으면 최대 RSS로 대체"""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+# ── 가짜 LLM ──────────────────────────────────────────────────────────────────
+def start_fake_ollama(args) -> tuple:
+    """가짜 Ollama 서버 프로세스 시작 → (프로세스, 부모 쪽 Pipe, URL)"""
+    ctx = multiprocessing.get_context("spawn")
+    parent, child = ctx.Pipe()
+    process = ctx.Process(
+        target=fake_servers.serve,
+        args=(child,),
+        kwargs={
+            "ollama": 1,
+            "ollama_models": [OLLAMA_MODEL],
+            "load_delay": 0.0,
+            "parallel": max(args.sessions),
+            "ttft": args.ttft,
+            "token_delay": args.token_delay,
+            "num_tokens": args.num_tokens,
+            "seed": 0,
+        },
+        daemon=True,
+    )
+    process.start()
+    urls = parent.recv()
+    return process, parent, urls["ollama"][0]
+
+
+def configure_env(ollama_url: str) -> None:
+    """페이지가 가짜 Ollama를 쓰도록 환경변수 설정 후 가용성 1회 확인"""
+    os.environ.pop("OLLAMA_HOSTS", None)
+    os.environ.pop("LLM_ROUTER_BACKENDS", None)
+    os.environ["OLLAMA_HOST"] = ollama_url
+    os.environ["OLLAMA_MODEL"] = OLLAMA_MODEL
+
+    from llm.availability import get_availability_service
+
+    service = get_availability_service()
+    service.probe()
+    if not service.snapshot()["Ollama"].available:
+        raise RuntimeError(f"가짜 Ollama 서버에 연결할 수 없습니다: {ollama_url}")
+
+
+# ── 세션 시나리오 ─────────────────────────────────────────────────────────────
+class Session:
+    """한 사용자의 Viewer → LLM Analysis 반복 시나리오"""
+
+    def __init__(self, index: int, args, upload: tuple, records: list, lock: threading.Lock):
+        self.index = index
+        self.args = args
+        self.upload = upload          # (파일명, bytes, MIME)
+        self.records = records
+        self.lock = lock
+        self.rng = random.Random(index)
+        self.uid = f"load{index:04d}"
+        self.viewer = None
+
+    def _timed(self, name: str, action) -> bool:
+        started = time.perf_counter()
+        try:
+            at = action()
+            ok = not (at is not None and at.exception)
+            error = None if ok else "ScriptException"
+        except Exception as e:
+            ok, error = False, type(e).__name__
+        elapsed = time.perf_counter() - started
+        with self.lock:
+            self.records.append({"interaction": name, "seconds": elapsed, "ok": ok, "error": error})
+        return ok
+
+    def _app(self, page: str):
+        from streamlit.testing.v1 import AppTest
+
+        at = AppTest.from_file(page, default_timeout=self.args.timeout)
+        at.query_params["uid"] = self.uid
+        return at
+
+    def _upload(self) -> object:
+        at = self.viewer
+        uploader = getattr(at, "file_uploader", None)
+        if uploader is not None:
+            return uploader(key="ct_upload").set_value(self.upload).run()
+
+        # AppTest에 file_uploader가 없는 streamlit: 같은 로더를 거쳐 세션 상태로 주입
+        from core.dicom_loader import load_nifti
+
+        name, data, _ = self.upload
+        volume, spacing = load_nifti(data, name)
+        at.session_state["modality"] = "ct"
+        at.session_state["ct_volume"] = volume
+        at.session_state["ct_spacing"] = spacing
+        return at.run()
+
+    def open_study(self) -> bool:
+        self.viewer = self._app(VIEWER_PAGE)
+        return (
+            self._timed("open", lambda: self.viewer.run())
+            and self._timed(
+                "modality",
+                lambda: self.viewer.radio(key="viewer_modality_radio").set_value("CT").run(),
+            )
+            and self._timed("upload", self._upload)
+        )
+
+    def scrub(self) -> None:
+        """슬라이더 드래그 — 이동 사이 간격을 1 / scrub_hz로 맞춤"""
+        slider = self.viewer.slider(key="ct_axial")
+        lo, hi = slider.min, slider.max
+        value = slider.value
+        direction = self.rng.choice((-1, 1))
+        interval = 1.0 / self.args.scrub_hz
+        for _ in range(self.args.scrub_steps):
+            started = time.perf_counter()
+            if not lo <= value + direction <= hi:
+                direction = -direction
+            value += direction
+            self._timed(
+                "scrub", lambda: self.viewer.slider(key="ct_axial").set_value(value).run()
+            )
+            time.sleep(max(0.0, interval - (time.perf_counter() - started)))
+
+        wc = self.viewer.slider(key="ct_wc")
+        for _ in range(self.args.window_steps):
+            value = self.rng.randint(max(wc.min, -200), min(wc.max, 400))
+            self._timed("window", lambda: self.viewer.slider(key="ct_wc").set_value(value).run())
+            time.sleep(interval)
+
+    def analyze(self) -> None:
+        """현재 뷰 이미지로 판독 요청 (Viewer → LLM Analysis 페이지 이동)"""
+        # 페이지 이동마다 새 스크립트 실행 — 세션 상태 중 페이지가 쓰는 값만 넘김
+        at = self._app(ANALYSIS_PAGE)
+        at.session_state["current_image_bytes"] = self.viewer.session_state["current_image_bytes"]
+        at.session_state["modality"] = "ct"
+        at.session_state["user_id"] = self.uid
+        if not self._timed("analysis.open", lambda: at.run()):
+            return
+        if not self._timed(
+            "analysis.select",
+            lambda: at.radio(key="selected_llm_radio").set_value("Ollama").run(),
+        ):
+            return
+
+        def request():
+            button = next(b for b in at.button if "판독 요청" in str(b.label))
+            at_ = button.click().run()
+            # attach_job이 스트림을 끝까지 소비하므로 rerun 종료 = 판독 완료
+            if not at_.session_state["last_report"]:
+                raise RuntimeError("판독문 없음")
+            return at_
+
+        self._timed("analysis", request)
+
+    def run(self, deadline: float) -> None:
+        if not self.open_study():
+            return
+        cycle = 0
+        while time.perf_counter() < deadline:
+            self.scrub()
+            if self.args.analysis_every and cycle % self.args.analysis_every == 0:
+                self.analyze()
+            cycle += 1
+            think = self.args.think * self.rng.uniform(0.5, 1.5)
+            time.sleep(max(0.0, min(think, deadline - time.perf_counter())))
+
+
+# ── 단계 실행 / 요약 ──────────────────────────────────────────────────────────
+def run_level(args, sessions: int, upload: tuple) -> dict:
+    """동시 세션 N개를 duration 동안 실행 → 단계 요약"""
+    gc.collect()
+    records: List[dict] = []
+    lock = threading.Lock()
+    users = [Session(i, args, upload, records, lock) for i in range(sessions)]
+    rss_before = _rss_mb()
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    deadline = wall_start + args.duration
+
+    threads = []
+    for user in users:
+        t = threading.Thread(target=user.run, args=(deadline,), name=f"load-{user.uid}")
+        t.start()
+        threads.append(t)
+        time.sleep(args.ramp / max(sessions, 1))   # 동시 업로드 몰림 완화
+    for t in threads:
+        t.join()
+
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    rss_after = _rss_mb()   # 세션 상태(볼륨 등)가 아직 살아 있는 시점
+    del users
+    gc.collect()
+    return summarize(sessions, records, wall, cpu, rss_before, rss_after)
+
+
+def summarize(sessions, records, wall, cpu, rss_before, rss_after) -> dict:
+    interactions = {}
+    errors: Dict[str, int] = {}
+    for name in INTERACTIONS:
+        rows = [r for r in records if r["interaction"] == name]
+        if not rows:
+            continue
+        ok = [r["seconds"] for r in rows if r["ok"]]
+        interactions[name] = {
+            "count": len(rows),
+            "errors": len(rows) - len(ok),
+            "p50_ms": _ms(percentile(ok, 50)),
+            "p95_ms": _ms(percentile(ok, 95)),
+            "p99_ms": _ms(percentile(ok, 99)),
+        }
+    for r in records:
+        if not r["ok"]:
+            errors[r["error"]] = errors.get(r["error"], 0) + 1
+    return {
+        "sessions": sessions,
+        "wall_s": wall,
+        "interactions_per_s": sum(1 for r in records if r["ok"]) / wall if wall else None,
+        "errors": sum(errors.values()),
+        "error_classes": errors,
+        "cpu_util": cpu / wall if wall else None,
+        "cpu_pct_per_session": cpu / wall / sessions * 100 if wall else None,
+        "rss_mb": rss_after,
+        "rss_mb_per_session": (rss_after - rss_before) / sessions,
+        "interactions": interactions,
+    }
+
+
+def find_saturation(levels: List[dict], slo_ms: float) -> Optional[dict]:
+    """처음으로 scrub p95 SLO 초과 또는 처리량 정체가 나타난 단계"""
+    previous = None
+    for level in levels:
+        scrub = level["interactions"].get("scrub", {})
+        p95 = scrub.get("p95_ms")
+        if p95 is not None and p95 > slo_ms:
+            return {"sessions": level["sessions"], "reason": f"scrub p95 {p95:.0f}ms > {slo_ms:.0f}ms"}
+        if previous and previous["interactions_per_s"] and level["interactions_per_s"] is not None:
+            gain = level["interactions_per_s"] / previous["interactions_per_s"] - 1
+            if gain < PLATEAU_GAIN:
+                return {"sessions": level["sessions"], "reason": f"처리량 증가 {gain:+.0%}"}
+        previous = level
+    return None
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> List[dict]:
+    """같은 세션 수 · 상호작용의 p95가 threshold 비율 이상 늘어난 항목"""
+    before = {
+        (level["sessions"], name): stats
+        for level in baseline.get("levels", [])
+        for name, stats in level["interactions"].items()
+    }
+    rows = []
+    for level in current["levels"]:
+        for name, stats in level["interactions"].items():
+            old = before.get((level["sessions"], name))
+            if not old or not old.get("p95_ms") or stats.get("p95_ms") is None:
+                continue
+            ratio = stats["p95_ms"] / old["p95_ms"]
+            rows.append({
+                "sessions": level["sessions"],
+                "interaction": name,
+                "p95_before_ms": old["p95_ms"],
+                "p95_after_ms": stats["p95_ms"],
+                "ratio": ratio,
+                "regressed": ratio > 1 + threshold,
+            })
+    return rows
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    return None if seconds is None else seconds * 1000
+
+
+def _fmt(value, digits: int = 0) -> str:
+    return "-" if value is None else f"{value:.{digits}f}"
+
+
+def print_level(level: dict) -> None:
+    print(
+        f"\n세션 {level['sessions']:>3}  {_fmt(level['interactions_per_s'], 1)} 상호작용/s  "
+        f"CPU {_fmt(level['cpu_util'] * 100)}% (세션당 {_fmt(level['cpu_pct_per_session'], 1)}%)  "
+        f"RSS {_fmt(level['rss_mb'])}MB (세션당 +{_fmt(level['rss_mb_per_session'], 1)}MB)"
+        + (f"  오류 {level['error_classes']}" if level["errors"] else ""),
+        flush=True,
+    )
+    for name, s in level["interactions"].items():
+        print(
+            f"  {name:<16} n={s['count']:<5} p50 {_fmt(s['p50_ms']):>6}ms  "
+            f"p95 {_fmt(s['p95_ms']):>6}ms  p99 {_fmt(s['p99_ms']):>6}ms"
+            + (f"  오류 {s['errors']}" if s["errors"] else ""),
+            flush=True,
+        )
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Streamlit 다중 세션 부하 테스트")
+    parser.add_argument("--sessions", nargs="+", type=int, default=[1, 2, 4, 8, 16],
+                        help="동시 세션 수 단계")
+    parser.add_argument("--duration", type=float, default=30.0, help="단계별 실행 시간 (초)")
+    parser.add_argument("--ramp", type=float, default=2.0, help="세션 시작을 나눠 배치할 시간 (초)")
+    parser.add_argument("--slices", type=int, default=96, help="합성 CT 슬라이스 수")
+    parser.add_argument("--matrix", type=int, default=256, help="합성 CT 슬라이스 크기")
+    parser.add_argument("--scrub-hz", type=float, default=5.0, help="슬라이더 이동 속도 (회/초)")
+    parser.add_argument("--scrub-steps", type=int, default=15, help="주기당 슬라이더 이동 수")
+    parser.add_argument("--window-steps", type=int, default=3, help="주기당 W/L 조정 수")
+    parser.add_argument("--analysis-every", type=int, default=1,
+                        help="몇 주기마다 판독 요청 (0이면 판독 없음)")
+    parser.add_argument("--think", type=float, default=2.0, help="주기 사이 평균 대기 (초)")
+    parser.add_argument("--ttft", type=float, default=0.3, help="가짜 LLM 첫 토큰 지연 (초)")
+    parser.add_argument("--token-delay", type=float, default=0.01)
+    parser.add_argument("--num-tokens", type=int, default=150)
+    parser.add_argument("--timeout", type=float, default=120.0, help="rerun 1회 제한 시간 (초)")
+    parser.add_argument("--slo-ms", type=float, default=300.0, help="scrub p95 목표 (포화 판정)")
+    parser.add_argument("--json", help="결과 JSON 저장 경로")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON")
+    parser.add_argument("--threshold", type=float, default=0.20, help="회귀 판정 비율 (기본 20%%)")
+    parser.add_argument("--check", action="store_true", help="회귀가 있으면 종료 코드 1")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    if importlib.util.find_spec("streamlit") is None:
+        print("streamlit이 설치되어 있지 않습니다 (pip install -r requirements.txt)")
+        return 1
+    # 스레드별 "missing ScriptRunContext" 등 경고가 결과 출력을 덮지 않도록
+    # (AppTest가 실행마다 streamlit 로거 수준을 다시 설정하므로 전역으로 끔)
+    logging.disable(logging.WARNING)
+
+    from benchmarks.imaging import machine_info
+
+    volume = synthetic.phantom_volume(args.slices, args.matrix)
+    upload = ("phantom.nii.gz", synthetic.nifti_bytes(volume, gz=True), "application/gzip")
+    del volume
+
+    process, conn, url = start_fake_ollama(args)
+    levels = []
+    try:
+        configure_env(url)
+        print(f"가짜 Ollama {url} · CT {args.slices}x{args.matrix}x{args.matrix} "
+              f"({len(upload[1]) / 1e6:.1f}MB .nii.gz) · 단계별 {args.duration:g}s", flush=True)
+
+        # 워밍업 (임포트 · 렌더러 · 커넥션 풀) — 결과에서 제외
+        warm = argparse.Namespace(**{**vars(args), "scrub_steps": 2, "window_steps": 1})
+        Session(-1, warm, upload, [], threading.Lock()).run(time.perf_counter())
+
+        for sessions in args.sessions:
+            level = run_level(args, sessions, upload)
+            levels.append(level)
+            print_level(level)
+    finally:
+        conn.send("stop")
+        process.join(timeout=5)
+
+    saturation = find_saturation(levels, args.slo_ms)
+    print(
+        "\n포화 지점: "
+        + (f"세션 {saturation['sessions']} ({saturation['reason']})" if saturation
+           else f"측정 범위 내 없음 (최대 {max(args.sessions)} 세션)")
+    )
+
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "machine": machine_info(),
+        "config": {
+            k: getattr(args, k)
+            for k in ("duration", "slices", "matrix", "scrub_hz", "scrub_steps", "window_steps",
+                      "analysis_every", "think", "ttft", "token_delay", "num_tokens")
+        },
+        "env": {k: os.getenv(k) for k in ("LLM_JOB_WORKERS", "LLM_JOB_PER_USER") if os.getenv(k)},
+        "levels": levels,
+        "saturation": saturation,
+    }
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+    if not args.compare:
+        return 0
+    with open(args.compare) as f:
+        baseline = json.load(f)
+    if baseline.get("machine") != report["machine"]:
+        print("\n주의: 다른 머신 / 환경의 결과와 비교 중 — 수치 차이를 회귀로 보기 어렵습니다.")
+    if baseline.get("config") != report["config"]:
+        print("주의: 시나리오 설정이 다른 결과와 비교 중입니다.")
+
+    rows = compare(report, baseline, args.threshold)
+    print(f"\n{'세션':>4} {'상호작용':<16} {'이전 p95':>10} {'현재 p95':>10} {'비율':>7}")
+    for row in rows:
+        print(f"{row['sessions']:>4} {row['interaction']:<16} {row['p95_before_ms']:>8.0f}ms "
+              f"{row['p95_after_ms']:>8.0f}ms {row['ratio']:>6.2f}x"
+              f"{'  회귀' if row['regressed'] else ''}")
+    regressed = [f"{row['sessions']}:{row['interaction']}" for row in rows if row["regressed"]]
+    if args.check and regressed:
+        print(f"\n회귀 ({args.threshold:.0%} 초과): {', '.join(regressed)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
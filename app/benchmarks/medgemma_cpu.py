@@ -0,0 +1,210 @@
+"""MedGemma CPU 추론 설정별 벤치마크 (tokens/s, prefill 시간, peak RSS)
+
+설정마다 별도 서브프로세스에서 실행하여 peak RSS가 서로 섞이지 않도록 한다.
+``--tiny`` 는 같은 아키텍처(Gemma3ForConditionalGeneration)의 작은 랜덤
+초기화 모델을 사용하므로 가중치 다운로드 없이 설정 간 상대 비교가 가능하다.
+
+Usage (app/ 디렉터리에서):
+    python -m benchmarks.medgemma_cpu --tiny
+    python -m benchmarks.medgemma_cpu --model google/medgemma-4b-it --new-tokens 64
+    python -m benchmarks.medgemma_cpu --tiny --configs fp32 int8 --json out.json
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from llm.cpu_inference import (  # noqa: E402
+    CPUInferenceConfig,
+    configure_threads,
+    cpu_supports_bf16,
+    optimize_for_cpu,
+)
+
+# 설정 이름 → (int8, bf16, static_cache, attn_implementation)
+CONFIGS = {
+    "fp32-eager": (False, False, False, "eager"),
+    "fp32": (False, False, False, "sdpa"),
+    "fp32-static": (False, False, True, "sdpa"),
+    "bf16": (False, True, False, "sdpa"),
+    "bf16-static": (False, True, True, "sdpa"),
+    "int8": (True, False, False, "sdpa"),
+    "int8-static": (True, False, True, "sdpa"),
+}
+
+
+def _tiny_model(attn_implementation: str, dtype):
+    """MedGemma(Gemma3)와 동일 아키텍처의 소형 랜덤 모델"""
+    from transformers import Gemma3Config, Gemma3ForConditionalGeneration
+
+    config = Gemma3Config(
+        text_config={
+            "vocab_size": 4096,
+            "hidden_size": 256,
+            "intermediate_size": 1024,
+            "num_hidden_layers": 4,
+            "num_attention_heads": 4,
+            "num_key_value_heads": 1,
+            "head_dim": 64,
+            "max_position_embeddings": 4096,
+            "sliding_window": 512,
+        },
+        vision_config={
+            "hidden_size": 128,
+            "intermediate_size": 256,
+            "num_hidden_layers": 2,
+            "num_attention_heads": 2,
+            "image_size": 224,
+            "patch_size": 14,
+        },
+        mm_tokens_per_image=16,
+    )
+    config._attn_implementation = attn_implementation
+    return Gemma3ForConditionalGeneration(config).to(dtype).eval()
+
+
+def _pretrained_model(model_id: str, attn_implementation: str, dtype):
+    from transformers import AutoModelForImageTextToText
+
+    return AutoModelForImageTextToText.from_pretrained(
+        model_id,
+        torch_dtype=dtype,
+        device_map="cpu",
+        attn_implementation=attn_implementation,
+        low_cpu_mem_usage=True,
+        token=os.getenv("HF_TOKEN"),
+    ).eval()
+
+
+def run_config(name: str, args: argparse.Namespace) -> dict:
+    """현재 프로세스에서 설정 1개 측정"""
+    import torch
+
+    int8, bf16, static_cache, attn = CONFIGS[name]
+    config = CPUInferenceConfig(
+        quantize_int8=int8,
+        bf16=bf16,
+        intra_op_threads=args.threads,
+        inter_op_threads=args.interop_threads,
+        static_cache=static_cache,
+    )
+    configure_threads(config)
+    dtype = torch.bfloat16 if bf16 else torch.float32
+
+    torch.manual_seed(0)
+    load_started = time.perf_counter()
+    if args.tiny:
+        model = _tiny_model(attn, dtype)
+    else:
+        model = _pretrained_model(args.model, attn, dtype)
+    model = optimize_for_cpu(model, config)
+    load_s = time.perf_counter() - load_started
+
+    vocab = model.config.get_text_config().vocab_size
+    input_ids = torch.randint(10, min(vocab, 32000), (1, args.prompt_tokens))
+    gen_kwargs = {
+        "max_new_tokens": args.new_tokens,
+        "min_new_tokens": args.new_tokens,
+        "do_sample": False,
+    }
+    if static_cache:
+        gen_kwargs["cache_implementation"] = "static"
+
+    with torch.inference_mode():
+        model.generate(input_ids, max_new_tokens=2)  # 워밍업
+
+        started = time.perf_counter()
+        model(input_ids=input_ids)
+        prefill_s = time.perf_counter() - started
+
+        runs = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            output = model.generate(input_ids, **gen_kwargs)
+            runs.append(time.perf_counter() - started)
+
+    generated = output.shape[-1] - input_ids.shape[-1]
+    best = min(runs)
+    return {
+        "config": name,
+        "load_s": round(load_s, 3),
+        "prefill_s": round(prefill_s, 4),
+        "generate_s": round(best, 4),
+        "new_tokens": int(generated),
+        "tokens_per_s": round(generated / best, 2) if best > 0 else None,
+        # Linux ru_maxrss 단위는 KB
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "threads": torch.get_num_threads(),
+    }
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.medgemma_cpu")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--tiny", action="store_true", help="소형 랜덤 Gemma3 모델 사용")
+    source.add_argument("--model", default="google/medgemma-4b-it")
+    parser.add_argument("--configs", nargs="+", default=list(CONFIGS), choices=list(CONFIGS))
+    parser.add_argument("--prompt-tokens", type=int, default=256)
+    parser.add_argument("--new-tokens", type=int, default=32)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--threads", type=int, default=None)
+    parser.add_argument("--interop-threads", type=int, default=None)
+    parser.add_argument("--json", default=None, help="결과 JSON 저장 경로")
+    parser.add_argument("--run-config", default=None, help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def _child_argv(args: argparse.Namespace, name: str) -> list:
+    argv = [sys.executable, "-m", "benchmarks.medgemma_cpu", "--run-config", name,
+            "--prompt-tokens", str(args.prompt_tokens),
+            "--new-tokens", str(args.new_tokens),
+            "--repeat", str(args.repeat)]
+    argv += ["--tiny"] if args.tiny else ["--model", args.model]
+    if args.threads:
+        argv += ["--threads", str(args.threads)]
+    if args.interop_threads:
+        argv += ["--interop-threads", str(args.interop_threads)]
+    return argv
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+
+    if args.run_config:
+        print(json.dumps(run_config(args.run_config, args)))
+        return 0
+
+    app_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    results = []
+    for name in args.configs:
+        if CONFIGS[name][1] and not cpu_supports_bf16():
+            print(f"{name:<12} (CPU에 네이티브 bf16 없음 — 에뮬레이션으로 측정)")
+        proc = subprocess.run(
+            _child_argv(args, name), cwd=app_root, capture_output=True, text=True
+        )
+        if proc.returncode != 0:
+            print(f"{name:<12} FAILED\n{proc.stderr.strip()[-2000:]}")
+            continue
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        results.append(result)
+        print(
+            f"{name:<12} {result['tokens_per_s']:>9} tok/s  "
+            f"prefill {result['prefill_s']:>8.4f}s  "
+            f"peak RSS {result['peak_rss_mb']:>8.1f} MB  "
+            f"threads {result['threads']}"
+        )
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"model": "tiny" if args.tiny else args.model, "results": results}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+"""다중 Ollama 호스트 풀 벤치마크 (가짜 Ollama 서버 사용)
+
+가짜 Ollama 서버 여러 대를 띄워 단일 호스트 / 호스트 풀 구성에서 같은
+요청 부하를 보내고, 지연 분포 · 호스트별 분배 · 콜드 로드 횟수를 비교한다.
+
+Usage (app/ 디렉터리에서):
+    python -m benchmarks.ollama_pool
+    python -m benchmarks.ollama_pool --hosts 4 --requests 80 --concurrency 16
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_servers import FakeOllamaServer  # noqa: E402
+from core.profiling import percentile  # noqa: E402
+
+MODELS = ["llava:13b", "llava:7b"]
+
+
+def run_scenario(name: str, servers, host_urls, args) -> dict:
+    from llm import ollama_pool
+    from llm.ollama_client import OllamaClient
+
+    os.environ.pop("OLLAMA_HOSTS", None)
+    if len(host_urls) > 1:
+        os.environ["OLLAMA_HOSTS"] = ",".join(host_urls)
+        ollama_pool.get_ollama_pool().probe_all()
+    else:
+        os.environ["OLLAMA_HOST"] = host_urls[0]
+
+    before = [(s.requests, s.loads) for s in servers]
+
+    def one(i: int) -> float:
+        client = OllamaClient(model=MODELS[i % len(MODELS)])
+        started = time.perf_counter()
+        "".join(client.stream_analyze(args.image, "benchmark"))
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        latencies = list(pool.map(one, range(args.requests)))
+    wall = time.perf_counter() - started
+
+    return {
+        "scenario": name,
+        "wall_s": round(wall, 3),
+        "p50_s": round(statistics.median(latencies), 3),
+        "p95_s": round(percentile(latencies, 95), 3),
+        "max_s": round(max(latencies), 3),
+        "per_host": [s.requests - b[0] for s, b in zip(servers, before)],
+        "cold_loads": sum(s.loads - b[1] for s, b in zip(servers, before)),
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Ollama 호스트 풀 벤치마크")
+    parser.add_argument("--hosts", type=int, default=3)
+    parser.add_argument("--requests", type=int, default=60)
+    parser.add_argument("--concurrency", type=int, default=12)
+    parser.add_argument("--parallel", type=int, default=2, help="서버당 동시 생성 수")
+    parser.add_argument("--load-delay", type=float, default=1.0)
+    parser.add_argument("--json", help="결과 JSON 저장 경로")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    from core.image_processor import array_to_png_bytes
+    import numpy as np
+
+    args.image = array_to_png_bytes(np.zeros((64, 64), dtype=np.uint8))
+    os.environ["OLLAMA_KEEP_ALIVE"] = "30m"
+
+    results = []
+    # 시나리오마다 새 서버 (상주 모델 상태 초기화), 첫 서버에만 모델 하나 선로드
+    for name, use_pool in (("single-host", False), ("pool", True)):
+        servers = [
+            FakeOllamaServer(
+                MODELS,
+                preloaded=[MODELS[i % len(MODELS)]] if i < len(MODELS) else [],
+                load_delay=args.load_delay,
+                parallel=args.parallel,
+            ).start()
+            for i in range(args.hosts)
+        ]
+        urls = [s.url for s in servers]
+        try:
+            results.append(run_scenario(name, servers, urls if use_pool else urls[:1], args))
+        finally:
+            for server in servers:
+                server.stop()
+
+    for r in results:
+        print(
+            f"{r['scenario']:<12} wall {r['wall_s']:>7.2f}s  p50 {r['p50_s']:>6.2f}s  "
+            f"p95 {r['p95_s']:>6.2f}s  cold loads {r['cold_loads']}  per host {r['per_host']}"
+        )
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"results": results}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,221 @@
+"""벤치마크용 합성 영상 생성 (CT 시리즈 / NIfTI / 대형 X-ray)
+
+실제 환자 데이터 없이 로더 · 렌더러의 크기별 성능을 재현하기 위한 팬텀을
+만든다. 같은 인자면 항상 같은 데이터가 생성된다 (seed 고정).
+
+  - ``phantom_volume``   : 몸통 / 폐 / 척추 / 노이즈로 된 CT 유사 HU 볼륨
+  - ``write_ct_series``  : 슬라이스별 DICOM 파일 (비압축 또는 RLE Lossless)
+  - ``nifti_bytes``      : .nii / .nii.gz bytes (``load_nifti`` 입력)
+  - ``xray_dicom_bytes`` : 대형 DX 영상 DICOM bytes (``load_xray`` 입력)
+
+pydicom / nibabel은 해당 생성 함수 호출 시점에 임포트한다.
+"""
+
+import gzip
+import os
+from io import BytesIO
+from typing import List, Tuple
+
+import numpy as np
+
+# 저장 dtype → (PixelRepresentation, BitsStored, RescaleIntercept)
+CT_DTYPES = {
+    "int16": (1, 16, 0.0),
+    "uint16": (0, 12, -1024.0),
+}
+
+
+def _ellipse(yy: np.ndarray, xx: np.ndarray, cy: float, cx: float, ry: float, rx: float):
+    return ((yy - cy) / ry) ** 2 + ((xx - cx) / rx) ** 2 <= 1.0
+
+
+def phantom_volume(
+    slices: int = 128, matrix: int = 512, seed: int = 0
+) -> np.ndarray:
+    """CT 유사 팬텀 볼륨 (Z x Y x X, int16 HU)
+
+    공기(-1000) 안에 몸통(연부조직 40), 좌우 폐(-850, z에 따라 크기 변화),
+    척추(700)를 두고 ±20 HU 노이즈를 더한다.
+    """
+    rng = np.random.default_rng(seed)
+    yy, xx = np.mgrid[0:matrix, 0:matrix].astype(np.float32)
+    c = matrix / 2
+    body = _ellipse(yy, xx, c, c, matrix * 0.36, matrix * 0.45)
+    spine = _ellipse(yy, xx, c + matrix * 0.22, c, matrix * 0.06, matrix * 0.06)
+
+    volume = np.empty((slices, matrix, matrix), dtype=np.int16)
+    for z in range(slices):
+        # 폐는 볼륨 가운데에서 가장 크고 위아래로 갈수록 작아짐
+        scale = max(0.0, 1.0 - abs(2.0 * z / max(slices - 1, 1) - 1.0) ** 2)
+        lung_r = matrix * 0.14 * scale
+        plane = np.full((matrix, matrix), -1000, dtype=np.int16)
+        plane[body] = 40
+        if lung_r > 1:
+            for side in (-1, 1):
+                lung = _ellipse(yy, xx, c - matrix * 0.02, c + side * matrix * 0.2,
+                                lung_r * 1.3, lung_r)
+                plane[lung] = -850
+        plane[spine] = 700
+        noise = rng.integers(-20, 21, size=(matrix, matrix), dtype=np.int16)
+        volume[z] = plane + noise * body
+    return volume
+
+
+def _ct_dataset(
+    pixels: np.ndarray,
+    index: int,
+    spacing: Tuple[float, float, float],
+    dtype: str,
+    series_uid: str,
+    study_uid: str,
+):
+    from pydicom.dataset import Dataset, FileMetaDataset
+    from pydicom.uid import CTImageStorage, ExplicitVRLittleEndian, generate_uid
+
+    representation, bits_stored, intercept = CT_DTYPES[dtype]
+    stored = (pixels.astype(np.int32) - int(intercept)).astype(dtype)
+
+    meta = FileMetaDataset()
+    meta.MediaStorageSOPClassUID = CTImageStorage
+    meta.MediaStorageSOPInstanceUID = generate_uid()
+    meta.TransferSyntaxUID = ExplicitVRLittleEndian
+
+    ds = Dataset()
+    ds.file_meta = meta
+    ds.SOPClassUID = CTImageStorage
+    ds.SOPInstanceUID = meta.MediaStorageSOPInstanceUID
+    ds.StudyInstanceUID = study_uid
+    ds.SeriesInstanceUID = series_uid
+    ds.Modality = "CT"
+    ds.PatientName = "Synthetic^Phantom"
+    ds.PatientID = "SYNTHETIC"
+    ds.InstanceNumber = index + 1
+    z = index * spacing[0]
+    ds.ImagePositionPatient = [0.0, 0.0, z]
+    ds.SliceLocation = z
+    ds.SliceThickness = spacing[0]
+    ds.PixelSpacing = [spacing[1], spacing[2]]
+    ds.Rows, ds.Columns = stored.shape
+    ds.SamplesPerPixel = 1
+    ds.PhotometricInterpretation = "MONOCHROME2"
+    ds.BitsAllocated = 16
+    ds.BitsStored = bits_stored
+    ds.HighBit = bits_stored - 1
+    ds.PixelRepresentation = representation
+    ds.RescaleSlope = 1
+    ds.RescaleIntercept = intercept
+    ds.WindowCenter = 40
+    ds.WindowWidth = 400
+    ds.PixelData = stored.tobytes()
+    return ds, stored
+
+
+def _save(ds, path) -> None:
+    try:
+        ds.save_as(path, enforce_file_format=True)
+    except TypeError:  # pydicom < 3
+        ds.is_little_endian = True
+        ds.is_implicit_VR = False
+        ds.save_as(path, write_like_original=False)
+
+
+def _compress_rle(ds, stored: np.ndarray) -> None:
+    from pydicom.uid import RLELossless
+
+    ds.compress(RLELossless, stored)
+
+
+def write_ct_series(
+    folder: str,
+    volume: np.ndarray,
+    spacing: Tuple[float, float, float] = (1.0, 0.7, 0.7),
+    dtype: str = "int16",
+    compressed: bool = False,
+) -> List[str]:
+    """볼륨을 슬라이스별 DICOM 파일로 저장 (compressed=True면 RLE Lossless)
+
+    파일은 역순 이름으로 저장해 로더의 SliceLocation 정렬도 함께 측정되게 한다.
+    """
+    from pydicom.uid import generate_uid
+
+    if dtype not in CT_DTYPES:
+        raise ValueError(f"지원하지 않는 dtype: {dtype} (가능: {', '.join(CT_DTYPES)})")
+    os.makedirs(folder, exist_ok=True)
+    series_uid, study_uid = generate_uid(), generate_uid()
+    paths = []
+    n = volume.shape[0]
+    for z in range(n):
+        ds, stored = _ct_dataset(volume[z], z, spacing, dtype, series_uid, study_uid)
+        if compressed:
+            _compress_rle(ds, stored)
+        path = os.path.join(folder, f"slice_{n - 1 - z:04d}.dcm")
+        _save(ds, path)
+        paths.append(path)
+    return paths
+
+
+def nifti_bytes(
+    volume: np.ndarray,
+    spacing: Tuple[float, float, float] = (1.0, 0.7, 0.7),
+    gz: bool = False,
+) -> bytes:
+    """(Z, Y, X) 볼륨 → NIfTI bytes (RAS 대각 affine, ``load_nifti`` 축 순서의 역)"""
+    import nibabel as nib
+
+    data = np.transpose(volume, (2, 1, 0))   # 뷰어 (Z, Y, X) → NIfTI (X, Y, Z)
+    affine = np.diag([spacing[2], spacing[1], spacing[0], 1.0])
+    img = nib.Nifti1Image(data, affine)
+    img.header.set_zooms((spacing[2], spacing[1], spacing[0]))
+    raw = img.to_bytes()
+    return gzip.compress(raw, compresslevel=6) if gz else raw
+
+
+def xray_image(rows: int = 3000, cols: int = 2500, seed: int = 0) -> np.ndarray:
+    """흉부 X-ray 유사 12비트 영상 (uint16)"""
+    rng = np.random.default_rng(seed)
+    yy, xx = np.mgrid[0:rows, 0:cols].astype(np.float32)
+    img = np.full((rows, cols), 300.0, dtype=np.float32)
+    img[_ellipse(yy, xx, rows * 0.5, cols * 0.5, rows * 0.42, cols * 0.42)] = 2200.0
+    for side in (-1, 1):
+        lung = _ellipse(yy, xx, rows * 0.45, cols * (0.5 + side * 0.19), rows * 0.3, cols * 0.15)
+        img[lung] = 900.0
+    img += rng.normal(0, 40, size=(rows, cols)).astype(np.float32)
+    return np.clip(img, 0, 4095).astype(np.uint16)
+
+
+def xray_dicom_bytes(rows: int = 3000, cols: int = 2500, seed: int = 0) -> bytes:
+    """대형 DX DICOM bytes (12비트, 비압축)"""
+    from pydicom.dataset import Dataset, FileMetaDataset
+    from pydicom.uid import (
+        DigitalXRayImageStorageForPresentation,
+        ExplicitVRLittleEndian,
+        generate_uid,
+    )
+
+    pixels = xray_image(rows, cols, seed)
+    meta = FileMetaDataset()
+    meta.MediaStorageSOPClassUID = DigitalXRayImageStorageForPresentation
+    meta.MediaStorageSOPInstanceUID = generate_uid()
+    meta.TransferSyntaxUID = ExplicitVRLittleEndian
+
+    ds = Dataset()
+    ds.file_meta = meta
+    ds.SOPClassUID = DigitalXRayImageStorageForPresentation
+    ds.SOPInstanceUID = meta.MediaStorageSOPInstanceUID
+    ds.Modality = "DX"
+    ds.PatientName = "Synthetic^Phantom"
+    ds.PatientID = "SYNTHETIC"
+    ds.Rows, ds.Columns = pixels.shape
+    ds.SamplesPerPixel = 1
+    ds.PhotometricInterpretation = "MONOCHROME2"
+    ds.BitsAllocated = 16
+    ds.BitsStored = 12
+    ds.HighBit = 11
+    ds.PixelRepresentation = 0
+    ds.WindowCenter = 2048
+    ds.WindowWidth = 4096
+    ds.PixelData = pixels.tobytes()
+
+    buf = BytesIO()
+    _save(ds, buf)
+    return buf.getvalue()
@@ -0,0 +1,125 @@
+"""단계별 지연 디버그 패널 (사이드바)
+
+페이지 시작 시 ``begin_rerun``으로 세션 레지스트리를 연결하고, 끝에서
+``render_debug_panel``로 rerun 전체 시간을 기록한 뒤 세션 / 프로세스
+단계별 히스토그램 요약과 LLM 호출 요약(``llm.telemetry``)을 표시한다.
+패널은 ``?debug=1`` 쿼리 또는 ``APP_PROFILING=1``일 때만 보인다.
+"""
+
+import time
+
+import streamlit as st
+
+from core import profiling
+
+
+def _panel_visible() -> bool:
+    return st.query_params.get("debug") == "1" or profiling.enabled()
+
+
+def begin_rerun() -> None:
+    """rerun 시작 — 이 스크립트 스레드의 계측을 세션 레지스트리에도 누적"""
+    if "profiling_registry" not in st.session_state:
+        st.session_state.profiling_registry = profiling.Registry()
+    profiling.bind_session(st.session_state.profiling_registry)
+    profiling.serve_metrics()   # APP_METRICS_PORT 설정 시 /metrics (프로세스당 1회)
+    st.session_state.profiling_rerun_start = time.perf_counter()
+
+
+def render_debug_panel(page: str) -> None:
+    """rerun 끝 — 전체 시간 기록 후 패널 표시"""
+    started = st.session_state.get("profiling_rerun_start")
+    if started is not None and profiling.enabled():
+        profiling.record(f"page.rerun.{page}", time.perf_counter() - started)
+    if not _panel_visible():
+        return
+
+    with st.sidebar.expander("⏱ 단계별 지연 (디버그)"):
+        st.checkbox(
+            "계측 활성 (프로세스 전체)",
+            value=profiling.enabled(),
+            key="profiling_enabled",
+            on_change=lambda: profiling.set_enabled(st.session_state.profiling_enabled),
+        )
+
+        scope = st.radio("범위", ["세션", "프로세스"], horizontal=True, key="profiling_scope")
+        registry = (
+            st.session_state.get("profiling_registry") if scope == "세션" else profiling.PROCESS
+        )
+        rows = registry.summary() if registry is not None else []
+        if rows:
+            st.dataframe(
+                [
+                    {
+                        "단계": r["stage"],
+                        "횟수": r["count"],
+                        "평균 ms": round(r["mean_ms"], 1),
+                        "p50 ms": round(r["p50_ms"], 1),
+                        "p95 ms": round(r["p95_ms"], 1),
+                        "최대 ms": round(r["max_ms"], 1),
+                    }
+                    for r in rows
+                ],
+                hide_index=True,
+                use_container_width=True,
+            )
+            st.caption("p50 / p95는 히스토그램 버킷 상한 기준 근사값")
+        else:
+            st.caption("기록 없음 — 계측을 켜고 뷰어를 조작하세요.")
+
+        c1, c2 = st.columns(2)
+        if c1.button("초기화", key="profiling_reset") and registry is not None:
+            registry.reset()
+            st.rerun()
+        c2.download_button(
+            "Prometheus",
+            data=profiling.export_prometheus(registry or profiling.PROCESS),
+            file_name="stage_latency.prom",
+            mime="text/plain",
+            key="profiling_export",
+        )
+
+    _render_llm_calls()
+
+
+def _render_llm_calls() -> None:
+    """공급자 · 모델별 LLM 호출 요약 (llm.telemetry, 프로세스 전체)"""
+    from llm.telemetry import get_telemetry_store
+
+    rows = get_telemetry_store().summary()
+    with st.sidebar.expander("📡 LLM 호출 (디버그)"):
+        if not rows:
+            st.caption("기록 없음")
+            return
+
+        def seconds(value):
+            return None if value is None else round(value, 2)
+
+        st.dataframe(
+            [
+                {
+                    "공급자": r["provider"],
+                    "모델": r["model"],
+                    "호출": r["count"],
+                    "오류율": f"{r['error_rate']:.0%}",
+                    "재시도": r["retries"],
+                    "p50 s": seconds(r["latency_p50_s"]),
+                    "p95 s": seconds(r["latency_p95_s"]),
+                    "TTFT p95 s": seconds(r["ttft_p95_s"]),
+                    "이미지 KB": None if r["image_kb_mean"] is None else round(r["image_kb_mean"]),
+                    "입력 tok": r["prompt_tokens"],
+                    "출력 tok": r["completion_tokens"],
+                    "tok/s": None if r["tokens_per_s"] is None else round(r["tokens_per_s"], 1),
+                    "USD": None if r["cost_usd"] is None else round(r["cost_usd"], 4),
+                }
+                for r in rows
+            ],
+            hide_index=True,
+            use_container_width=True,
+        )
+        errors: dict = {}
+        for r in rows:
+            for name, count in r["error_classes"].items():
+                errors[name] = errors.get(name, 0) + count
+        if errors:
+            st.caption("오류: " + ", ".join(f"{k}×{v}" for k, v in errors.items()))
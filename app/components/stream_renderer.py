@@ -0,0 +1,102 @@
+"""스트리밍 판독문 렌더러 (청크 병합 + 완료 문단 고정)
+
+청크마다 누적 Markdown 전체를 다시 그리면 렌더링 / 웹소켓 전송량이 응답
+길이의 제곱에 비례한다. 이 렌더러는
+
+  - 청크를 시간(interval) 또는 크기(max_chars) 단위로 모아서 갱신하고
+  - 빈 줄로 끝난 문단은 별도 요소로 한 번만 보낸 뒤 고정하여
+    매 갱신마다 작성 중인 마지막 문단만 다시 보낸다.
+
+스트림이 끝나면 전체 텍스트를 한 번 렌더링해 문단 경계를 넘는 Markdown
+(목록 번호 등)을 원문 그대로 표시한다.
+"""
+
+import time
+from typing import Iterable, Optional
+
+from llm.stream_metrics import StreamMetrics
+
+CURSOR = " ▌"
+FENCE = "```"
+
+
+def _freeze_point(text: str) -> int:
+    """고정해도 되는 문단 경계 위치 (코드 블록 내부 제외, 없으면 0)"""
+    cut = text.rfind("\n\n")
+    while cut > 0:
+        if text.count(FENCE, 0, cut) % 2 == 0:
+            return cut + 2
+        cut = text.rfind("\n\n", 0, cut)
+    return 0
+
+
+class StreamRenderer:
+    """placeholder(st.empty) 에 스트림을 점진적으로 그리는 소비자
+
+    Example:
+        renderer = StreamRenderer(placeholder)
+        for chunk in client.stream_analyze(image, prompt):
+            renderer.feed(chunk)
+        text = renderer.finish()
+        st.caption(renderer.metrics.describe())
+    """
+
+    def __init__(
+        self,
+        placeholder,
+        interval: float = 0.15,
+        max_chars: int = 400,
+        metrics: Optional[StreamMetrics] = None,
+    ):
+        self.placeholder = placeholder
+        self.interval = interval
+        self.max_chars = max_chars
+        self.metrics = metrics if metrics is not None else StreamMetrics()
+        self.text = ""
+        self.renders = 0
+        self._box = None
+        self._tail = None
+        self._frozen = 0          # text[:_frozen] 는 고정 요소로 이미 전송됨
+        self._pending = 0         # 마지막 갱신 이후 도착한 문자 수
+        self._last_flush = 0.0
+
+    def feed(self, chunk: str, record: bool = True) -> None:
+        """청크 추가 (record=False: 지표는 호출 측에서 이미 기록)"""
+        if not chunk:
+            return
+        if record:
+            self.metrics.record(chunk)
+        self.text += chunk
+        self._pending += len(chunk)
+        now = time.perf_counter()
+        if now - self._last_flush >= self.interval or self._pending >= self.max_chars:
+            self._flush(now)
+
+    def consume(self, chunks: Iterable[str], record: bool = True) -> str:
+        for chunk in chunks:
+            self.feed(chunk, record)
+        return self.finish()
+
+    def _flush(self, now: float) -> None:
+        if self._box is None:
+            self._box = self.placeholder.container()
+            self._tail = self._box.empty()
+        tail = self.text[self._frozen:]
+        cut = _freeze_point(tail)
+        if cut:
+            # 현재 꼬리 요소를 완료 문단으로 확정하고 새 꼬리 요소 추가
+            self._tail.markdown(tail[:cut])
+            self._tail = self._box.empty()
+            self._frozen += cut
+            tail = tail[cut:]
+        self._tail.markdown(tail + CURSOR)
+        self.renders += 1
+        self._pending = 0
+        self._last_flush = now
+
+    def finish(self) -> str:
+        """최종 텍스트 1회 렌더링 후 반환"""
+        self.metrics.finish()
+        self.placeholder.markdown(self.text or " ")
+        self.renders += 1
+        return self.text
@@ -1,23 +1,27 @@
 """X-ray DICOM 뷰어 컴포넌트"""
 
-from io import BytesIO
+from typing import TYPE_CHECKING
 
-import matplotlib.pyplot as plt
 import numpy as np
-import pydicom
 import streamlit as st
 
 from core.dicom_loader import extract_pixel_array, get_window_defaults
 from core.image_processor import apply_windowing
+from core.profiling import timed
+from core.renderer import render_xray_png
 
+if TYPE_CHECKING:
+    import pydicom
 
-def render_xray_viewer(ds: pydicom.Dataset) -> None:
+
+def render_xray_viewer(ds: "pydicom.Dataset") -> None:
     """X-ray 뷰어 렌더링 (W/L 슬라이더 포함)"""
 
     pixel_array = extract_pixel_array(ds)
     default_wc, default_ww = get_window_defaults(ds)
-    pmin = float(pixel_array.min())
-    pmax = float(pixel_array.max())
+    with timed("viewer.stats"):
+        pmin = float(pixel_array.min())
+        pmax = float(pixel_array.max())
 
     # 레이아웃: 이미지(좌) | 컨트롤(우)
     img_col, ctrl_col = st.columns([3, 1])
@@ -59,18 +63,11 @@ def render_xray_viewer(ds: pydicom.Dataset) -> None:
             windowed = 255 - windowed
 
         # matplotlib 렌더링 (검은 배경)
-        fig, ax = plt.subplots(figsize=(8, 8), facecolor="black")
-        ax.imshow(windowed, cmap="gray", aspect="equal", interpolation="bilinear")
-        ax.axis("off")
-        plt.tight_layout(pad=0)
-
-        buf = BytesIO()
-        fig.savefig(buf, format="png", dpi=150, bbox_inches="tight", facecolor="black")
-        plt.close(fig)
-        buf.seek(0)
-        img_bytes = buf.getvalue()
-
-        st.image(img_bytes, use_column_width=True)
+        img_bytes = render_xray_png(windowed)
+
+        # 미디어 파일 등록 + 메시지 직렬화 (브라우저 전송 자체는 서버에서 측정 불가)
+        with timed("viewer.send"):
+            st.image(img_bytes, use_column_width=True)
 
         # LLM 페이지에서 재사용할 수 있도록 세션 저장
         st.session_state.current_image_bytes = img_bytes
@@ -1,13 +1,15 @@
 """CT 3D 볼륨 구성 및 슬라이싱"""
 
-from typing import List, Tuple
+from typing import TYPE_CHECKING, List, Tuple
 
 import numpy as np
-import pydicom
+
+if TYPE_CHECKING:
+    import pydicom
 
 
 def build_volume(
-    datasets: List[pydicom.Dataset],
+    datasets: List["pydicom.Dataset"],
 ) -> Tuple[np.ndarray, Tuple[float, float, float]]:
     """DICOM 시리즈에서 3D 볼륨 구성
 
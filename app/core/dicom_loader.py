@@ -4,19 +4,29 @@ import os
 import tempfile
 from io import BytesIO
 from pathlib import Path
-from typing import List, Tuple
+from typing import TYPE_CHECKING, List, Tuple
 
 import numpy as np
-import pydicom
 
+from .profiling import timed
 
-def load_xray(file_data: bytes) -> pydicom.Dataset:
+if TYPE_CHECKING:
+    import pydicom  # 런타임 임포트는 첫 DICOM 로드 시
+
+
+@timed("core.decode")
+def load_xray(file_data: bytes) -> "pydicom.Dataset":
     """바이트에서 X-ray DICOM 로드"""
+    import pydicom
+
     return pydicom.dcmread(BytesIO(file_data))
 
 
-def load_ct_series(folder_path: str) -> List[pydicom.Dataset]:
+@timed("core.decode")
+def load_ct_series(folder_path: str) -> List["pydicom.Dataset"]:
     """폴더에서 CT DICOM 시리즈 로드 (SliceLocation 기준 정렬)"""
+    import pydicom
+
     datasets = []
     folder = Path(folder_path)
 
@@ -41,7 +51,7 @@ def load_ct_series(folder_path: str) -> List[pydicom.Dataset]:
         raise ValueError("DICOM 파일을 찾을 수 없습니다. ZIP 내부에 .dcm 파일이 있는지 확인하세요.")
 
     # 정렬 기준: SliceLocation → ImagePositionPatient[2] → InstanceNumber
-    def sort_key(ds: pydicom.Dataset) -> float:
+    def sort_key(ds: "pydicom.Dataset") -> float:
         if hasattr(ds, "SliceLocation"):
             return float(ds.SliceLocation)
         if hasattr(ds, "ImagePositionPatient"):
@@ -54,7 +64,8 @@ def load_ct_series(folder_path: str) -> List[pydicom.Dataset]:
     return datasets
 
 
-def extract_pixel_array(ds: pydicom.Dataset) -> np.ndarray:
+@timed("core.decode.pixels")
+def extract_pixel_array(ds: "pydicom.Dataset") -> np.ndarray:
     """RescaleSlope / RescaleIntercept 적용한 픽셀 배열 반환"""
     pixel_array = ds.pixel_array.astype(np.float32)
     slope = float(getattr(ds, "RescaleSlope", 1))
@@ -62,6 +73,7 @@ def extract_pixel_array(ds: pydicom.Dataset) -> np.ndarray:
     return pixel_array * slope + intercept
 
 
+@timed("core.decode")
 def load_nifti(
     file_data: bytes, filename: str = "ct.nii"
 ) -> Tuple[np.ndarray, Tuple[float, float, float]]:
@@ -102,7 +114,7 @@ def load_nifti(
             os.unlink(tmp_path)
 
 
-def get_window_defaults(ds: pydicom.Dataset) -> Tuple[float, float]:
+def get_window_defaults(ds: "pydicom.Dataset") -> Tuple[float, float]:
     """DICOM 헤더에서 기본 WindowCenter / WindowWidth 반환"""
     wc = getattr(ds, "WindowCenter", 40)
     ww = getattr(ds, "WindowWidth", 400)
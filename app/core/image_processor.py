@@ -6,7 +6,10 @@ from typing import Dict, Tuple
 import numpy as np
 from PIL import Image
 
+from .profiling import timed
 
+
+@timed("core.windowing")
 def apply_windowing(
     array: np.ndarray,
     window_center: float,
@@ -22,6 +25,7 @@ def apply_windowing(
     return windowed
 
 
+@timed("core.png_encode")
 def array_to_png_bytes(array: np.ndarray) -> bytes:
     """0-255 numpy 배열을 PNG bytes로 변환 (RGB)"""
     img = Image.fromarray(array.astype(np.uint8))
@@ -0,0 +1,187 @@
+"""토큰 예산 기반 CT 다중 슬라이스 몽타주 (NumPy 벡터화)
+
+Axial / Sagittal / Coronal 각 평면에서 정보량 있는 슬라이스 N장을 골라
+(등간격 또는 내용 분산 기준) 하나 또는 평면별 몇 장의 격자 이미지로 합친다.
+리샘플링·W/L·타일링은 모두 배열 연산으로 처리되어 500 슬라이스 볼륨에서도
+수십 ms 안에 생성된다.
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .image_processor import apply_windowing
+from .profiling import timed
+
+PLANES = ("axial", "sagittal", "coronal")
+
+# 평면 → 볼륨 축 (Z x Y x X)
+_PLANE_AXIS = {"axial": 0, "sagittal": 2, "coronal": 1}
+
+
+@dataclass
+class Montage:
+    images: List[np.ndarray]   # uint8 (H x W) 격자 이미지
+    captions: List[str]        # 이미지별 구성 설명 (프롬프트에 첨부)
+
+
+def select_slices(
+    volume: np.ndarray,
+    plane: str,
+    n: int,
+    strategy: str = "even",
+    margin: float = 0.05,
+) -> np.ndarray:
+    """평면별 슬라이스 인덱스 n개 선택
+
+    - even: 양 끝 margin을 제외한 등간격
+    - variance: 구간을 n등분해 구간마다 HU 표준편차가 가장 큰 슬라이스
+      (공기/테이블만 있는 슬라이스를 피하면서 전체 범위를 고르게 덮음)
+    """
+    axis = _PLANE_AXIS[plane]
+    length = volume.shape[axis]
+    n = max(1, min(n, length))
+    lo = int(length * margin)
+    hi = max(lo + 1, int(math.ceil(length * (1 - margin))))
+
+    if strategy == "even" or hi - lo <= n:
+        return np.unique(np.linspace(lo, hi - 1, n).round().astype(int))
+
+    if strategy != "variance":
+        raise ValueError(f"알 수 없는 슬라이스 선택 방식: {strategy}")
+
+    # 면내 32x32 정도로 다운샘플링한 사본에서 슬라이스별 표준편차
+    step = [max(1, s // 32) for s in volume.shape]
+    step[axis] = 1
+    sub = np.ascontiguousarray(volume[::step[0], ::step[1], ::step[2]])
+    other = tuple(a for a in range(3) if a != axis)
+    scores = sub.std(axis=other)[lo:hi]
+
+    edges = np.linspace(0, len(scores), n + 1).astype(int)
+    picks = [lo + a + int(np.argmax(scores[a:b])) for a, b in zip(edges[:-1], edges[1:]) if b > a]
+    return np.array(picks, dtype=int)
+
+
+def _plane_tiles(
+    volume: np.ndarray,
+    plane: str,
+    indices: np.ndarray,
+    tile: int,
+    row_mm: float,
+    col_mm: float,
+    wc: float,
+    ww: float,
+) -> np.ndarray:
+    """선택 슬라이스를 tile x tile 칸으로 (k x tile x tile, uint8)
+
+    물리 비율을 유지하는 nearest 리샘플 인덱스를 먼저 만들고 필요한 복셀만
+    gather 한 뒤 W/L 적용, 칸 중앙에 배치한다 (여백 검정).
+    시상/관상면은 뷰어와 같이 위아래 반전.
+    """
+    n_z, n_y, n_x = volume.shape
+    h, w = {"axial": (n_y, n_x), "sagittal": (n_z, n_y), "coronal": (n_z, n_x)}[plane]
+    scale = tile / max(h * row_mm, w * col_mm)
+    out_h = max(1, min(tile, int(round(h * row_mm * scale))))
+    out_w = max(1, min(tile, int(round(w * col_mm * scale))))
+    rows = np.minimum((np.arange(out_h) * h / out_h).astype(int), h - 1)
+    cols = np.minimum((np.arange(out_w) * w / out_w).astype(int), w - 1)
+
+    # 슬라이스 축은 단일 축 인덱싱으로, 면내 리샘플은 작은 배열에서 np.take
+    # (np.ix_ 3축 fancy indexing 대비 수 배 빠름)
+    if plane == "axial":
+        sampled = volume[indices]                                          # k x Y x X
+        if out_h != h:
+            sampled = np.take(sampled, rows, axis=1)
+    elif plane == "sagittal":
+        sampled = np.stack([volume[rows[::-1], :, i] for i in indices])   # k x Z' x Y
+    else:
+        sampled = np.stack([volume[rows[::-1], i, :] for i in indices])   # k x Z' x X
+    if out_w != w:
+        sampled = np.take(sampled, cols, axis=2)
+
+    tiles = np.zeros((len(indices), tile, tile), dtype=np.uint8)
+    top, left = (tile - out_h) // 2, (tile - out_w) // 2
+    tiles[:, top:top + out_h, left:left + out_w] = apply_windowing(sampled, wc, ww)
+    return tiles
+
+
+def tile_grid(tiles: np.ndarray, cols: int) -> np.ndarray:
+    """(k x t x t) 타일 → (rows·t x cols·t) 격자, 빈 칸은 0"""
+    k, t, _ = tiles.shape
+    rows = int(math.ceil(k / cols))
+    padded = np.zeros((rows * cols, t, t), dtype=tiles.dtype)
+    padded[:k] = tiles
+    return padded.reshape(rows, cols, t, t).transpose(0, 2, 1, 3).reshape(rows * t, cols * t)
+
+
+@timed("core.montage")
+def build_montage(
+    volume: np.ndarray,
+    wc: float,
+    ww: float,
+    spacing: Optional[Tuple[float, float, float]] = None,
+    counts: Optional[Dict[str, int]] = None,
+    max_pixels: int = 2048 * 2048,
+    strategy: str = "even",
+    per_plane: bool = False,
+    planes: Sequence[str] = PLANES,
+    z_offset: int = 0,
+) -> Montage:
+    """W/L 적용된 다중 슬라이스 몽타주 생성
+
+    Args:
+        spacing: (z, y, x) mm — 시상/관상면 종횡비 보정용
+        counts: 평면별 슬라이스 수 (기본 axial 8, sagittal 4, coronal 4)
+        max_pixels: 전체 몽타주 픽셀 예산 (per_plane이면 이미지 합계 기준)
+        per_plane: True면 평면별 이미지 1장씩, False면 전체 1장
+        z_offset: 캡션의 axial Z 인덱스에 더할 값 (부분 볼륨을 원래 볼륨 기준으로 표기)
+    """
+    z_mm, y_mm, x_mm = spacing or (1.0, 1.0, 1.0)
+    counts = counts or {"axial": 8, "sagittal": 4, "coronal": 4}
+    planes = [p for p in planes if counts.get(p, 0) > 0]
+    picks = {p: select_slices(volume, p, counts[p], strategy) for p in planes}
+    total = sum(len(v) for v in picks.values())
+
+    # 평면 내 (row_mm, col_mm)
+    pixel_mm = {"axial": (y_mm, x_mm), "sagittal": (z_mm, y_mm), "coronal": (z_mm, x_mm)}
+
+    def grid_shape(k: int) -> Tuple[int, int]:
+        cols = int(math.ceil(math.sqrt(k)))
+        return int(math.ceil(k / cols)), cols
+
+    if per_plane:
+        cells = sum(r * c for r, c in (grid_shape(len(picks[p])) for p in planes))
+    else:
+        rows, cols = grid_shape(total)
+        cells = rows * cols
+    tile = max(16, int(math.sqrt(max_pixels / max(1, cells))))
+
+    plane_tiles = {}
+    for plane in planes:
+        plane_tiles[plane] = _plane_tiles(
+            volume, plane, picks[plane], tile, *pixel_mm[plane], wc, ww
+        )
+
+    def describe(plane: str) -> str:
+        axis_name = {"axial": "Z", "sagittal": "X", "coronal": "Y"}[plane]
+        offset = z_offset if plane == "axial" else 0
+        idx = ", ".join(str(int(i) + offset) for i in picks[plane])
+        return f"{plane} slices ({axis_name} = {idx})"
+
+    if per_plane:
+        images, captions = [], []
+        for plane in planes:
+            _, cols = grid_shape(len(picks[plane]))
+            images.append(tile_grid(plane_tiles[plane], cols))
+            captions.append(f"{describe(plane)}, left-to-right then top-to-bottom")
+        return Montage(images, captions)
+
+    _, cols = grid_shape(total)
+    stacked = np.concatenate([plane_tiles[p] for p in planes], axis=0)
+    caption = "; ".join(describe(p) for p in planes)
+    return Montage(
+        [tile_grid(stacked, cols)],
+        [f"Grid montage, left-to-right then top-to-bottom: {caption}"],
+    )
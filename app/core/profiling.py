@@ -0,0 +1,242 @@
+"""단계별 소요 시간 계측 (Streamlit 비의존)
+
+``timed("stage")``를 컨텍스트 매니저 / 데코레이터로 사용해 디코드 · 통계 ·
+슬라이싱 · 윈도잉 · matplotlib · PNG 인코딩 등 단계별 지연을 기록한다.
+
+  - 프로세스 전역 히스토그램 + 세션별 히스토그램 (``bind_session``으로 현재
+    스레드 / 컨텍스트에 연결, 백그라운드 작업 스레드는 프로세스 전역에만 기록)
+  - Prometheus text 형식 내보내기 (``export_prometheus``), 선택적 로컬
+    ``/metrics`` 엔드포인트 (``serve_metrics``)
+  - 비활성 시 시각 측정 없이 플래그 확인 1회만 수행
+
+환경변수:
+  APP_PROFILING      1이면 계측 활성 (디버그 패널에서 런타임 전환 가능)
+  APP_METRICS_PORT   설정 시 해당 포트에서 /metrics 제공
+"""
+
+import bisect
+import contextvars
+import functools
+import math
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+# 히스토그램 버킷 상한 (초)
+BUCKETS = (0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0, 2.0, 5.0, 10.0)
+
+_enabled = os.getenv("APP_PROFILING", "").lower() in ("1", "true", "yes")
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def set_enabled(value: bool) -> None:
+    global _enabled
+    _enabled = bool(value)
+
+
+def percentile(values, p: float) -> Optional[float]:
+    """표본 백분위 (nearest-rank, 보간 없음), 표본이 없으면 None
+
+    앱 지표(스트리밍 · 텔레메트리 · 라우터)와 벤치마크가 같은 정의를 쓰도록
+    원시 표본 백분위는 모두 이 함수로 계산한다.
+    """
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+class Histogram:
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)   # 마지막 = +Inf
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q: float) -> float:
+        """버킷 상한 기준 근사 분위수 (+Inf 버킷이면 최댓값)"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return min(BUCKETS[i], self.max) if i < len(BUCKETS) else self.max
+        return self.max
+
+
+class Registry:
+    """단계 이름 → 히스토그램"""
+
+    def __init__(self):
+        self.stages: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            hist = self.stages.get(stage)
+            if hist is None:
+                hist = self.stages[stage] = Histogram()
+            hist.observe(seconds)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.stages.clear()
+
+    def summary(self) -> List[dict]:
+        """단계별 요약 (합계 시간 내림차순)"""
+        with self._lock:
+            rows = [
+                {
+                    "stage": stage,
+                    "count": h.count,
+                    "mean_ms": h.total / h.count * 1000,
+                    "p50_ms": h.quantile(0.5) * 1000,
+                    "p95_ms": h.quantile(0.95) * 1000,
+                    "max_ms": h.max * 1000,
+                    "total_ms": h.total * 1000,
+                }
+                for stage, h in self.stages.items() if h.count
+            ]
+        return sorted(rows, key=lambda r: -r["total_ms"])
+
+
+PROCESS = Registry()
+_session: contextvars.ContextVar[Optional[Registry]] = contextvars.ContextVar(
+    "profiling_session", default=None
+)
+
+
+def bind_session(registry: Optional[Registry]) -> None:
+    """현재 스레드 / 컨텍스트의 기록을 세션 레지스트리에도 누적 (rerun마다 호출)"""
+    _session.set(registry)
+
+
+def record(stage: str, seconds: float) -> None:
+    PROCESS.observe(stage, seconds)
+    session = _session.get()
+    if session is not None:
+        session.observe(stage, seconds)
+
+
+class timed:
+    """단계 소요 시간 기록
+
+    Example:
+        with timed("core.windowing"):
+            ...
+
+        @timed("core.png_encode")
+        def array_to_png_bytes(...): ...
+    """
+
+    __slots__ = ("stage", "_start")
+
+    def __init__(self, stage: str):
+        self.stage = stage
+        self._start = None
+
+    def __enter__(self):
+        self._start = time.perf_counter() if _enabled else None
+        return self
+
+    def __exit__(self, *exc):
+        if self._start is not None:
+            record(self.stage, time.perf_counter() - self._start)
+        return False
+
+    def __call__(self, fn):
+        stage = self.stage
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record(stage, time.perf_counter() - start)
+
+        return wrapper
+
+
+# ── 내보내기 ─────────────────────────────────────────────────────────────────
+def export_prometheus(registry: Registry = PROCESS, name: str = "app_stage_seconds") -> str:
+    """Prometheus text exposition 형식 히스토그램"""
+    lines = [
+        f"# HELP {name} Per-stage latency in seconds",
+        f"# TYPE {name} histogram",
+    ]
+    with registry._lock:
+        stages = sorted(registry.stages.items())
+        for stage, h in stages:
+            label = stage.replace("\\", "\\\\").replace('"', '\\"')
+            cumulative = 0
+            for bound, n in zip(BUCKETS + (None,), h.counts):
+                cumulative += n
+                le = "+Inf" if bound is None else repr(bound)
+                lines.append(f'{name}_bucket{{stage="{label}",le="{le}"}} {cumulative}')
+            lines.append(f'{name}_sum{{stage="{label}"}} {h.total:.6f}')
+            lines.append(f'{name}_count{{stage="{label}"}} {h.count}')
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(path: str, registry: Registry = PROCESS) -> str:
+    """node_exporter textfile collector 등에서 읽을 파일로 저장 (원자적 교체)"""
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        f.write(export_prometheus(registry))
+    os.replace(tmp, path)
+    return path
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def serve_metrics(port: Optional[int] = None, host: str = "127.0.0.1"):
+    """로컬 /metrics 엔드포인트 시작 (프로세스당 1회, 포트 미지정 시 APP_METRICS_PORT)"""
+    global _server
+    if port is None:
+        port = int(os.getenv("APP_METRICS_PORT") or 0)
+        if not port:
+            return None
+    with _server_lock:
+        if _server is not None:
+            return _server
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != "/metrics":
+                    self.send_error(404)
+                    return
+                body = export_prometheus().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):  # noqa: A002
+                pass
+
+        _server = ThreadingHTTPServer((host, port), Handler)
+        _server.daemon_threads = True
+        threading.Thread(target=_server.serve_forever, name="metrics", daemon=True).start()
+        return _server
@@ -0,0 +1,104 @@
+"""뷰어 / LLM 입력용 PNG 렌더링 (matplotlib, Streamlit 비의존)
+
+pyplot 전역 상태(현재 figure)를 쓰지 않고 ``Figure`` 객체 API만 사용한다.
+배치 판독 / API 워커처럼 여러 스레드가 동시에 렌더링해도 서로의 figure를
+건드리지 않는다.
+"""
+
+from io import BytesIO
+
+import numpy as np
+
+from .ct_volume import get_axial_slice, get_coronal_slice, get_sagittal_slice
+from .image_processor import apply_windowing
+from .profiling import timed
+
+
+def _new_figure(figsize):
+    """pyplot 없이 Agg 캔버스에 붙은 Figure 생성 (matplotlib는 첫 렌더링 시 임포트)"""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=figsize, facecolor="black")
+    FigureCanvasAgg(fig)
+    return fig
+
+
+def _figure_to_png(fig) -> bytes:
+    buf = BytesIO()
+    with timed("core.render.savefig"):   # 래스터화 + PNG 인코딩
+        fig.savefig(buf, format="png", dpi=150, bbox_inches="tight", facecolor="black")
+    return buf.getvalue()
+
+
+@timed("core.render")
+def render_xray_png(windowed: np.ndarray) -> bytes:
+    """W/L 적용된 X-ray 배열 → PNG bytes (검은 배경)"""
+    fig = _new_figure((8, 8))
+    ax = fig.subplots()
+    ax.imshow(windowed, cmap="gray", aspect="equal", interpolation="bilinear")
+    ax.axis("off")
+    fig.tight_layout(pad=0)
+    return _figure_to_png(fig)
+
+
+@timed("core.render")
+def render_ct_png(
+    volume: np.ndarray,
+    axial_idx: int,
+    sagittal_idx: int,
+    coronal_idx: int,
+    wc: float,
+    ww: float,
+) -> bytes:
+    """CT 3-plane 합성 이미지 (Axial / Sagittal / Coronal + crosshair) → PNG bytes"""
+    n_z, n_y, n_x = volume.shape
+
+    # 슬라이스 추출 + W/L 적용
+    with timed("core.slicing"):
+        axial = get_axial_slice(volume, axial_idx)
+        sagittal = get_sagittal_slice(volume, sagittal_idx)
+        coronal = get_coronal_slice(volume, coronal_idx)
+    axial_w = apply_windowing(axial, wc, ww)
+    sagittal_w = apply_windowing(sagittal, wc, ww)
+    coronal_w = apply_windowing(coronal, wc, ww)
+
+    # 시상면/관상면: 위아래 반전 (해부학적 방향)
+    sagittal_disp = np.flipud(sagittal_w)
+    coronal_disp = np.flipud(coronal_w)
+
+    titles = [
+        f"Axial  Z={axial_idx}/{n_z-1}",
+        f"Sagittal  X={sagittal_idx}/{n_x-1}",
+        f"Coronal  Y={coronal_idx}/{n_y-1}",
+    ]
+    images = [axial_w, sagittal_disp, coronal_disp]
+
+    # Crosshair 좌표 (flipud 적용 후 기준)
+    # Axial:    수평=coronal_idx, 수직=sagittal_idx
+    # Sagittal: 수평=(n_z-1-axial_idx), 수직=coronal_idx
+    # Coronal:  수평=(n_z-1-axial_idx), 수직=sagittal_idx
+    crosshairs = [
+        (coronal_idx, sagittal_idx),
+        (n_z - 1 - axial_idx, coronal_idx),
+        (n_z - 1 - axial_idx, sagittal_idx),
+    ]
+    line_colors = [("yellow", "cyan"), ("red", "yellow"), ("red", "cyan")]
+
+    fig = _new_figure((15, 5))
+    gs = fig.add_gridspec(1, 3, wspace=0.04, hspace=0)
+
+    for i, (title, img, (ch_y, ch_x), (h_col, v_col)) in enumerate(
+        zip(titles, images, crosshairs, line_colors)
+    ):
+        ax = fig.add_subplot(gs[i])
+        ax.imshow(img, cmap="gray", aspect="auto", interpolation="bilinear")
+        ax.set_title(title, color="white", fontsize=9, pad=2)
+        ax.axis("off")
+
+        # Crosshair
+        ax.axhline(y=ch_y, color=h_col, linewidth=0.8, alpha=0.7)
+        ax.axvline(x=ch_x, color=v_col, linewidth=0.8, alpha=0.7)
+
+    fig.tight_layout(pad=0.3)
+    return _figure_to_png(fig)
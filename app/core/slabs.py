@@ -0,0 +1,158 @@
+"""CT 볼륨 슬랩 분할 (전체 볼륨 map-reduce 판독용)
+
+볼륨을 Z 방향 슬랩으로 나눈다.
+  - fixed : 고정 길이(mm) 슬랩
+  - region: 폐야(공기 음영) 범위를 기준으로 neck / chest / abdomen-pelvis 구분 후,
+            긴 구간은 다시 고정 길이로 분할
+
+부위 판정은 HU 임계값 기반의 간단한 휴리스틱이며 진단 용도가 아니다.
+"""
+
+import math
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .montage import Montage, build_montage
+
+# 체부(공기 제외) / 폐 실질 HU 범위
+BODY_HU = -500.0
+LUNG_HU = (-950.0, -500.0)
+# 체부 대비 폐 음영 비율이 이 값 이상이면 흉부 슬라이스
+LUNG_FRACTION = 0.08
+
+
+@dataclass
+class Slab:
+    index: int
+    label: str
+    start: int   # Z 시작 (포함)
+    stop: int    # Z 끝 (제외)
+
+    def describe(self, z_mm: float) -> str:
+        return (
+            f"{self.label}, slices {self.start}-{self.stop - 1} "
+            f"({(self.stop - self.start) * z_mm:.0f} mm)"
+        )
+
+
+def _chunks(start: int, stop: int, size: int) -> List[Tuple[int, int]]:
+    """[start, stop)을 size 이하의 비슷한 길이 구간으로 분할"""
+    n = max(1, math.ceil((stop - start) / max(1, size)))
+    edges = np.linspace(start, stop, n + 1).round().astype(int)
+    return [(int(a), int(b)) for a, b in zip(edges[:-1], edges[1:]) if b > a]
+
+
+def slice_profile(volume: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """슬라이스별 (체부 면적 비율, 체부 내 폐 음영 비율) — 면내 다운샘플링"""
+    step = max(1, min(volume.shape[1:]) // 64)
+    sub = volume[:, ::step, ::step]
+    body = (sub > BODY_HU).mean(axis=(1, 2))
+    lung = ((sub > LUNG_HU[0]) & (sub <= LUNG_HU[1])).mean(axis=(1, 2))
+    # 폐는 체부 내부이므로 (체부 + 폐) 대비 비율로 판정
+    return body, lung / np.maximum(body + lung, 1e-6)
+
+
+def _lung_range(lung_fraction: np.ndarray) -> Optional[Tuple[int, int]]:
+    """폐 음영 슬라이스의 가장 긴 연속 구간 [start, stop)"""
+    mask = np.concatenate([[False], lung_fraction >= LUNG_FRACTION, [False]])
+    edges = np.flatnonzero(np.diff(mask.astype(np.int8)))
+    if len(edges) == 0:
+        return None
+    starts, stops = edges[0::2], edges[1::2]
+    longest = int(np.argmax(stops - starts))
+    return int(starts[longest]), int(stops[longest])
+
+
+def split_slabs(
+    volume: np.ndarray,
+    spacing: Optional[Tuple[float, float, float]] = None,
+    mode: str = "region",
+    slab_mm: float = 80.0,
+    min_slab_mm: float = 20.0,
+) -> List[Slab]:
+    """볼륨을 Z 방향 슬랩 목록으로 분할
+
+    Args:
+        mode: "fixed" 또는 "region"
+        slab_mm: 슬랩 최대 두께 (region 모드에서는 부위 구간 내 재분할 기준)
+        min_slab_mm: 이보다 얇은 부위 구간은 인접 슬랩에 병합
+    """
+    z_mm = (spacing or (1.0, 1.0, 1.0))[0]
+    n_z = volume.shape[0]
+    size = max(1, int(round(slab_mm / z_mm)))
+
+    if mode == "fixed":
+        return [
+            Slab(i, f"slab {i + 1}", a, b)
+            for i, (a, b) in enumerate(_chunks(0, n_z, size))
+        ]
+    if mode != "region":
+        raise ValueError(f"알 수 없는 슬랩 분할 방식: {mode}")
+
+    body, lung = slice_profile(volume)
+    lung_range = _lung_range(lung)
+    if lung_range is None:
+        return split_slabs(volume, spacing, "fixed", slab_mm)
+
+    lo, hi = lung_range
+    # Z 방향이 시리즈마다 다르므로 체부 단면적이 넓은 쪽을 복부로 판단
+    below = body[:lo].mean() if lo > 0 else 0.0
+    above = body[hi:].mean() if hi < n_z else 0.0
+    low_label, high_label = (
+        ("abdomen-pelvis", "neck") if below >= above else ("neck", "abdomen-pelvis")
+    )
+
+    min_len = max(1, int(round(min_slab_mm / z_mm)))
+    regions = []
+    if lo >= min_len:
+        regions.append((low_label, 0, lo))
+    else:
+        lo = 0
+    if n_z - hi < min_len:
+        hi = n_z
+    regions.append(("chest", lo, hi))
+    if hi < n_z:
+        regions.append((high_label, hi, n_z))
+
+    slabs: List[Slab] = []
+    for label, start, stop in regions:
+        parts = _chunks(start, stop, size)
+        for k, (a, b) in enumerate(parts):
+            name = label if len(parts) == 1 else f"{label} {k + 1}/{len(parts)}"
+            slabs.append(Slab(len(slabs), name, a, b))
+    return slabs
+
+
+def render_slab(
+    volume: np.ndarray,
+    slab: Slab,
+    wc: float,
+    ww: float,
+    spacing: Optional[Tuple[float, float, float]] = None,
+    axial: int = 9,
+    coronal: int = 3,
+    max_pixels: int = 1536 * 1536,
+    strategy: str = "variance",
+) -> Montage:
+    """슬랩 하나를 axial + coronal 몽타주 1장으로 렌더링
+
+    axial Z 인덱스는 slab.start만큼 더해 전체 볼륨 기준으로 캡션에 표기된다.
+    """
+    sub = volume[slab.start:slab.stop]
+    montage = build_montage(
+        sub,
+        wc,
+        ww,
+        spacing=spacing,
+        counts={"axial": axial, "sagittal": 0, "coronal": coronal},
+        max_pixels=max_pixels,
+        strategy=strategy,
+        z_offset=slab.start,
+    )
+    caption = (
+        f"{montage.captions[0]} (axial Z indices refer to the whole volume, "
+        f"slab Z {slab.start}-{slab.stop - 1}; coronal views cover only this slab)"
+    )
+    return Montage(montage.images, [caption])
@@ -0,0 +1,143 @@
+"""LLM 공급자 가용성 서비스 (논블로킹 상태 스냅샷)
+
+  - 패키지 설치 여부는 ``importlib.util.find_spec``으로 확인 (torch /
+    transformers를 임포트하지 않음 — 수 초 · 수백 MB 절약)
+  - API 키 확인은 스냅샷마다 즉시 수행 (환경변수 조회뿐)
+  - Ollama 등 엔드포인트 상태는 백그라운드 스레드가 주기적으로 확인하고
+    결과를 보관 — 사이드바는 rerun마다 보관된 결과만 읽는다
+
+환경변수:
+  LLM_AVAILABILITY_INTERVAL   엔드포인트 확인 주기 초 (기본 30)
+"""
+
+import importlib.util
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+
+def package_installed(*names: str) -> bool:
+    """모든 패키지가 설치되어 있는지 (임포트하지 않고 확인)"""
+    for name in names:
+        try:
+            if importlib.util.find_spec(name) is None:
+                return False
+        except (ImportError, ValueError):
+            return False
+    return True
+
+
+@dataclass
+class ProviderStatus:
+    available: bool
+    pending: bool = False            # 첫 엔드포인트 확인 전
+    detail: str = ""
+    models: List[str] = field(default_factory=list)
+    checked: Optional[float] = None  # 마지막 확인 시각 (time.time)
+
+
+class AvailabilityService:
+    def __init__(self, interval: float = 30.0):
+        self.interval = interval
+        self._endpoints: Dict[str, ProviderStatus] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # ── 백그라운드 확인 ────────────────────────────────────────────────────
+    def _probe_ollama(self) -> ProviderStatus:
+        from .ollama_client import OllamaClient
+
+        available = OllamaClient.is_available()
+        models = OllamaClient().get_available_models() if available else []
+        return ProviderStatus(
+            available,
+            detail="" if available else "Ollama 서버에 연결할 수 없습니다",
+            models=models,
+            checked=time.time(),
+        )
+
+    def probe(self) -> None:
+        """엔드포인트 상태 1회 확인 (백그라운드 스레드에서 호출)"""
+        for name, check in (("Ollama", self._probe_ollama),):
+            try:
+                status = check()
+            except Exception as e:
+                status = ProviderStatus(False, detail=f"{type(e).__name__}: {e}", checked=time.time())
+            with self._lock:
+                self._endpoints[name] = status
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            self.probe()
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+    def start(self) -> "AvailabilityService":
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(
+                    target=self._loop, name="llm-availability", daemon=True
+                )
+                self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+
+    def refresh(self) -> None:
+        """다음 확인을 즉시 실행 (결과는 다음 스냅샷에 반영)"""
+        self._wake.set()
+
+    # ── 조회 ───────────────────────────────────────────────────────────────
+    def snapshot(self) -> Dict[str, ProviderStatus]:
+        """공급자별 현재 상태 (블로킹 없음)"""
+        status = {
+            "GPT": ProviderStatus(
+                bool(os.getenv("OPENAI_API_KEY")), detail="OPENAI_API_KEY 미설정"
+            ),
+            "Gemini": ProviderStatus(
+                bool(os.getenv("GOOGLE_API_KEY")), detail="GOOGLE_API_KEY 미설정"
+            ),
+            "MedGemma": ProviderStatus(
+                package_installed("torch", "transformers"),
+                detail="torch / transformers 미설치",
+            ),
+        }
+        with self._lock:
+            status["Ollama"] = self._endpoints.get("Ollama") or ProviderStatus(
+                False, pending=True, detail="상태 확인 중"
+            )
+        for s in status.values():
+            if s.available:
+                s.detail = ""
+
+        # 지연 인식 라우터 (LLM_ROUTER_BACKENDS 설정 시)
+        from .router import router_backends
+        backends = router_backends()
+        if backends:
+            status["Router"] = ProviderStatus(
+                any(status[b].available for b in backends if b in status),
+                pending=any(status[b].pending for b in backends if b in status),
+            )
+        return status
+
+
+_service: Optional[AvailabilityService] = None
+_service_lock = threading.Lock()
+
+
+def get_availability_service() -> AvailabilityService:
+    """프로세스 전역 가용성 서비스 (최초 호출 시 백그라운드 확인 시작)"""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = AvailabilityService(
+                interval=float(os.getenv("LLM_AVAILABILITY_INTERVAL", "30")),
+            ).start()
+        return _service
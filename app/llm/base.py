@@ -1,7 +1,10 @@
 """LLM 클라이언트 추상 기본 클래스"""
 
+import asyncio
+import contextvars
+import threading
 from abc import ABC, abstractmethod
-from typing import Iterator
+from typing import AsyncIterator, Iterator, List
 
 
 class BaseLLMClient(ABC):
@@ -16,6 +19,66 @@ class BaseLLMClient(ABC):
         """스트리밍 판독문 반환 (미지원 시 단건 yield)"""
         yield self.analyze(image_bytes, prompt, **kwargs)
 
+    def analyze_images(self, images: List[bytes], prompt: str, **kwargs) -> str:
+        """여러 이미지 + 프롬프트 → 판독문 (기본: 단일 이미지만 지원)"""
+        if len(images) == 1:
+            return self.analyze(images[0], prompt, **kwargs)
+        raise NotImplementedError(
+            f"{type(self).__name__}는 다중 이미지 입력을 지원하지 않습니다."
+        )
+
+    def stream_analyze_images(
+        self, images: List[bytes], prompt: str, **kwargs
+    ) -> Iterator[str]:
+        """여러 이미지 스트리밍 판독 (기본: 단일 이미지만 지원)"""
+        if len(images) == 1:
+            yield from self.stream_analyze(images[0], prompt, **kwargs)
+            return
+        yield self.analyze_images(images, prompt, **kwargs)
+
+    async def aanalyze(self, image_bytes: bytes, prompt: str, **kwargs) -> str:
+        """비동기 판독 (기본: 워커 스레드에서 analyze 실행)"""
+        return await asyncio.to_thread(self.analyze, image_bytes, prompt, **kwargs)
+
+    async def astream_analyze(
+        self, image_bytes: bytes, prompt: str, **kwargs
+    ) -> AsyncIterator[str]:
+        """비동기 스트리밍 (기본: 워커 스레드에서 stream_analyze 소비)
+
+        네이티브 async SDK가 없는 클라이언트용 폴백. 소비자가 중간에 빠져나가면
+        워커 스레드도 다음 청크에서 중단된다. 워커는 호출 시점의 contextvars를
+        복사해 실행한다 (호출 텔레메트리 등).
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        stop = threading.Event()
+        done = object()
+
+        def worker() -> None:
+            try:
+                for chunk in self.stream_analyze(image_bytes, prompt, **kwargs):
+                    if stop.is_set():
+                        break
+                    loop.call_soon_threadsafe(queue.put_nowait, chunk)
+            except BaseException as e:  # 소비자 쪽에서 다시 raise
+                loop.call_soon_threadsafe(queue.put_nowait, e)
+            finally:
+                loop.call_soon_threadsafe(queue.put_nowait, done)
+
+        future = loop.run_in_executor(None, contextvars.copy_context().run, worker)
+        try:
+            while True:
+                item = await queue.get()
+                if item is done:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+            if future.done():
+                future.result()
+
     @property
     @abstractmethod
     def model_name(self) -> str:
@@ -0,0 +1,129 @@
+"""MedGemma CPU 추론 최적화 설정
+
+GPU가 없는 노드에서 기본 float32 로드 대신 다음을 적용한다.
+  - Linear 계층 동적 int8 양자화 (torch.ao.quantization.quantize_dynamic)
+  - CPU가 지원하면 bfloat16 (AVX512-BF16 / AMX), int8 미사용 시에만
+  - intra-op / inter-op 스레드 수 설정
+  - SDPA attention + static KV 캐시 generate
+
+환경변수:
+  MEDGEMMA_DEVICE              auto(기본) | cpu | cuda
+  MEDGEMMA_CPU_INT8            1(기본) | 0
+  MEDGEMMA_CPU_BF16            auto(기본) | 1 | 0
+  MEDGEMMA_CPU_THREADS         intra-op 스레드 수 (기본: torch 기본값)
+  MEDGEMMA_CPU_INTEROP_THREADS inter-op 스레드 수 (기본: torch 기본값)
+  MEDGEMMA_CPU_STATIC_CACHE    1(기본) | 0
+"""
+
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+
+def _env_flag(name: str, default: Optional[bool]) -> Optional[bool]:
+    value = os.getenv(name, "").strip().lower()
+    if value in ("1", "true", "yes"):
+        return True
+    if value in ("0", "false", "no"):
+        return False
+    return default
+
+
+def _env_int(name: str) -> Optional[int]:
+    value = os.getenv(name, "").strip()
+    return int(value) if value else None
+
+
+@dataclass
+class CPUInferenceConfig:
+    quantize_int8: bool = True
+    bf16: Optional[bool] = None          # None: CPU 지원 여부 자동 감지
+    intra_op_threads: Optional[int] = None
+    inter_op_threads: Optional[int] = None
+    static_cache: bool = True
+
+    @classmethod
+    def from_env(cls) -> "CPUInferenceConfig":
+        return cls(
+            quantize_int8=_env_flag("MEDGEMMA_CPU_INT8", True),
+            bf16=_env_flag("MEDGEMMA_CPU_BF16", None),
+            intra_op_threads=_env_int("MEDGEMMA_CPU_THREADS"),
+            inter_op_threads=_env_int("MEDGEMMA_CPU_INTEROP_THREADS"),
+            static_cache=_env_flag("MEDGEMMA_CPU_STATIC_CACHE", True),
+        )
+
+
+def use_cpu_mode() -> bool:
+    """MEDGEMMA_DEVICE 설정과 CUDA 가용성으로 CPU 모드 여부 결정"""
+    device = os.getenv("MEDGEMMA_DEVICE", "auto").lower()
+    if device == "cpu":
+        return True
+    if device == "cuda":
+        return False
+    import torch
+
+    return not torch.cuda.is_available()
+
+
+def cpu_supports_bf16() -> bool:
+    """CPU의 네이티브 bfloat16 연산 지원 여부 (AVX512-BF16 / AMX-BF16)"""
+    try:
+        with open("/proc/cpuinfo") as f:
+            flags = f.read()
+    except OSError:
+        return False
+    return "avx512_bf16" in flags or "amx_bf16" in flags
+
+
+def configure_threads(config: CPUInferenceConfig) -> None:
+    import torch
+
+    if config.intra_op_threads:
+        torch.set_num_threads(config.intra_op_threads)
+    if config.inter_op_threads:
+        try:
+            torch.set_num_interop_threads(config.inter_op_threads)
+        except RuntimeError:
+            # 병렬 작업이 이미 시작된 뒤에는 변경 불가 (프로세스당 1회)
+            pass
+
+
+def resolve_dtype(config: CPUInferenceConfig):
+    """로드 dtype — int8 양자화는 float32 Linear에만 적용되므로 float32 유지"""
+    import torch
+
+    if config.quantize_int8:
+        return torch.float32
+    bf16 = cpu_supports_bf16() if config.bf16 is None else config.bf16
+    return torch.bfloat16 if bf16 else torch.float32
+
+
+def optimize_for_cpu(model, config: CPUInferenceConfig):
+    """로드된 모델에 CPU 최적화 적용 (int8 동적 양자화)"""
+    import torch
+
+    model.eval()
+    if config.quantize_int8:
+        model = torch.ao.quantization.quantize_dynamic(
+            model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+    return model
+
+
+def load_kwargs(config: CPUInferenceConfig) -> dict:
+    """from_pretrained 인자 (CPU 모드)"""
+    return {
+        "torch_dtype": resolve_dtype(config),
+        "device_map": "cpu",
+        "attn_implementation": "sdpa",
+        "low_cpu_mem_usage": True,
+    }
+
+
+def generation_kwargs(model, config: Optional[CPUInferenceConfig] = None) -> dict:
+    """CPU 모델용 generate 추가 인자 (GPU 모델이면 빈 dict)"""
+    device = getattr(model, "device", None)
+    if device is None or device.type != "cpu":
+        return {}
+    config = config or CPUInferenceConfig.from_env()
+    return {"cache_implementation": "static"} if config.static_cache else {}
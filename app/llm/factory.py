@@ -0,0 +1,63 @@
+"""공급자 이름 → LLM 클라이언트 생성"""
+
+import os
+from typing import Dict, List, Optional
+
+from .base import BaseLLMClient
+
+# 공급자 이름 → (모듈, 클래스). SDK 임포트는 생성 시점까지 지연
+PROVIDERS: Dict[str, tuple] = {
+    "GPT": (".gpt_client", "GPTClient"),
+    "Gemini": (".gemini_client", "GeminiClient"),
+    "MedGemma": (".medgemma_client", "MedGemmaClient"),
+    "Ollama": (".ollama_client", "OllamaClient"),
+    "Fake": (".fake_client", "FakeLLMClient"),
+}
+
+# 공급자별 기본 모델 환경변수 (.env)
+MODEL_ENV: Dict[str, str] = {
+    "GPT": "OPENAI_MODEL",
+    "Gemini": "GEMINI_MODEL",
+    "MedGemma": "MEDGEMMA_MODEL",
+    "Ollama": "OLLAMA_MODEL",
+}
+
+
+def default_model(provider: str) -> Optional[str]:
+    """환경변수에 지정된 기본 모델 (없으면 None → 클라이언트 기본값)"""
+    env = MODEL_ENV.get(provider)
+    return (os.getenv(env) or None) if env else None
+
+
+def get_client_class(provider: str) -> type:
+    """공급자 이름에 해당하는 클라이언트 클래스 반환"""
+    import importlib
+
+    if provider not in PROVIDERS:
+        raise ValueError(
+            f"알 수 없는 LLM 공급자: {provider} (가능: {', '.join(PROVIDERS)})"
+        )
+    module_name, class_name = PROVIDERS[provider]
+    module = importlib.import_module(module_name, __package__)
+    return getattr(module, class_name)
+
+
+def create_client(provider: str, **params) -> BaseLLMClient:
+    """공급자 이름과 파라미터로 클라이언트 인스턴스 생성 (호출 텔레메트리 래핑)
+
+    Example:
+        create_client("GPT", model="gpt-4o", temperature=0.3)
+    """
+    from .telemetry import instrument
+
+    return instrument(get_client_class(provider)(**params), provider)
+
+
+def create_default_client(provider: str) -> BaseLLMClient:
+    """환경변수 기본 모델로 클라이언트 생성 (모델 비교 모드 등)"""
+    model = default_model(provider)
+    return create_client(provider, **({"model": model} if model else {}))
+
+
+def list_providers() -> List[str]:
+    return list(PROVIDERS)
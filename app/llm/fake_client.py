@@ -0,0 +1,101 @@
+"""로컬 테스트용 가짜 LLM 클라이언트 (네트워크/API 키 불필요)
+
+배치 파이프라인, 부하 테스트 등에서 실제 API 비용 없이 지연·스트리밍·
+오류(429/5xx)를 재현하기 위해 사용한다.
+"""
+
+import asyncio
+import hashlib
+import random
+import time
+from typing import AsyncIterator, Iterator, List, Optional
+
+from .base import BaseLLMClient
+from .stream_metrics import CHARS_PER_TOKEN
+from .telemetry import base64_size, report_usage
+
+
+class FakeProviderError(Exception):
+    """HTTP 상태 코드를 가진 가짜 공급자 오류"""
+
+    def __init__(self, status_code: int, message: str = ""):
+        super().__init__(message or f"fake provider error {status_code}")
+        self.status_code = status_code
+
+
+class FakeLLMClient(BaseLLMClient):
+    def __init__(
+        self,
+        model: str = "fake-vision",
+        ttft: float = 0.2,
+        token_delay: float = 0.01,
+        num_tokens: int = 64,
+        error_rate: float = 0.0,
+        error_status: int = 429,
+        seed: Optional[int] = None,
+    ):
+        self._model = model
+        self.ttft = ttft
+        self.token_delay = token_delay
+        self.num_tokens = num_tokens
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self._rng = random.Random(seed)
+
+    @property
+    def model_name(self) -> str:
+        return self._model
+
+    @property
+    def supports_streaming(self) -> bool:
+        return True
+
+    def _maybe_fail(self) -> None:
+        if self.error_rate > 0 and self._rng.random() < self.error_rate:
+            raise FakeProviderError(self.error_status)
+
+    def _tokens(self, image_bytes: bytes, prompt: str) -> Iterator[str]:
+        # 텔레메트리용 사용량 (실제 공급자 보고값 대신 추정치)
+        report_usage(
+            image_bytes=base64_size(len(image_bytes)),
+            prompt_tokens=len(prompt) // CHARS_PER_TOKEN,
+            completion_tokens=self.num_tokens,
+        )
+        digest = hashlib.sha1(image_bytes).hexdigest()[:12]
+        yield f"**Fake report** ({self._model}, image {digest}, {len(image_bytes)} bytes)\n\n"
+        for i in range(self.num_tokens):
+            yield f"token{i} "
+
+    def analyze(self, image_bytes: bytes, prompt: str, **kwargs) -> str:
+        return "".join(self.stream_analyze(image_bytes, prompt, **kwargs))
+
+    def analyze_images(self, images: List[bytes], prompt: str, **kwargs) -> str:
+        return "".join(self.stream_analyze_images(images, prompt, **kwargs))
+
+    def stream_analyze_images(
+        self, images: List[bytes], prompt: str, **kwargs
+    ) -> Iterator[str]:
+        # 여러 이미지는 연결한 bytes 하나로 취급
+        return self.stream_analyze(b"".join(images), prompt, **kwargs)
+
+    def stream_analyze(self, image_bytes: bytes, prompt: str, **kwargs) -> Iterator[str]:
+        time.sleep(self.ttft)
+        self._maybe_fail()
+        for i, token in enumerate(self._tokens(image_bytes, prompt)):
+            if i:
+                time.sleep(self.token_delay)
+            yield token
+
+    async def aanalyze(self, image_bytes: bytes, prompt: str, **kwargs) -> str:
+        chunks = [c async for c in self.astream_analyze(image_bytes, prompt, **kwargs)]
+        return "".join(chunks)
+
+    async def astream_analyze(
+        self, image_bytes: bytes, prompt: str, **kwargs
+    ) -> AsyncIterator[str]:
+        await asyncio.sleep(self.ttft)
+        self._maybe_fail()
+        for i, token in enumerate(self._tokens(image_bytes, prompt)):
+            if i:
+                await asyncio.sleep(self.token_delay)
+            yield token
@@ -0,0 +1,91 @@
+"""다중 모델 동시 판독 (fan-out)
+
+같은 이미지·프롬프트를 여러 클라이언트에 동시에 보내고, 각 응답 청크를
+도착 순서대로 하나의 이벤트 스트림으로 합쳐 반환한다. 호출 스레드(예:
+Streamlit 스크립트)는 이벤트를 받아 모델별 영역에 그리기만 하면 되며,
+전체 시간은 모델 지연의 합이 아니라 최댓값에 가깝다.
+"""
+
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional
+
+from .base import BaseLLMClient
+
+
+@dataclass
+class FanoutStats:
+    name: str
+    model: str
+    ttft_s: Optional[float] = None
+    total_s: Optional[float] = None
+    chars: int = 0
+    error: Optional[str] = None
+
+
+@dataclass
+class FanoutEvent:
+    name: str
+    kind: str                  # "chunk" | "done" | "error"
+    text: str = ""
+    stats: Optional[FanoutStats] = None
+
+
+def fan_out(
+    clients: Dict[str, BaseLLMClient],
+    images: List[bytes],
+    prompt: str,
+) -> Iterator[FanoutEvent]:
+    """클라이언트별 스레드에서 스트리밍, 이벤트를 도착 순서대로 반환
+
+    스트리밍 미지원 클라이언트는 완료 시 전체 응답을 청크 하나로 보낸다.
+    소비자가 중간에 빠져나가면 각 워커는 다음 청크에서 생성을 중단한다.
+    """
+    events: "queue.Queue[FanoutEvent]" = queue.Queue()
+    stop = threading.Event()
+    started = time.perf_counter()
+
+    def worker(name: str, client: BaseLLMClient) -> None:
+        stats = FanoutStats(name, client.model_name)
+        try:
+            if client.supports_streaming:
+                chunks = client.stream_analyze_images(images, prompt)
+            else:
+                chunks = iter([client.analyze_images(images, prompt)])
+            try:
+                for chunk in chunks:
+                    if stop.is_set():
+                        break
+                    if not chunk:
+                        continue
+                    if stats.ttft_s is None:
+                        stats.ttft_s = time.perf_counter() - started
+                    stats.chars += len(chunk)
+                    events.put(FanoutEvent(name, "chunk", chunk))
+            finally:
+                close = getattr(chunks, "close", None)
+                if close is not None:
+                    close()
+        except Exception as e:
+            stats.error = f"{type(e).__name__}: {e}"
+        stats.total_s = time.perf_counter() - started
+        events.put(FanoutEvent(name, "error" if stats.error else "done", stats=stats))
+
+    threads = [
+        threading.Thread(target=worker, args=(name, client), name=f"fanout-{name}", daemon=True)
+        for name, client in clients.items()
+    ]
+    for thread in threads:
+        thread.start()
+
+    remaining = len(threads)
+    try:
+        while remaining:
+            event = events.get()
+            if event.kind != "chunk":
+                remaining -= 1
+            yield event
+    finally:
+        stop.set()
@@ -1,12 +1,12 @@
 """Google Gemini 클라이언트"""
 
 import os
-from io import BytesIO
-from typing import Iterator
-
-from PIL import Image
+from typing import AsyncIterator, Iterator, List
 
+from . import transport
 from .base import BaseLLMClient
+from .image_payload import prepare_image
+from .telemetry import base64_size, report_usage
 
 
 class GeminiClient(BaseLLMClient):
@@ -19,17 +19,13 @@ class GeminiClient(BaseLLMClient):
         self._model = model
         self.temperature = temperature
         self.max_tokens = max_tokens
-        self._genai = None
 
     def _get_genai(self):
-        if self._genai is None:
-            import google.generativeai as genai
-            api_key = os.getenv("GOOGLE_API_KEY")
-            if not api_key:
-                raise ValueError("GOOGLE_API_KEY 환경변수가 설정되지 않았습니다.")
-            genai.configure(api_key=api_key)
-            self._genai = genai
-        return self._genai
+        api_key = os.getenv("GOOGLE_API_KEY")
+        if not api_key:
+            raise ValueError("GOOGLE_API_KEY 환경변수가 설정되지 않았습니다.")
+        # 키 / 엔드포인트가 바뀔 때만 configure (SDK 내부 채널 재사용)
+        return transport.get_genai(api_key)
 
     @property
     def model_name(self) -> str:
@@ -53,22 +49,77 @@ class GeminiClient(BaseLLMClient):
             ),
         )
 
-    def _to_pil(self, image_bytes: bytes) -> Image.Image:
-        return Image.open(BytesIO(image_bytes)).convert("RGB")
+    def _image_part(self, image_bytes: bytes) -> dict:
+        # 인코딩된 bytes를 그대로 blob으로 전달 (PIL 디코드 → SDK 재인코딩 생략)
+        image = prepare_image(image_bytes, "gemini")
+        return {"mime_type": image.mime_type, "data": image.data}
+
+    def _contents(self, images: List[bytes], prompt: str) -> list:
+        parts = [self._image_part(image_bytes) for image_bytes in images]
+        report_usage(image_bytes=sum(base64_size(len(p["data"])) for p in parts))
+        return [prompt] + parts
+
+    @staticmethod
+    def _report_tokens(response) -> None:
+        # 스트림은 마지막 청크까지 소비한 뒤에 usage_metadata가 채워짐
+        usage = getattr(response, "usage_metadata", None)
+        if usage is not None:
+            report_usage(
+                prompt_tokens=getattr(usage, "prompt_token_count", None) or None,
+                completion_tokens=getattr(usage, "candidates_token_count", None) or None,
+            )
 
     def analyze(self, image_bytes: bytes, prompt: str, **kwargs) -> str:
+        return self.analyze_images([image_bytes], prompt, **kwargs)
+
+    def stream_analyze(self, image_bytes: bytes, prompt: str, **kwargs) -> Iterator[str]:
+        return self.stream_analyze_images([image_bytes], prompt, **kwargs)
+
+    def analyze_images(self, images: List[bytes], prompt: str, **kwargs) -> str:
         model = self._get_model()
-        response = model.generate_content([prompt, self._to_pil(image_bytes)])
+        response = model.generate_content(self._contents(images, prompt))
+        self._report_tokens(response)
         return response.text
 
-    def stream_analyze(self, image_bytes: bytes, prompt: str, **kwargs) -> Iterator[str]:
+    def stream_analyze_images(
+        self, images: List[bytes], prompt: str, **kwargs
+    ) -> Iterator[str]:
         model = self._get_model()
-        response = model.generate_content(
-            [prompt, self._to_pil(image_bytes)], stream=True
-        )
+        response = model.generate_content(self._contents(images, prompt), stream=True)
         for chunk in response:
             try:
                 if chunk.text:
                     yield chunk.text
             except Exception:
                 continue
+        self._report_tokens(response)
+
+    async def aanalyze(self, image_bytes: bytes, prompt: str, **kwargs) -> str:
+        if transport.genai_endpoint():
+            # REST 전송은 generate_content_async 미지원 → 스레드 오프로드 폴백
+            return await super().aanalyze(image_bytes, prompt, **kwargs)
+        model = self._get_model()
+        response = await model.generate_content_async(
+            self._contents([image_bytes], prompt)
+        )
+        self._report_tokens(response)
+        return response.text
+
+    async def astream_analyze(
+        self, image_bytes: bytes, prompt: str, **kwargs
+    ) -> AsyncIterator[str]:
+        if transport.genai_endpoint():
+            async for chunk in super().astream_analyze(image_bytes, prompt, **kwargs):
+                yield chunk
+            return
+        model = self._get_model()
+        response = await model.generate_content_async(
+            self._contents([image_bytes], prompt), stream=True
+        )
+        async for chunk in response:
+            try:
+                if chunk.text:
+                    yield chunk.text
+            except Exception:
+                continue
+        self._report_tokens(response)
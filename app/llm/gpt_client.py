@@ -2,9 +2,12 @@
 
 import base64
 import os
-from typing import Iterator
+from typing import AsyncIterator, Iterator, List
 
+from . import transport
 from .base import BaseLLMClient
+from .image_payload import prepare_image
+from .telemetry import report_usage
 
 
 class GPTClient(BaseLLMClient):
@@ -17,16 +20,22 @@ class GPTClient(BaseLLMClient):
         self._model = model
         self.temperature = temperature
         self.max_tokens = max_tokens
-        self._client = None
+
+    @staticmethod
+    def _api_key() -> str:
+        api_key = os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            raise ValueError("OPENAI_API_KEY 환경변수가 설정되지 않았습니다.")
+        return api_key
 
     def _get_client(self):
-        if self._client is None:
-            from openai import OpenAI
-            api_key = os.getenv("OPENAI_API_KEY")
-            if not api_key:
-                raise ValueError("OPENAI_API_KEY 환경변수가 설정되지 않았습니다.")
-            self._client = OpenAI(api_key=api_key)
-        return self._client
+        # 프로세스 전역 공유 클라이언트 (커넥션 풀 재사용)
+        return transport.get_openai_client(self._api_key(), os.getenv("OPENAI_BASE_URL"))
+
+    def _get_async_client(self):
+        return transport.get_async_openai_client(
+            self._api_key(), os.getenv("OPENAI_BASE_URL")
+        )
 
     @property
     def model_name(self) -> str:
@@ -40,44 +49,97 @@ class GPTClient(BaseLLMClient):
     def is_available(cls) -> bool:
         return bool(os.getenv("OPENAI_API_KEY"))
 
-    def _build_messages(self, image_bytes: bytes, prompt: str) -> list:
-        b64 = base64.b64encode(image_bytes).decode()
-        return [
-            {
-                "role": "user",
-                "content": [
-                    {"type": "text", "text": prompt},
-                    {
-                        "type": "image_url",
-                        "image_url": {
-                            "url": f"data:image/png;base64,{b64}",
-                            "detail": "high",
-                        },
+    def _build_messages(self, images: List[bytes], prompt: str) -> list:
+        content = [{"type": "text", "text": prompt}]
+        sent = 0
+        for image_bytes in images:
+            image = prepare_image(image_bytes, "openai")
+            b64 = base64.b64encode(image.data).decode()
+            sent += len(b64)
+            content.append(
+                {
+                    "type": "image_url",
+                    "image_url": {
+                        "url": f"data:{image.mime_type};base64,{b64}",
+                        "detail": "high",
                     },
-                ],
-            }
-        ]
+                }
+            )
+        report_usage(image_bytes=sent)
+        return [{"role": "user", "content": content}]
+
+    @staticmethod
+    def _report_tokens(usage) -> None:
+        if usage is not None:
+            report_usage(
+                prompt_tokens=usage.prompt_tokens, completion_tokens=usage.completion_tokens
+            )
 
     def analyze(self, image_bytes: bytes, prompt: str, **kwargs) -> str:
+        return self.analyze_images([image_bytes], prompt, **kwargs)
+
+    def stream_analyze(self, image_bytes: bytes, prompt: str, **kwargs) -> Iterator[str]:
+        return self.stream_analyze_images([image_bytes], prompt, **kwargs)
+
+    def analyze_images(self, images: List[bytes], prompt: str, **kwargs) -> str:
         client = self._get_client()
         response = client.chat.completions.create(
             model=self._model,
-            messages=self._build_messages(image_bytes, prompt),
+            messages=self._build_messages(images, prompt),
             temperature=self.temperature,
             max_tokens=self.max_tokens,
         )
+        self._report_tokens(response.usage)
         return response.choices[0].message.content
 
-    def stream_analyze(self, image_bytes: bytes, prompt: str, **kwargs) -> Iterator[str]:
+    def stream_analyze_images(
+        self, images: List[bytes], prompt: str, **kwargs
+    ) -> Iterator[str]:
         client = self._get_client()
         stream = client.chat.completions.create(
             model=self._model,
-            messages=self._build_messages(image_bytes, prompt),
+            messages=self._build_messages(images, prompt),
             temperature=self.temperature,
             max_tokens=self.max_tokens,
             stream=True,
+            stream_options={"include_usage": True},
         )
         for chunk in stream:
+            # include_usage: 마지막 청크는 choices 없이 usage만 담김
+            self._report_tokens(getattr(chunk, "usage", None))
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta is not None:
+                yield delta
+
+    async def aanalyze(self, image_bytes: bytes, prompt: str, **kwargs) -> str:
+        client = self._get_async_client()
+        response = await client.chat.completions.create(
+            model=self._model,
+            messages=self._build_messages([image_bytes], prompt),
+            temperature=self.temperature,
+            max_tokens=self.max_tokens,
+        )
+        self._report_tokens(response.usage)
+        return response.choices[0].message.content
+
+    async def astream_analyze(
+        self, image_bytes: bytes, prompt: str, **kwargs
+    ) -> AsyncIterator[str]:
+        client = self._get_async_client()
+        stream = await client.chat.completions.create(
+            model=self._model,
+            messages=self._build_messages([image_bytes], prompt),
+            temperature=self.temperature,
+            max_tokens=self.max_tokens,
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+        async for chunk in stream:
+            self._report_tokens(getattr(chunk, "usage", None))
+            if not chunk.choices:
+                continue
             delta = chunk.choices[0].delta.content
             if delta is not None:
                 yield delta
@@ -0,0 +1,209 @@
+"""공급자별 비전 입력 이미지 최적화 (리사이즈 + 코덱 선택 + 캐시)
+
+뷰어 출력 PNG를 각 공급자의 해상도/타일 규칙에 맞춰 토큰 효율적인 크기로
+줄이고, 무손실(PNG) 또는 고품질 손실(JPEG q95, 4:4:4) 코덱으로 인코딩한다.
+같은 (이미지, 공급자) 조합은 인코딩 결과를 재사용한다.
+
+공급자 규칙 요약:
+  openai   : 2048×2048 안으로 축소 → 짧은 변 768 이하, 512px 타일당 170 토큰 + 85
+  gemini   : 양 변 384 이하 1타일, 그 외 768px 타일당 258 토큰
+  ollama   : LLaVA 계열 입력 해상도(336/672) 고려, 긴 변 1344 이하
+  medgemma : SigLIP 896×896 입력, 긴 변 896 이하
+
+환경변수:
+  LLM_IMAGE_OPTIMIZE     1(기본) | 0 (원본 그대로 전송)
+  LLM_IMAGE_CODEC        auto(기본) | png | jpeg
+  LLM_IMAGE_CACHE_SIZE   인코딩 결과 캐시 항목 수 (기본 64)
+"""
+
+import hashlib
+import math
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from io import BytesIO
+from typing import Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+from core.profiling import timed
+
+
+@dataclass(frozen=True)
+class ProviderImageProfile:
+    max_long_side: int
+    max_short_side: Optional[int] = None
+    tile: Optional[int] = None
+    tile_tokens: int = 0
+    base_tokens: int = 0
+    small_image_side: Optional[int] = None  # 양 변이 이 값 이하면 1타일
+
+
+PROFILES = {
+    "openai": ProviderImageProfile(2048, 768, tile=512, tile_tokens=170, base_tokens=85),
+    "gemini": ProviderImageProfile(3072, None, tile=768, tile_tokens=258, small_image_side=384),
+    "ollama": ProviderImageProfile(1344),
+    "medgemma": ProviderImageProfile(896),
+}
+
+# 타일 수를 줄이기 위해 허용하는 최대 추가 축소 비율
+MAX_TILE_SNAP_SHRINK = 0.15
+
+# auto 코덱: JPEG가 PNG보다 이 배수 이상 작을 때만 손실 코덱 선택
+JPEG_MIN_GAIN = 2.0
+JPEG_QUALITY = 95
+
+
+@dataclass(frozen=True)
+class PreparedImage:
+    data: bytes
+    mime_type: str
+    width: int
+    height: int
+    est_tokens: Optional[int]
+    original_size: int
+
+
+def estimate_tokens(profile: ProviderImageProfile, width: int, height: int) -> Optional[int]:
+    """타일 규칙 기반 이미지 토큰 수 추정 (규칙 없는 공급자는 None)"""
+    if profile.tile is None:
+        return None
+    if profile.small_image_side and max(width, height) <= profile.small_image_side:
+        tiles = 1
+    else:
+        tiles = math.ceil(width / profile.tile) * math.ceil(height / profile.tile)
+    return profile.base_tokens + tiles * profile.tile_tokens
+
+
+def target_size(profile: ProviderImageProfile, width: int, height: int) -> Tuple[int, int]:
+    """공급자 규칙에 맞춘 전송 크기 (축소만, 비율 유지)"""
+    scale = min(1.0, profile.max_long_side / max(width, height))
+    if profile.max_short_side:
+        scale = min(scale, profile.max_short_side / min(width, height))
+    w, h = width * scale, height * scale
+
+    if profile.tile:
+        # 타일 경계 바로 위에 걸친 크기는 약간 줄여 타일 수(토큰) 절감
+        best_scale = 1.0
+        best_tokens = estimate_tokens(profile, round(w), round(h))
+        for side in (w, h):
+            snapped = math.floor(side / profile.tile) * profile.tile
+            s = snapped / side
+            if snapped <= 0 or s >= 1.0 or s < 1 - MAX_TILE_SNAP_SHRINK:
+                continue
+            tokens = estimate_tokens(profile, round(w * s), round(h * s))
+            if tokens < best_tokens:
+                best_scale, best_tokens = s, tokens
+        w, h = w * best_scale, h * best_scale
+
+    return max(1, round(w)), max(1, round(h))
+
+
+def pixels_for_token_budget(provider: str, tokens: Optional[int] = None) -> int:
+    """이미지 토큰 예산 안에서 실제로 전달되는 최대 픽셀 수
+
+    몽타주 등 합성 이미지 크기를 정할 때 사용한다. 공급자 해상도 상한을 넘는
+    픽셀은 어차피 축소되므로 상한과 토큰 예산 중 작은 쪽을 반환한다.
+    """
+    profile = PROFILES[provider]
+    limit = profile.max_long_side * (profile.max_short_side or profile.max_long_side)
+    if tokens is None or profile.tile is None:
+        return limit
+    tiles = max(1, (tokens - profile.base_tokens) // profile.tile_tokens)
+    return min(limit, tiles * profile.tile * profile.tile)
+
+
+def _is_grayscale(img: Image.Image) -> bool:
+    if img.mode in ("L", "LA", "I", "I;16", "F"):
+        return True
+    arr = np.asarray(img.convert("RGB"))
+    return bool(
+        np.array_equal(arr[..., 0], arr[..., 1]) and np.array_equal(arr[..., 1], arr[..., 2])
+    )
+
+
+def _encode(img: Image.Image, codec: str) -> Tuple[bytes, str]:
+    buf = BytesIO()
+    if codec == "jpeg":
+        img.save(buf, format="JPEG", quality=JPEG_QUALITY, subsampling=0, optimize=True)
+        return buf.getvalue(), "image/jpeg"
+    img.save(buf, format="PNG", optimize=True)
+    return buf.getvalue(), "image/png"
+
+
+def _optimize(image_bytes: bytes, profile: ProviderImageProfile, codec: str) -> PreparedImage:
+    img = Image.open(BytesIO(image_bytes))
+    img.load()
+    # 흑백 영상은 1채널로 인코딩 (RGB 대비 1/3 크기, 정보 손실 없음)
+    img = img.convert("L") if _is_grayscale(img) else img.convert("RGB")
+
+    width, height = target_size(profile, *img.size)
+    if (width, height) != img.size:
+        img = img.resize((width, height), Image.LANCZOS)
+
+    data, mime = _encode(img, "png")
+    if codec in ("jpeg", "auto"):
+        jpeg, jpeg_mime = _encode(img, "jpeg")
+        if codec == "jpeg" or len(jpeg) * JPEG_MIN_GAIN <= len(data):
+            data, mime = jpeg, jpeg_mime
+
+    return PreparedImage(
+        data=data,
+        mime_type=mime,
+        width=width,
+        height=height,
+        est_tokens=estimate_tokens(profile, width, height),
+        original_size=len(image_bytes),
+    )
+
+
+class _PreparedCache:
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, PreparedImage]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> Optional[PreparedImage]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: tuple, value: PreparedImage) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+_cache = _PreparedCache(int(os.getenv("LLM_IMAGE_CACHE_SIZE", "64")))
+
+
+def detect_mime(image_bytes: bytes) -> str:
+    """이미지 bytes의 MIME 타입 (헤더만 읽음, 판별 실패 시 image/png)"""
+    try:
+        with Image.open(BytesIO(image_bytes)) as img:
+            return Image.MIME.get(img.format, "image/png")
+    except Exception:
+        return "image/png"
+
+
+@timed("llm.image_payload")
+def prepare_image(image_bytes: bytes, provider: str) -> PreparedImage:
+    """공급자에 맞게 최적화된 이미지 (캐시)"""
+    profile = PROFILES.get(provider)
+    if profile is None or os.getenv("LLM_IMAGE_OPTIMIZE", "1") == "0":
+        # 원본 그대로 전송: 업로드 형식(JPEG 등)에 맞는 MIME 타입 사용
+        return PreparedImage(image_bytes, detect_mime(image_bytes), 0, 0, None, len(image_bytes))
+
+    codec = os.getenv("LLM_IMAGE_CODEC", "auto").lower()
+    key = (hashlib.sha256(image_bytes).digest(), provider, codec)
+    prepared = _cache.get(key)
+    if prepared is None:
+        prepared = _optimize(image_bytes, profile, codec)
+        _cache.put(key, prepared)
+    return prepared
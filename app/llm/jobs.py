@@ -0,0 +1,318 @@
+"""백그라운드 판독 작업 큐 (Streamlit rerun / 페이지 이동과 무관하게 실행)
+
+판독 요청을 작업(job)으로 제출하면 프로세스 전역 워커 풀에서 실행되고,
+생성된 토큰은 서버 측 버퍼에 쌓인다. 페이지는 작업 id로 언제든 다시
+붙어(attach) 버퍼를 이어서 읽으므로 위젯 조작이나 페이지 이동으로 스크립트가
+중단되어도 이미 비용을 지불한 판독이 버려지지 않는다.
+
+환경변수 (``get_job_manager``):
+  LLM_JOB_WORKERS         동시에 실행하는 작업 수 (기본 4)
+  LLM_JOB_PER_USER        사용자당 진행 중(대기 + 실행) 작업 상한 (기본 2)
+  LLM_JOB_RETENTION_SEC   끝난 작업 보관 시간 (기본 3600)
+"""
+
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from core import profiling
+
+from .base import BaseLLMClient
+from .fanout import fan_out
+from .map_reduce import MapPart, MapReduceAnalyzer
+from .router import RouterClient
+from .stream_metrics import StreamMetrics
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+ERROR = "error"
+CANCELLED = "cancelled"
+FINISHED = (DONE, ERROR, CANCELLED)
+
+
+class JobLimitError(RuntimeError):
+    """사용자당 동시 작업 상한 초과"""
+
+
+@dataclass
+class Job:
+    id: str
+    owner: str
+    label: str
+    model: str = ""
+    status: str = QUEUED
+    created: float = field(default_factory=time.time)
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    ttft: Optional[float] = None
+    error: Optional[str] = None
+    meta: dict = field(default_factory=dict)   # 작업별 부가 정보 (응답 백엔드 등)
+    metrics: Optional[StreamMetrics] = None    # 실행 시작 시 생성 (TTFT / tok/s / 청크 간격)
+    chunks: List[str] = field(default_factory=list)
+    cancel_event: threading.Event = field(default_factory=threading.Event, repr=False)
+    _cond: threading.Condition = field(default_factory=threading.Condition, repr=False)
+
+    @property
+    def text(self) -> str:
+        with self._cond:
+            return "".join(self.chunks)
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in FINISHED
+
+    def _append(self, chunk: str) -> None:
+        with self._cond:
+            self.chunks.append(chunk)
+            self._cond.notify_all()
+
+    def update_meta(self, **values) -> None:
+        """부가 정보 갱신 + 대기 중인 페이지 깨우기 (슬랩 진행 / 비교 열 등)"""
+        with self._cond:
+            self.meta.update(values)
+            self._cond.notify_all()
+
+    def wait(self, timeout: float) -> bool:
+        """다음 갱신(청크 / 부가 정보 / 상태)까지 최대 timeout 대기 → 종료 여부"""
+        with self._cond:
+            if not self.is_finished:
+                self._cond.wait(timeout)
+            return self.is_finished
+
+    def _set_status(self, status: str, error: Optional[str] = None) -> None:
+        with self._cond:
+            self.status = status
+            self.error = error
+            if status == RUNNING:
+                self.started = time.time()
+            elif status in FINISHED:
+                self.finished = time.time()
+            self._cond.notify_all()
+
+    def read(self, offset: int = 0, timeout: float = 0.0) -> Tuple[List[str], bool]:
+        """offset 이후 청크 (없으면 timeout까지 대기) → (새 청크, 종료 여부)"""
+        with self._cond:
+            if len(self.chunks) <= offset and not self.is_finished and timeout > 0:
+                self._cond.wait(timeout)
+            return self.chunks[offset:], self.is_finished
+
+    def stream(self, offset: int = 0, poll: float = 0.5) -> Iterator[str]:
+        """작업이 끝날 때까지 청크를 이어서 반환 (재연결 시 offset부터)"""
+        while True:
+            chunks, finished = self.read(offset, timeout=poll)
+            offset += len(chunks)
+            yield from chunks
+            if finished and not chunks:
+                return
+
+
+class JobManager:
+    def __init__(
+        self,
+        max_workers: int = 4,
+        per_user_limit: int = 2,
+        retention_sec: float = 3600.0,
+    ):
+        self.max_workers = max_workers
+        self.per_user_limit = per_user_limit
+        self.retention_sec = retention_sec
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="llm-job")
+
+    def submit(
+        self,
+        owner: str,
+        label: str,
+        run: Callable[[Job], Iterator[str]],
+        model: str = "",
+        meta: Optional[dict] = None,
+    ) -> Job:
+        """작업 제출 — run(job)이 반환하는 청크 이터레이터를 워커에서 소비"""
+        with self._lock:
+            self._prune_locked()
+            active = sum(
+                1 for j in self._jobs.values() if j.owner == owner and not j.is_finished
+            )
+            if active >= self.per_user_limit:
+                raise JobLimitError(
+                    f"진행 중인 작업이 {active}개입니다 (사용자당 최대 {self.per_user_limit}개)"
+                )
+            job = Job(uuid.uuid4().hex[:12], owner, label, model, meta=dict(meta or {}))
+            self._jobs[job.id] = job
+        self._pool.submit(self._run, job, run)
+        return job
+
+    def submit_analysis(
+        self,
+        owner: str,
+        client: BaseLLMClient,
+        images: List[bytes],
+        prompt: str,
+        label: str,
+    ) -> Job:
+        """클라이언트 판독 작업 제출 (스트리밍 미지원이면 완료 시 1청크)"""
+        def run(job: Job) -> Iterator[str]:
+            kwargs = {}
+            if isinstance(client, RouterClient):
+                # 라우터는 세션 간 공유 → 경로는 요청별 콜백으로 받는다
+                kwargs["on_route"] = lambda route: job.meta.__setitem__("route", route)
+            if client.supports_streaming:
+                yield from client.stream_analyze_images(images, prompt, **kwargs)
+            else:
+                yield client.analyze_images(images, prompt, **kwargs)
+
+        return self.submit(owner, label, run, model=client.model_name)
+
+    def submit_map_reduce(
+        self,
+        owner: str,
+        client: BaseLLMClient,
+        parts: Sequence[MapPart],
+        overview: List[bytes],
+        instructions: str,
+        label: str,
+        concurrency: int = 4,
+    ) -> Job:
+        """전체 볼륨 판독 작업 (슬랩 병렬 판독 → 요약) — 사용자 상한에는 1건으로 집계
+
+        완료된 슬랩 결과는 meta["parts"]에 완료 순서대로 쌓이고,
+        요약 응답이 작업 버퍼로 스트리밍된다.
+        """
+        def run(job: Job) -> Iterator[str]:
+            analyzer = MapReduceAnalyzer(client, concurrency=concurrency)
+            started = time.perf_counter()
+            results = []
+            for result in analyzer.map(parts):
+                results.append(result)
+                job.update_meta(parts=list(results))
+                if job.cancel_event.is_set():
+                    return
+            job.update_meta(map_s=time.perf_counter() - started)
+            if client.supports_streaming:
+                yield from analyzer.stream_reduce(results, overview, instructions)
+            else:
+                yield analyzer.reduce(results, overview, instructions)
+
+        return self.submit(
+            owner, label, run, model=client.model_name,
+            meta={"kind": "slabs", "part_total": len(parts), "parts": []},
+        )
+
+    def submit_comparison(
+        self,
+        owner: str,
+        clients: Dict[str, BaseLLMClient],
+        images: List[bytes],
+        prompt: str,
+        label: str,
+    ) -> Job:
+        """모델 비교 작업 (fan-out) — 사용자 상한에는 1건으로 집계
+
+        모델별 청크 / 지표는 meta["columns"][이름]에 쌓이고 작업 버퍼는 비어 있다.
+        """
+        columns = {
+            name: {"model": client.model_name, "chunks": [], "stats": None}
+            for name, client in clients.items()
+        }
+
+        def run(job: Job) -> Iterator[str]:
+            for event in fan_out(clients, images, prompt):
+                column = columns[event.name]
+                if event.kind == "chunk":
+                    column["chunks"].append(event.text)
+                else:
+                    column["stats"] = asdict(event.stats)
+                job.update_meta()
+                yield ""   # 빈 청크는 버퍼에 쌓이지 않고 취소 확인 지점으로만 쓰인다
+
+        return self.submit(
+            owner, label, run, model=", ".join(columns),
+            meta={"kind": "compare", "columns": columns},
+        )
+
+    def _run(self, job: Job, run: Callable[[Job], Iterator[str]]) -> None:
+        if job.cancel_event.is_set():
+            job._set_status(CANCELLED)
+            return
+        job._set_status(RUNNING)
+        job.metrics = StreamMetrics()
+        chunks = None
+        try:
+            chunks = run(job)
+            for chunk in chunks:
+                if job.cancel_event.is_set():
+                    break
+                if not chunk:
+                    continue
+                if job.ttft is None:
+                    job.ttft = time.time() - job.started
+                job.metrics.record(chunk)
+                job._append(chunk)
+        except Exception as e:
+            job._set_status(ERROR, f"{type(e).__name__}: {e}")
+            return
+        finally:
+            job.metrics.finish()
+            # 복합 작업(슬랩 / 비교)은 단일 요청 지연이 아니므로 제외
+            if profiling.enabled() and "kind" not in job.meta:
+                profiling.record("llm.request", job.metrics.total_s)
+                if job.metrics.ttft_s is not None:
+                    profiling.record("llm.ttft", job.metrics.ttft_s)
+            close = getattr(chunks, "close", None)
+            if close is not None:
+                close()  # 취소 시 생성기 정리 → 클라이언트 스트림 중단
+        job._set_status(CANCELLED if job.cancel_event.is_set() else DONE)
+
+    def get(self, job_id: Optional[str]) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id) if job_id else None
+
+    def list(self, owner: Optional[str] = None) -> List[Job]:
+        """작업 목록 (최신순)"""
+        with self._lock:
+            jobs = [j for j in self._jobs.values() if owner is None or j.owner == owner]
+        return sorted(jobs, key=lambda j: j.created, reverse=True)
+
+    def cancel(self, job_id: str) -> bool:
+        """작업 취소 요청 (대기 중이면 실행하지 않고, 실행 중이면 다음 청크에서 중단)"""
+        job = self.get(job_id)
+        if job is None or job.is_finished:
+            return False
+        job.cancel_event.set()
+        return True
+
+    def reassign(self, job: Job, owner: str) -> None:
+        """작업 소유자 변경 (사전 판독 채택) — 목록 / 상한 집계와 같은 락 아래에서"""
+        with self._lock:
+            job.owner = owner
+
+    def _prune_locked(self) -> None:
+        cutoff = time.time() - self.retention_sec
+        for job_id in [
+            j.id for j in self._jobs.values()
+            if j.is_finished and (j.finished or 0) < cutoff
+        ]:
+            del self._jobs[job_id]
+
+
+_manager: Optional[JobManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_job_manager() -> JobManager:
+    """프로세스 전역 작업 관리자 (모든 세션 공유)"""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = JobManager(
+                max_workers=int(os.getenv("LLM_JOB_WORKERS", "4")),
+                per_user_limit=int(os.getenv("LLM_JOB_PER_USER", "2")),
+                retention_sec=float(os.getenv("LLM_JOB_RETENTION_SEC", "3600")),
+            )
+        return _manager
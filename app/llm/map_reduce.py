@@ -0,0 +1,133 @@
+"""전체 볼륨 map-reduce 판독
+
+슬랩(부분 영상)별 판독 요청을 동시성 상한 안에서 병렬로 보내고(map),
+부분 소견을 모아 요약 호출 1회로 최종 판독문을 만든다(reduce).
+map 단계 전체 시간은 슬랩 합계가 아니라 가장 느린 슬랩에 가깝다.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Sequence
+
+from .base import BaseLLMClient
+from .retry import call_with_retry
+
+
+@dataclass
+class MapPart:
+    label: str
+    images: List[bytes]
+    prompt: str
+
+
+@dataclass
+class PartResult:
+    index: int
+    label: str
+    text: str = ""
+    error: Optional[str] = None
+    attempts: int = 0
+    elapsed_s: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def part_prompt(instructions: str, region: str, layout: str) -> str:
+    """map 프롬프트 — 해당 구간 소견만 작성하도록 제한"""
+    return (
+        f"{instructions}\n\n"
+        f"This image shows only one region of a larger CT: {region}.\n"
+        f"Image layout: {layout}.\n"
+        "Report findings for this region only, noting slice positions where "
+        "relevant. Do not write an overall impression for the whole study."
+    )
+
+
+def summary_prompt(results: Sequence[PartResult], instructions: str) -> str:
+    """부분 소견을 첨부한 reduce 프롬프트 (슬랩 순서대로)"""
+    sections = []
+    for r in sorted(results, key=lambda r: r.index):
+        body = r.text.strip() if r.ok else f"(analysis failed: {r.error})"
+        sections.append(f"### Region {r.index + 1}: {r.label}\n{body}")
+    return (
+        f"{instructions}\n\n"
+        "The attached image is an overview of the whole volume. Below are partial "
+        "findings from separate readings of consecutive regions of the same CT. "
+        "Merge them into one structured report: remove duplicates, resolve "
+        "contradictions using the images, and keep findings that appear in only "
+        "one region.\n\n" + "\n\n".join(sections)
+    )
+
+
+class MapReduceAnalyzer:
+    def __init__(
+        self,
+        client: BaseLLMClient,
+        concurrency: int = 4,
+        max_retries: int = 2,
+        base_delay: float = 1.0,
+    ):
+        self.client = client
+        self.concurrency = max(1, concurrency)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+
+    def _run_part(self, index: int, part: MapPart) -> PartResult:
+        started = time.perf_counter()
+        result = PartResult(index, part.label)
+
+        def call() -> str:
+            result.attempts += 1
+            return self.client.analyze_images(part.images, part.prompt)
+
+        try:
+            result.text, _ = call_with_retry(
+                call, max_retries=self.max_retries, base_delay=self.base_delay
+            )
+        except Exception as e:
+            result.error = f"{type(e).__name__}: {e}"
+        result.elapsed_s = time.perf_counter() - started
+        return result
+
+    def map(self, parts: Sequence[MapPart]) -> Iterator[PartResult]:
+        """슬랩 요청 병렬 실행, 완료 순서대로 결과 반환
+
+        소비자가 중간에 빠져나가면 아직 시작하지 않은 요청은 취소한다.
+        """
+        pool = ThreadPoolExecutor(
+            max_workers=min(self.concurrency, max(1, len(parts))),
+            thread_name_prefix="map-reduce",
+        )
+        try:
+            futures = [pool.submit(self._run_part, i, p) for i, p in enumerate(parts)]
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def reduce(
+        self,
+        results: Sequence[PartResult],
+        images: List[bytes],
+        instructions: str,
+    ) -> str:
+        prompt = summary_prompt(results, instructions)
+        text, _ = call_with_retry(
+            lambda: self.client.analyze_images(images, prompt),
+            max_retries=self.max_retries,
+            base_delay=self.base_delay,
+        )
+        return text
+
+    def stream_reduce(
+        self,
+        results: Sequence[PartResult],
+        images: List[bytes],
+        instructions: str,
+    ) -> Iterator[str]:
+        """요약 호출 스트리밍 (재시도 없음)"""
+        prompt = summary_prompt(results, instructions)
+        yield from self.client.stream_analyze_images(images, prompt)
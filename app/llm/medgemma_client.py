@@ -4,93 +4,342 @@
   - pip install torch transformers accelerate
   - GPU VRAM 8GB+ 권장 (4B 모델 bfloat16 기준)
   - HF_TOKEN 환경변수 (gated 모델 접근용)
+
+모델 가중치는 프로세스 전역 레지스트리(``model_registry``)에 상주하며,
+클라이언트 인스턴스를 새로 만들어도 다시 로드하지 않는다.
 """
 
 import os
+import threading
+from concurrent.futures import TimeoutError as FuturesTimeout
 from io import BytesIO
-from typing import Optional
+from typing import Iterator, List, Optional, Tuple
 
 from PIL import Image
 
+from .availability import package_installed
 from .base import BaseLLMClient
+from .cpu_inference import generation_kwargs
+from .image_payload import prepare_image
+from .model_registry import get_registry
+from .prefix_cache import get_prefix_cache, split_instruction
+from .telemetry import report_usage
+
+
+def load_medgemma(model_id: str) -> Tuple[object, object]:
+    """(processor, model) 로드 — 레지스트리 로더로만 호출"""
+    import torch
+    from transformers import AutoModelForImageTextToText, AutoProcessor
+
+    from . import cpu_inference
+
+    hf_token = os.getenv("HF_TOKEN")
+    processor = AutoProcessor.from_pretrained(model_id, token=hf_token)
+
+    if cpu_inference.use_cpu_mode():
+        # GPU 없는 노드: int8 / bf16 / 스레드 / SDPA 설정 적용
+        config = cpu_inference.CPUInferenceConfig.from_env()
+        cpu_inference.configure_threads(config)
+        model = AutoModelForImageTextToText.from_pretrained(
+            model_id, token=hf_token, **cpu_inference.load_kwargs(config)
+        )
+        model = cpu_inference.optimize_for_cpu(model, config)
+        return processor, model
+
+    # CPU 모드가 아닌 경우 기존 동작 유지: CUDA면 bfloat16, 그 외(MPS / 오프로드)는 float32
+    dtype = torch.bfloat16 if torch.cuda.is_available() else torch.float32
+    model = AutoModelForImageTextToText.from_pretrained(
+        model_id,
+        torch_dtype=dtype,
+        device_map="auto",
+        token=hf_token,
+    )
+    model.eval()
+    return processor, model
+
+
+def _warm_generate(loaded: Tuple[object, object]) -> None:
+    """더미 입력으로 1토큰 생성 (커널/캐시 초기화)"""
+    import torch
+
+    processor, model = loaded
+    messages = [
+        {
+            "role": "user",
+            "content": [
+                {"type": "image", "image": Image.new("RGB", (64, 64))},
+                {"type": "text", "text": "warmup"},
+            ],
+        }
+    ]
+    inputs = processor.apply_chat_template(
+        messages,
+        add_generation_prompt=True,
+        tokenize=True,
+        return_dict=True,
+        return_tensors="pt",
+    ).to(model.device)
+    with torch.inference_mode():
+        model.generate(**inputs, max_new_tokens=1)
+
+
+def warmup_medgemma(
+    model_id: Optional[str] = None, generate: bool = True
+) -> threading.Thread:
+    """백그라운드에서 MedGemma 로드 (+ 워밍업 생성), 이미 로드/진행 중이면 무시"""
+    model_id = model_id or os.getenv("MEDGEMMA_MODEL", "google/medgemma-4b-it")
+    return get_registry().warmup(
+        model_id,
+        lambda: load_medgemma(model_id),
+        _warm_generate if generate else None,
+    )
+
+
+def build_messages(images: List[Image.Image], prompt: str) -> list:
+    """chat template 메시지 — 템플릿 지시문은 system 턴(이미지 앞), 나머지는 이미지 뒤
+
+    지시문이 매 요청 같은 위치(첫 이미지 앞)에 오므로 prefix KV 캐시가 지시문
+    전체를 재사용할 수 있다. 템플릿이 아닌 프롬프트는 [이미지, 텍스트] 그대로.
+    """
+    instruction, rest = split_instruction(prompt)
+    content = [{"type": "image", "image": image} for image in images]
+    if rest:
+        content.append({"type": "text", "text": rest})
+    messages = [{"role": "user", "content": content}]
+    if instruction is not None:
+        messages.insert(0, {"role": "system", "content": [{"type": "text", "text": instruction}]})
+    return messages
+
+
+def _cancel_criteria(cancel: threading.Event):
+    """cancel 이벤트가 설정되면 다음 토큰에서 generate 중단"""
+    from transformers import StoppingCriteria, StoppingCriteriaList
+
+    class _Cancel(StoppingCriteria):
+        def __call__(self, input_ids, scores, **kwargs) -> bool:
+            return cancel.is_set()
+
+    return StoppingCriteriaList([_Cancel()])
 
 
 class MedGemmaClient(BaseLLMClient):
+    """로컬 transformers 추론 (블로킹)
+
+    async API는 ``BaseLLMClient``의 스레드 오프로드 폴백(aanalyze /
+    astream_analyze)을 그대로 사용한다.
+    """
+
     def __init__(
         self,
         model: str = "google/medgemma-4b-it",
         max_new_tokens: int = 512,
+        batching: Optional[bool] = None,
     ):
         self._model_id = model
         self.max_new_tokens = max_new_tokens
-        self._processor = None
-        self._model = None
-
-    def _load_model(self):
-        if self._model is not None:
-            return
-
-        import torch
-        from transformers import AutoModelForImageTextToText, AutoProcessor
+        # 동적 배칭 워커 사용 여부 (기본: MEDGEMMA_BATCHING 환경변수)
+        if batching is None:
+            batching = os.getenv("MEDGEMMA_BATCHING", "").lower() in ("1", "true", "yes")
+        self.batching = batching
 
-        hf_token = os.getenv("HF_TOKEN")
-        dtype = torch.bfloat16 if torch.cuda.is_available() else torch.float32
-
-        self._processor = AutoProcessor.from_pretrained(
-            self._model_id, token=hf_token
-        )
-        self._model = AutoModelForImageTextToText.from_pretrained(
-            self._model_id,
-            torch_dtype=dtype,
-            device_map="auto",
-            token=hf_token,
+    def _lease(self):
+        """레지스트리에서 (processor, model) 임대 (최초 1회만 로드)"""
+        return get_registry().lease(
+            self._model_id, lambda: load_medgemma(self._model_id)
         )
 
     @property
     def model_name(self) -> str:
         return self._model_id
 
+    @property
+    def supports_streaming(self) -> bool:
+        # 배칭 모드에서는 동시 요청을 묶어 처리하도록 블로킹 analyze 사용
+        return not self.batching
+
     @classmethod
     def is_available(cls) -> bool:
-        try:
-            import torch  # noqa: F401
-            import transformers  # noqa: F401
-            return True
-        except ImportError:
-            return False
-
-    def analyze(self, image_bytes: bytes, prompt: str, **kwargs) -> str:
-        self._load_model()
-        import torch
+        # 설치 여부만 확인 (임포트는 실제 모델 로드 시)
+        return package_installed("torch", "transformers")
 
-        pil_image = Image.open(BytesIO(image_bytes)).convert("RGB")
-
-        messages = [
-            {
-                "role": "user",
-                "content": [
-                    {"type": "image", "image": pil_image},
-                    {"type": "text", "text": prompt},
-                ],
-            }
-        ]
-
-        inputs = self._processor.apply_chat_template(
+    def _build_inputs(self, processor, model, images: List[bytes], prompt: str):
+        prepared = [prepare_image(image_bytes, "medgemma").data for image_bytes in images]
+        report_usage(image_bytes=sum(len(data) for data in prepared))   # 로컬 추론: 원본 bytes
+        messages = build_messages(
+            [Image.open(BytesIO(data)).convert("RGB") for data in prepared], prompt
+        )
+        return processor.apply_chat_template(
             messages,
             add_generation_prompt=True,
             tokenize=True,
             return_dict=True,
             return_tensors="pt",
-        ).to(self._model.device)
+        ).to(model.device)
 
-        with torch.inference_mode():
-            output = self._model.generate(
-                **inputs,
-                max_new_tokens=self.max_new_tokens,
-            )
+    @staticmethod
+    def _image_start(processor, model, input_ids) -> Optional[int]:
+        """첫 이미지 관련 토큰 위치 (= 고정 prefix 길이)"""
+        image_token_id = getattr(model.config, "image_token_index", None)
+        if image_token_id is None:
+            image_token_id = getattr(model.config, "image_token_id", None)
+        if image_token_id is None:
+            return None
+        positions = (input_ids[0] == image_token_id).nonzero()
+        if not len(positions):
+            return None
+        start = int(positions[0])
+        boi_token = getattr(processor, "boi_token", None)
+        if boi_token is not None and start > 0:
+            tokenizer = getattr(processor, "tokenizer", processor)
+            if int(input_ids[0, start - 1]) == tokenizer.convert_tokens_to_ids(boi_token):
+                start -= 1
+        return start
+
+    def _generate_kwargs(self, processor, model, inputs) -> dict:
+        """generate 입력 — 가능하면 prefix KV 캐시를 이어붙여 suffix만 prefill
+
+        1) 첫 이미지 앞까지(템플릿 머리말 + 판독 지시문) KV: 캐시에서 사본 획득
+        2) 이미지 + 나머지 텍스트 (마지막 토큰 제외): forward 1회로 캐시 확장
+        3) generate는 캐시되지 않은 마지막 토큰부터 디코딩
+
+        static KV 캐시(CPU 모드)는 외부 past_key_values와 함께 쓸 수 없으므로
+        prefix 캐시를 쓰는 요청은 동적 캐시로 생성한다.
+        """
+        extra_kwargs = generation_kwargs(model)
+        cache = get_prefix_cache()
+        if cache is None:
+            return {**inputs, **extra_kwargs}
+        cached_kwargs = {k: v for k, v in extra_kwargs.items() if k != "cache_implementation"}
+
+        import torch
+
+        input_ids = inputs["input_ids"]
+        total = input_ids.shape[-1]
+        prefix_len = self._image_start(processor, model, input_ids)
+        if not prefix_len or input_ids.shape[0] != 1 or prefix_len >= total - 1:
+            return {**inputs, **extra_kwargs}
+
+        try:
+            past = cache.get_or_compute(self._model_id, model, input_ids[:, :prefix_len])
+            suffix = slice(prefix_len, total - 1)
+            extra = {}
+            if "token_type_ids" in inputs:
+                extra["token_type_ids"] = inputs["token_type_ids"][:, suffix]
+            with torch.inference_mode():
+                model(
+                    input_ids=input_ids[:, suffix],
+                    pixel_values=inputs["pixel_values"],
+                    attention_mask=inputs["attention_mask"][:, :total - 1],
+                    past_key_values=past,
+                    cache_position=torch.arange(prefix_len, total - 1, device=input_ids.device),
+                    use_cache=True,
+                    **extra,
+                )
+        except Exception:
+            # transformers 버전 차이 등으로 실패 시 전체 prefill로 폴백
+            return {**inputs, **extra_kwargs}
+
+        return {
+            "input_ids": input_ids,
+            "attention_mask": inputs["attention_mask"],
+            "past_key_values": past,
+            **cached_kwargs,
+        }
+
+    def analyze(self, image_bytes: bytes, prompt: str, **kwargs) -> str:
+        return self.analyze_images([image_bytes], prompt, **kwargs)
+
+    def stream_analyze(self, image_bytes: bytes, prompt: str, **kwargs) -> Iterator[str]:
+        return self.stream_analyze_images([image_bytes], prompt, **kwargs)
+
+    def analyze_images(self, images: List[bytes], prompt: str, **kwargs) -> str:
+        if self.batching and len(images) == 1:
+            from .medgemma_server import get_batching_server
 
-        input_len = inputs["input_ids"].shape[-1]
-        result = self._processor.decode(
-            output[0][input_len:], skip_special_tokens=True
+            server = get_batching_server(self._model_id)
+            future = server.submit(images[0], prompt, self.max_new_tokens)
+            timeout = float(os.getenv("MEDGEMMA_BATCH_TIMEOUT_SEC", "600"))
+            try:
+                return future.result(timeout=timeout)
+            except FuturesTimeout:
+                future.cancel()   # 아직 배치에 들어가지 않았으면 처리하지 않음
+                raise TimeoutError(f"MedGemma 배칭 응답이 {timeout:g}초 안에 오지 않았습니다")
+
+        import torch
+
+        with self._lease() as (processor, model):
+            inputs = self._build_inputs(processor, model, images, prompt)
+            generate_kwargs = self._generate_kwargs(processor, model, inputs)
+
+            with torch.inference_mode():
+                output = model.generate(
+                    **generate_kwargs,
+                    max_new_tokens=self.max_new_tokens,
+                )
+
+            input_len = inputs["input_ids"].shape[-1]
+            result = processor.decode(
+                output[0][input_len:], skip_special_tokens=True
+            )
+        report_usage(
+            prompt_tokens=int(input_len),
+            completion_tokens=int(output.shape[-1] - input_len),
         )
         return result
+
+    def stream_analyze_images(
+        self, images: List[bytes], prompt: str, **kwargs
+    ) -> Iterator[str]:
+        """백그라운드 스레드에서 generate, TextIteratorStreamer로 토큰 단위 반환
+
+        소비자가 중간에 빠져나가면(Streamlit rerun, 페이지 이동 등 GeneratorExit)
+        cancel 이벤트로 생성을 중단한다.
+        """
+        import torch
+        from transformers import TextIteratorStreamer
+
+        cancel = threading.Event()
+        errors = []
+        outputs = []
+
+        with self._lease() as (processor, model):
+            inputs = self._build_inputs(processor, model, images, prompt)
+            generate_kwargs = self._generate_kwargs(processor, model, inputs)
+            streamer = TextIteratorStreamer(
+                getattr(processor, "tokenizer", processor),
+                skip_prompt=True,
+                skip_special_tokens=True,
+            )
+
+            def run() -> None:
+                try:
+                    with torch.inference_mode():
+                        outputs.append(model.generate(
+                            **generate_kwargs,
+                            max_new_tokens=self.max_new_tokens,
+                            streamer=streamer,
+                            stopping_criteria=_cancel_criteria(cancel),
+                        ))
+                except BaseException as e:
+                    errors.append(e)
+                    streamer.end()  # 소비 루프 종료 보장
+
+            thread = threading.Thread(target=run, name="medgemma-generate", daemon=True)
+            thread.start()
+            try:
+                for text in streamer:
+                    if not text:
+                        continue
+                    yield text
+            finally:
+                cancel.set()
+                thread.join()
+
+        if errors:
+            raise errors[0]
+        if outputs:
+            input_len = inputs["input_ids"].shape[-1]
+            report_usage(
+                prompt_tokens=int(input_len),
+                completion_tokens=int(outputs[0].shape[-1] - input_len),
+            )
@@ -0,0 +1,234 @@
+"""MedGemma 동적 배칭 추론 워커
+
+여러 세션의 동시 요청을 큐에 모아 최대 대기 시간(max_wait_ms) 안에 도착한
+요청들을 패딩된 하나의 배치로 묶어 ``model.generate`` 1회로 처리하고,
+각 결과를 요청자의 Future로 돌려준다. 같은 디바이스에서 단건 generate가
+서로 충돌하며 직렬화되는 대신, 동시성에 비례해 처리량이 늘어난다.
+
+환경변수:
+  MEDGEMMA_MAX_BATCH        배치 최대 크기 (기본 4)
+  MEDGEMMA_MAX_WAIT_MS      배치 수집 최대 대기 ms (기본 50)
+  MEDGEMMA_LATENCY_SLO_MS   목표 지연 ms, 설정 시 예상 처리 시간만큼 대기 창 축소 (기본 0 = 비활성)
+  MEDGEMMA_BATCH_TIMEOUT_SEC  요청자가 결과를 기다리는 최대 시간 (기본 600)
+"""
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from io import BytesIO
+from typing import Dict, List, Optional
+
+from PIL import Image
+
+from .cpu_inference import generation_kwargs
+from .image_payload import prepare_image
+from .model_registry import get_registry
+
+
+@dataclass
+class _Request:
+    image_bytes: bytes
+    prompt: str
+    max_new_tokens: int
+    future: Future = field(default_factory=Future)
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class BatchingInferenceServer:
+    def __init__(
+        self,
+        model_id: str,
+        max_batch_size: int = 4,
+        max_wait_ms: float = 50.0,
+        latency_slo_ms: Optional[float] = None,
+    ):
+        self.model_id = model_id
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000.0
+        self.latency_slo = latency_slo_ms / 1000.0 if latency_slo_ms else None
+        self._queue: "queue.Queue[_Request]" = queue.Queue()
+        self._service_ema: Optional[float] = None  # 배치 generate 시간 지수평균
+        self._error: Optional[BaseException] = None   # 워커가 비정상 종료한 원인
+        self._worker = threading.Thread(
+            target=self._run, name=f"medgemma-batcher-{model_id}", daemon=True
+        )
+        self._worker.start()
+
+    # ── 공개 API ─────────────────────────────────────────────────────────────
+    def submit(self, image_bytes: bytes, prompt: str, max_new_tokens: int = 512) -> Future:
+        """요청 등록, 판독문 문자열을 결과로 갖는 Future 반환"""
+        request = _Request(image_bytes, prompt, max_new_tokens)
+        if not self.alive:
+            request.future.set_exception(self._dead_error())
+            return request.future
+        self._queue.put(request)
+        if not self.alive:
+            # 넣는 사이 워커가 종료됨 — 남은 요청 정리
+            self._fail_pending(self._dead_error())
+        return request.future
+
+    @property
+    def alive(self) -> bool:
+        return self._worker.is_alive()
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize(),
+            "service_ema_s": self._service_ema,
+            "max_batch_size": self.max_batch_size,
+        }
+
+    # ── 워커 ─────────────────────────────────────────────────────────────────
+    def _wait_window(self) -> float:
+        """배치 수집 대기 시간 (SLO 설정 시 예상 처리 시간을 제외한 여유만큼)"""
+        if self.latency_slo is None or self._service_ema is None:
+            return self.max_wait
+        return max(0.0, min(self.max_wait, self.latency_slo - self._service_ema))
+
+    def _collect(self) -> List[_Request]:
+        first = self._queue.get()
+        batch = [first]
+        deadline = first.enqueued_at + self._wait_window()
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    request = self._queue.get(timeout=remaining)
+                else:
+                    # 대기 창이 지나도 이미 도착한 요청은 함께 처리
+                    request = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            batch.append(request)
+        return batch
+
+    def _dead_error(self) -> RuntimeError:
+        return RuntimeError(f"MedGemma 배칭 워커가 종료되었습니다: {self._error!r}")
+
+    def _fail_pending(self, error: BaseException) -> None:
+        """큐에 남은 요청을 모두 실패 처리 (대기 중인 호출자가 무한 대기하지 않도록)"""
+        while True:
+            try:
+                request = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if request.future.set_running_or_notify_cancel():
+                request.future.set_exception(error)
+
+    def _run(self) -> None:
+        batch: List[_Request] = []
+        try:
+            self._serve(batch)
+        except BaseException as e:
+            self._error = e
+            raise
+        finally:
+            error = self._dead_error()
+            for request in batch:
+                if not request.future.done():
+                    request.future.set_exception(error)
+            self._fail_pending(error)
+
+    def _serve(self, batch: List[_Request]) -> None:
+        """배치 수집 → generate 루프 (``batch``는 처리 중인 요청, 종료 시 정리용)"""
+        while True:
+            batch.clear()
+            batch.extend(self._collect())
+            batch[:] = [r for r in batch if r.future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            try:
+                results = self._generate(batch)
+            except Exception as e:
+                if len(batch) == 1:
+                    batch[0].future.set_exception(e)
+                    continue
+                # 배치 실패 시 원인 요청만 실패하도록 단건으로 재시도
+                for request in batch:
+                    try:
+                        request.future.set_result(self._generate([request])[0])
+                    except Exception as single_error:
+                        request.future.set_exception(single_error)
+                continue
+            for request, text in zip(batch, results):
+                request.future.set_result(text)
+
+    def _generate(self, batch: List[_Request]) -> List[str]:
+        import torch
+
+        from .medgemma_client import build_messages, load_medgemma
+
+        # 단건 경로와 같은 메시지 구성 (지시문 system 턴 + 이미지 + 나머지 텍스트)
+        conversations = [
+            build_messages(
+                [Image.open(BytesIO(prepare_image(r.image_bytes, "medgemma").data)).convert("RGB")],
+                r.prompt,
+            )
+            for r in batch
+        ]
+        max_new_tokens = max(r.max_new_tokens for r in batch)
+
+        started = time.perf_counter()
+        with get_registry().lease(self.model_id, lambda: load_medgemma(self.model_id)) as (
+            processor,
+            model,
+        ):
+            # decoder-only 배치 생성은 왼쪽 패딩 — processor는 단건 / 스트리밍 경로와
+            # 공유하므로 토큰화하는 동안만 바꾸고 원래 값으로 되돌린다
+            tokenizer = getattr(processor, "tokenizer", processor)
+            padding_side = tokenizer.padding_side
+            tokenizer.padding_side = "left"
+            try:
+                inputs = processor.apply_chat_template(
+                    conversations,
+                    add_generation_prompt=True,
+                    tokenize=True,
+                    return_dict=True,
+                    return_tensors="pt",
+                    padding=True,
+                ).to(model.device)
+            finally:
+                tokenizer.padding_side = padding_side
+
+            with torch.inference_mode():
+                output = model.generate(
+                    **inputs, max_new_tokens=max_new_tokens, **generation_kwargs(model)
+                )
+
+            input_len = inputs["input_ids"].shape[-1]
+            texts = [
+                processor.decode(
+                    output[i][input_len:input_len + r.max_new_tokens],
+                    skip_special_tokens=True,
+                )
+                for i, r in enumerate(batch)
+            ]
+
+        elapsed = time.perf_counter() - started
+        self._service_ema = (
+            elapsed if self._service_ema is None else 0.8 * self._service_ema + 0.2 * elapsed
+        )
+        return texts
+
+
+_servers: Dict[str, BatchingInferenceServer] = {}
+_servers_lock = threading.Lock()
+
+
+def get_batching_server(model_id: str) -> BatchingInferenceServer:
+    """모델 id별 프로세스 전역 배칭 워커 (환경변수 설정)"""
+    with _servers_lock:
+        server = _servers.get(model_id)
+        if server is None or not server.alive:   # 워커가 죽었으면 새로 시작
+            slo = float(os.getenv("MEDGEMMA_LATENCY_SLO_MS", "0"))
+            server = BatchingInferenceServer(
+                model_id,
+                max_batch_size=int(os.getenv("MEDGEMMA_MAX_BATCH", "4")),
+                max_wait_ms=float(os.getenv("MEDGEMMA_MAX_WAIT_MS", "50")),
+                latency_slo_ms=slo or None,
+            )
+            _servers[model_id] = server
+        return server
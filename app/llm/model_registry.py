@@ -0,0 +1,231 @@
+"""프로세스 전역 모델 레지스트리 (st.cache_resource 유사, Streamlit 비의존)
+
+모델 id별로 프로세스당 1회만 로드하고 세션 간 공유한다.
+  - 키별 로드 잠금: 동시 요청이 같은 모델을 중복 로드하지 않음
+  - lease(): 사용 중인 모델은 언로드/축출 대상에서 제외
+  - max_resident: 상주 모델 수 상한 (LRU 축출)
+  - idle_timeout: 마지막 사용 후 일정 시간 지나면 백그라운드 언로드
+
+환경변수:
+  MODEL_MAX_RESIDENT       상주 모델 수 상한 (기본 1)
+  MODEL_IDLE_UNLOAD_SEC    유휴 언로드 시간 초 (기본 0 = 비활성)
+"""
+
+import gc
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+
+@dataclass
+class _Entry:
+    value: Any = None
+    loaded: bool = False
+    loaded_at: float = 0.0
+    last_used: float = 0.0
+    load_seconds: float = 0.0
+    leases: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+def _release_device_memory() -> None:
+    gc.collect()
+    torch = sys.modules.get("torch")  # torch를 새로 임포트하지 않음
+    if torch is not None and torch.cuda.is_available():
+        torch.cuda.empty_cache()
+
+
+class ModelRegistry:
+    def __init__(
+        self,
+        max_resident: Optional[int] = 1,
+        idle_timeout: Optional[float] = None,
+        reaper_interval: float = 30.0,
+    ):
+        self.max_resident = max_resident
+        self.idle_timeout = idle_timeout
+        self.reaper_interval = reaper_interval
+        self._entries: Dict[str, _Entry] = {}
+        self._lock = threading.Lock()
+        self._reaper: Optional[threading.Thread] = None
+        self._warmups: Dict[str, threading.Thread] = {}
+
+    # ── 조회 / 로드 ──────────────────────────────────────────────────────────
+    def _entry(self, key: str) -> _Entry:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = _Entry()
+                self._entries[key] = entry
+            return entry
+
+    def _ensure_loaded(self, key: str, loader: Callable[[], Any]) -> _Entry:
+        entry = self._entry(key)
+        if entry.loaded:
+            return entry
+        with entry.lock:  # 같은 키는 한 스레드만 로드, 나머지는 대기 후 재사용
+            if not entry.loaded:
+                started = time.perf_counter()
+                entry.value = loader()
+                entry.load_seconds = time.perf_counter() - started
+                entry.loaded_at = time.time()
+                entry.last_used = time.monotonic()
+                entry.loaded = True
+                self._evict_over_limit(keep=key)
+                self._start_reaper()
+        return entry
+
+    @contextmanager
+    def lease(self, key: str, loader: Callable[[], Any]) -> Iterator[Any]:
+        """모델을 (필요 시 로드하여) 사용하는 동안 축출되지 않도록 임대"""
+        while True:
+            entry = self._ensure_loaded(key, loader)
+            with self._lock:
+                # 로드 직후 다른 스레드가 언로드했을 수 있으므로 재확인
+                if entry.loaded and self._entries.get(key) is entry:
+                    entry.leases += 1
+                    entry.last_used = time.monotonic()
+                    value = entry.value
+                    break
+        try:
+            yield value
+        finally:
+            with self._lock:
+                entry.leases -= 1
+                entry.last_used = time.monotonic()
+
+    def get(self, key: str, loader: Callable[[], Any]) -> Any:
+        """모델 반환 (임대 없이, 짧은 조회용)"""
+        with self.lease(key, loader) as value:
+            return value
+
+    def is_loaded(self, key: str) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            return bool(entry and entry.loaded)
+
+    # ── 언로드 / 축출 ────────────────────────────────────────────────────────
+    def _drop_locked(self, key: str) -> bool:
+        entry = self._entries.get(key)
+        if entry is None or entry.leases > 0:
+            return False
+        del self._entries[key]
+        entry.value = None
+        entry.loaded = False
+        return True
+
+    def unload(self, key: str) -> bool:
+        """사용 중이 아니면 모델 언로드"""
+        with self._lock:
+            dropped = self._drop_locked(key)
+        if dropped:
+            _release_device_memory()
+        return dropped
+
+    def clear(self) -> None:
+        for key in list(self._entries):
+            self.unload(key)
+
+    def _evict_over_limit(self, keep: str) -> None:
+        if not self.max_resident:
+            return
+        dropped = False
+        with self._lock:
+            loaded = [
+                (e.last_used, k) for k, e in self._entries.items() if e.loaded and k != keep
+            ]
+            excess = len(loaded) + 1 - self.max_resident
+            for _, key in sorted(loaded)[:max(0, excess)]:
+                dropped = self._drop_locked(key) or dropped
+        if dropped:
+            _release_device_memory()
+
+    def unload_idle(self) -> List[str]:
+        """idle_timeout 이상 사용되지 않은 모델 언로드"""
+        if not self.idle_timeout:
+            return []
+        now = time.monotonic()
+        with self._lock:
+            idle = [
+                k for k, e in self._entries.items()
+                if e.loaded and e.leases == 0 and now - e.last_used >= self.idle_timeout
+            ]
+            dropped = [k for k in idle if self._drop_locked(k)]
+        if dropped:
+            _release_device_memory()
+        return dropped
+
+    def _start_reaper(self) -> None:
+        if not self.idle_timeout or self._reaper is not None:
+            return
+
+        def run() -> None:
+            while True:
+                time.sleep(min(self.reaper_interval, self.idle_timeout))
+                self.unload_idle()
+
+        self._reaper = threading.Thread(target=run, name="model-reaper", daemon=True)
+        self._reaper.start()
+
+    # ── 워밍업 / 상태 ────────────────────────────────────────────────────────
+    def warmup(
+        self,
+        key: str,
+        loader: Callable[[], Any],
+        warm_fn: Optional[Callable[[Any], None]] = None,
+    ) -> threading.Thread:
+        """백그라운드 스레드에서 모델 로드 (+ warm_fn 실행), 중복 요청은 무시"""
+        with self._lock:
+            thread = self._warmups.get(key)
+            if thread is not None and (thread.is_alive() or self._is_loaded_locked(key)):
+                return thread
+
+            def run() -> None:
+                with self.lease(key, loader) as value:
+                    if warm_fn is not None:
+                        warm_fn(value)
+
+            thread = threading.Thread(target=run, name=f"warmup-{key}", daemon=True)
+            self._warmups[key] = thread
+        thread.start()
+        return thread
+
+    def _is_loaded_locked(self, key: str) -> bool:
+        entry = self._entries.get(key)
+        return bool(entry and entry.loaded)
+
+    def status(self) -> List[dict]:
+        """상주 모델 정보 (디버그/UI용)"""
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    "key": k,
+                    "load_seconds": round(e.load_seconds, 2),
+                    "idle_seconds": round(now - e.last_used, 1),
+                    "leases": e.leases,
+                }
+                for k, e in self._entries.items()
+                if e.loaded
+            ]
+
+
+_registry: Optional[ModelRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> ModelRegistry:
+    """프로세스 전역 레지스트리 (환경변수 설정)"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            idle = float(os.getenv("MODEL_IDLE_UNLOAD_SEC", "0"))
+            _registry = ModelRegistry(
+                max_resident=int(os.getenv("MODEL_MAX_RESIDENT", "1")),
+                idle_timeout=idle or None,
+            )
+        return _registry
@@ -1,20 +1,53 @@
-"""Ollama 로컬 서버 클라이언트"""
+"""Ollama 로컬 서버 클라이언트
+
+``OLLAMA_HOSTS``가 설정되면 단일 ``OLLAMA_HOST`` 대신 호스트 풀
+(``ollama_pool``)에서 요청마다 호스트를 고르고, 연결 실패 시 다른 호스트로
+한 번 더 시도한다.
+"""
 
 import base64
 import json
 import os
-from typing import Iterator, List
-
-import requests
+from contextlib import contextmanager
+from typing import AsyncIterator, Iterator, List, Optional
 
+from . import transport
 from .base import BaseLLMClient
+from .image_payload import prepare_image
+from .ollama_pool import get_ollama_pool, is_connect_error, pool_hosts
+from .telemetry import report_usage
+
+DEFAULT_OLLAMA_HOST = "http://localhost:11434"
+
+# /api/tags 조회 결과 캐시 시간 (is_available / 모델 목록 / 사이드바 공유)
+TAGS_CACHE_TTL = 10.0
+
+
+def fetch_tags(host: str, timeout: float = 3.0) -> Optional[dict]:
+    """Ollama ``/api/tags`` 응답 (캐시, 실패 시 None)"""
+    return transport.get_json_cached(f"{host}/api/tags", ttl=TAGS_CACHE_TTL, timeout=timeout)
+
+
+def _report_done(data: dict, url: str) -> None:
+    """최종 응답(done)의 토큰 수 / 모델 로드 시간을 텔레메트리에 기록"""
+    load_ns = data.get("load_duration")
+    report_usage(
+        prompt_tokens=data.get("prompt_eval_count"),
+        completion_tokens=data.get("eval_count"),
+        load_s=load_ns / 1e9 if load_ns is not None else None,
+        host=url,
+    )
 
 
 class OllamaClient(BaseLLMClient):
     def __init__(self, model: str = "llava:13b", temperature: float = 0.3):
         self._model = model
         self.temperature = temperature
-        self.host = os.getenv("OLLAMA_HOST", "http://localhost:11434")
+        self.host = os.getenv("OLLAMA_HOST", DEFAULT_OLLAMA_HOST)
+        self.pool = get_ollama_pool() if pool_hosts() else None
+        self.keep_alive = (
+            self.pool.keep_alive if self.pool is not None else os.getenv("OLLAMA_KEEP_ALIVE")
+        )
 
     @property
     def model_name(self) -> str:
@@ -26,66 +59,151 @@ class OllamaClient(BaseLLMClient):
 
     @classmethod
     def is_available(cls) -> bool:
-        host = os.getenv("OLLAMA_HOST", "http://localhost:11434")
-        try:
-            resp = requests.get(f"{host}/api/tags", timeout=3)
-            return resp.status_code == 200
-        except Exception:
-            return False
+        if pool_hosts():
+            return get_ollama_pool().is_available()
+        host = os.getenv("OLLAMA_HOST", DEFAULT_OLLAMA_HOST)
+        return fetch_tags(host) is not None
 
     def get_available_models(self) -> List[str]:
-        """설치된 Ollama 모델 목록 반환"""
-        try:
-            resp = requests.get(f"{self.host}/api/tags", timeout=5)
-            if resp.status_code == 200:
-                return [m["name"] for m in resp.json().get("models", [])]
-        except Exception:
-            pass
-        return []
-
-    def _build_payload(self, image_bytes: bytes, prompt: str, stream: bool) -> dict:
-        b64 = base64.b64encode(image_bytes).decode()
-        return {
+        """설치된 Ollama 모델 목록 반환 (풀 사용 시 정상 호스트 합집합)"""
+        if self.pool is not None:
+            self.pool.is_available()  # 첫 프로브 전이면 동기 프로브
+            return self.pool.models()
+        tags = fetch_tags(self.host)
+        if not tags:
+            return []
+        return [m["name"] for m in tags.get("models", [])]
+
+    def _build_payload(self, images: List[bytes], prompt: str, stream: bool) -> dict:
+        b64_images = [
+            base64.b64encode(prepare_image(image_bytes, "ollama").data).decode()
+            for image_bytes in images
+        ]
+        report_usage(image_bytes=sum(len(b64) for b64 in b64_images))
+        payload = {
             "model": self._model,
             "messages": [
                 {
                     "role": "user",
                     "content": prompt,
-                    "images": [b64],
+                    "images": b64_images,
                 }
             ],
             "stream": stream,
             "options": {"temperature": self.temperature},
         }
+        if self.keep_alive:
+            payload["keep_alive"] = self.keep_alive
+        return payload
+
+    @contextmanager
+    def _endpoint(self, exclude=()):
+        """요청 1건의 (호스트, URL) — 풀 사용 시 호스트 임대"""
+        if self.pool is None:
+            yield None, self.host
+            return
+        with self.pool.lease(self._model, exclude) as host:
+            yield host, host.url
+
+    def _can_failover(self, host, tried: list, e: Exception) -> bool:
+        if host is None or not is_connect_error(e):
+            return False
+        tried.append(host)
+        return len(tried) < min(2, len(self.pool.hosts))
 
     def analyze(self, image_bytes: bytes, prompt: str, **kwargs) -> str:
-        payload = self._build_payload(image_bytes, prompt, stream=False)
-        resp = requests.post(
-            f"{self.host}/api/chat",
-            json=payload,
-            timeout=300,
-        )
-        resp.raise_for_status()
-        return resp.json()["message"]["content"]
+        return self.analyze_images([image_bytes], prompt, **kwargs)
 
     def stream_analyze(self, image_bytes: bytes, prompt: str, **kwargs) -> Iterator[str]:
-        payload = self._build_payload(image_bytes, prompt, stream=True)
-        with requests.post(
-            f"{self.host}/api/chat",
-            json=payload,
-            stream=True,
-            timeout=300,
-        ) as resp:
+        return self.stream_analyze_images([image_bytes], prompt, **kwargs)
+
+    def analyze_images(self, images: List[bytes], prompt: str, **kwargs) -> str:
+        payload = self._build_payload(images, prompt, stream=False)
+        tried: list = []
+        while True:
+            host = None
+            try:
+                with self._endpoint(tried) as (host, url):
+                    resp = transport.get_session().post(
+                        f"{url}/api/chat",
+                        json=payload,
+                        timeout=transport.request_timeout(),
+                    )
+                    resp.raise_for_status()
+                    data = resp.json()
+                    _report_done(data, url)
+                    return data["message"]["content"]
+            except Exception as e:
+                if not self._can_failover(host, tried, e):
+                    raise
+
+    def stream_analyze_images(
+        self, images: List[bytes], prompt: str, **kwargs
+    ) -> Iterator[str]:
+        payload = self._build_payload(images, prompt, stream=True)
+        tried: list = []
+        while True:
+            host = None
+            streamed = False
+            try:
+                with self._endpoint(tried) as (host, url):
+                    with transport.get_session().post(
+                        f"{url}/api/chat",
+                        json=payload,
+                        stream=True,
+                        timeout=transport.request_timeout(),
+                    ) as resp:
+                        resp.raise_for_status()
+                        for line in resp.iter_lines():
+                            if not line:
+                                continue
+                            try:
+                                data = json.loads(line)
+                            except json.JSONDecodeError:
+                                continue
+                            content = data.get("message", {}).get("content", "")
+                            if content:
+                                streamed = True
+                                yield content
+                            if data.get("done"):
+                                _report_done(data, url)
+                                break
+                return
+            except Exception as e:
+                # 첫 청크 이후 실패는 재시도하지 않음 (중복 출력 방지)
+                if streamed or not self._can_failover(host, tried, e):
+                    raise
+
+    async def aanalyze(self, image_bytes: bytes, prompt: str, **kwargs) -> str:
+        payload = self._build_payload([image_bytes], prompt, stream=False)
+        client = transport.get_async_httpx_client()
+        with self._endpoint() as (_, url):
+            resp = await client.post(f"{url}/api/chat", json=payload)
             resp.raise_for_status()
-            for line in resp.iter_lines():
-                if not line:
-                    continue
-                try:
-                    data = json.loads(line)
+            data = resp.json()
+            _report_done(data, url)
+            return data["message"]["content"]
+
+    async def astream_analyze(
+        self, image_bytes: bytes, prompt: str, **kwargs
+    ) -> AsyncIterator[str]:
+        payload = self._build_payload([image_bytes], prompt, stream=True)
+        client = transport.get_async_httpx_client()
+        with self._endpoint() as (_, url):
+            async with client.stream(
+                "POST", f"{url}/api/chat", json=payload
+            ) as resp:
+                resp.raise_for_status()
+                async for line in resp.aiter_lines():
+                    if not line:
+                        continue
+                    try:
+                        data = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
                     content = data.get("message", {}).get("content", "")
                     if content:
                         yield content
                     if data.get("done"):
+                        _report_done(data, url)
                         break
-                except json.JSONDecodeError:
-                    continue
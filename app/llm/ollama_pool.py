@@ -0,0 +1,297 @@
+"""다중 Ollama 호스트 풀 (모델 친화 + 최소 진행 요청 라우팅)
+
+여러 Ollama 호스트(GPU / CPU 혼재)에 판독 요청을 분산한다.
+
+라우팅 (정상 호스트 중 비용 최소, 동률이면 순환):
+  비용 = 진행 중 요청 수 + 콜드 패널티
+  - 모델이 이미 메모리에 올라간 호스트 (``/api/ps``): 패널티 0
+  - 모델만 설치된 호스트 (``/api/tags``): cold_penalty
+  - 모델이 없는 호스트: cold_penalty * 2
+  상주 호스트가 밀리면(진행 요청이 패널티만큼 많으면) 다른 호스트로 넘친다.
+
+백그라운드 프로브가 주기적으로 상태·모델 목록을 갱신하고, 최근 사용한
+모델(hot)은 ``keep_alive`` 갱신 요청으로 메모리에 계속 상주시킨다.
+
+환경변수 (``get_ollama_pool``):
+  OLLAMA_HOSTS            호스트 목록, 쉼표 구분 (없으면 OLLAMA_HOST 단일)
+  OLLAMA_PROBE_INTERVAL   프로브 주기 초 (기본 10)
+  OLLAMA_KEEP_ALIVE       모델 상주 시간 (Ollama 형식, 기본 30m)
+  OLLAMA_COLD_PENALTY     콜드 호스트 패널티 (진행 요청 수 단위, 기본 4)
+"""
+
+import itertools
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Sequence, Set
+
+from . import transport
+from .retry import get_status_code
+
+# 연속 요청 실패 시 다음 프로브까지 비정상 처리
+MAX_CONSECUTIVE_FAILURES = 2
+
+
+def keep_alive_seconds(value: str) -> Optional[float]:
+    """Ollama keep_alive 값("30m", "1h", "300", "-1") → 초 (무기한이면 None)"""
+    value = str(value).strip()
+    if value.lstrip("-").isdigit():
+        seconds = float(value)
+        return None if seconds < 0 else seconds
+    total = 0.0
+    for amount, unit in re.findall(r"(\d+(?:\.\d+)?)(ms|s|m|h)", value):
+        total += float(amount) * {"ms": 0.001, "s": 1, "m": 60, "h": 3600}[unit]
+    return total or None
+
+
+def is_connect_error(e: BaseException) -> bool:
+    """요청이 서버에 닿기 전 실패 (다른 호스트로 재시도 가능)"""
+    try:
+        import requests
+        if isinstance(e, requests.exceptions.ConnectionError):
+            return True
+    except ImportError:
+        pass
+    try:
+        import httpx
+        return isinstance(e, httpx.ConnectError)
+    except ImportError:
+        return False
+
+
+def is_host_error(e: BaseException) -> bool:
+    """호스트 상태 탓인 실패 — 연결 실패 / 타임아웃 / 5xx
+
+    4xx(없는 모델 등), JSON 파싱 오류, 호출 측 버그는 호스트 실패로 세지 않는다.
+    """
+    if is_connect_error(e):
+        return True
+    status = get_status_code(e)
+    if status is not None:
+        return status >= 500
+    try:
+        import requests
+        if isinstance(e, requests.exceptions.Timeout):
+            return True
+    except ImportError:
+        pass
+    try:
+        import httpx
+        return isinstance(e, httpx.TimeoutException)
+    except ImportError:
+        return False
+
+
+@dataclass
+class OllamaHost:
+    url: str
+    healthy: bool = True           # 첫 프로브 전에는 정상으로 가정
+    installed: Set[str] = field(default_factory=set)
+    loaded: Set[str] = field(default_factory=set)
+    outstanding: int = 0
+    failures: int = 0
+    last_probe: Optional[float] = None
+    last_used: Dict[str, float] = field(default_factory=dict)      # 모델 → 마지막 요청 시각
+    last_refresh: Dict[str, float] = field(default_factory=dict)   # 모델 → 마지막 keep_alive 갱신
+
+
+def _model_names(data: Optional[dict]) -> Set[str]:
+    if not data:
+        return set()
+    names = set()
+    for m in data.get("models", []):
+        for key in ("name", "model"):
+            if m.get(key):
+                names.add(m[key])
+    return names
+
+
+class OllamaHostPool:
+    def __init__(
+        self,
+        hosts: Sequence[str],
+        probe_interval: float = 10.0,
+        keep_alive: str = "30m",
+        probe_timeout: float = 3.0,
+        cold_penalty: float = 4.0,
+    ):
+        if not hosts:
+            raise ValueError("Ollama 호스트 목록이 비어 있습니다")
+        self.hosts: List[OllamaHost] = [OllamaHost(h.rstrip("/")) for h in hosts]
+        self.probe_interval = probe_interval
+        self.keep_alive = keep_alive
+        self.probe_timeout = probe_timeout
+        self.cold_penalty = cold_penalty
+        self._lock = threading.Lock()
+        self._rr = itertools.count()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # ── 프로브 ─────────────────────────────────────────────────────────────
+    def _get_json(self, url: str) -> Optional[dict]:
+        try:
+            resp = transport.get_session().get(
+                url, timeout=(transport.get_config().connect_timeout, self.probe_timeout)
+            )
+            return resp.json() if resp.status_code == 200 else None
+        except Exception:
+            return None
+
+    def probe_host(self, host: OllamaHost) -> None:
+        tags = self._get_json(f"{host.url}/api/tags")
+        ps = self._get_json(f"{host.url}/api/ps") if tags is not None else None
+        with self._lock:
+            host.last_probe = time.monotonic()
+            host.healthy = tags is not None
+            if tags is not None:
+                host.installed = _model_names(tags)
+                host.loaded = _model_names(ps)
+                host.failures = 0
+
+    def _refresh_keep_alive(self, host: OllamaHost) -> None:
+        """최근 사용한 모델은 keep_alive 만료 전에 갱신 (빈 generate 요청은 로드만 수행)"""
+        ttl = keep_alive_seconds(self.keep_alive)
+        if ttl is None or not host.healthy:
+            return
+        now = time.monotonic()
+        with self._lock:
+            hot = [
+                model for model, used in host.last_used.items()
+                if now - used < ttl
+                and now - max(used, host.last_refresh.get(model, 0.0)) >= ttl / 2
+            ]
+        for model in hot:
+            try:
+                transport.get_session().post(
+                    f"{host.url}/api/generate",
+                    json={"model": model, "keep_alive": self.keep_alive},
+                    timeout=transport.request_timeout(),
+                )
+                with self._lock:
+                    host.last_refresh[model] = time.monotonic()
+                    host.loaded.add(model)
+            except Exception:
+                continue
+
+    def probe_all(self) -> None:
+        for host in self.hosts:
+            self.probe_host(host)
+            self._refresh_keep_alive(host)
+
+    def start(self) -> "OllamaHostPool":
+        """백그라운드 프로브 스레드 시작 (이미 실행 중이면 무시)"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return self
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._probe_loop, name="ollama-probe", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _probe_loop(self) -> None:
+        while not self._stop.is_set():
+            self.probe_all()
+            self._stop.wait(self.probe_interval)
+
+    # ── 라우팅 ─────────────────────────────────────────────────────────────
+    def _choose_locked(self, model: str, exclude: Sequence[OllamaHost]) -> OllamaHost:
+        candidates = [h for h in self.hosts if h not in exclude]
+        if not candidates:
+            raise RuntimeError("사용 가능한 Ollama 호스트가 없습니다")
+        healthy = [h for h in candidates if h.healthy] or candidates
+        tie = next(self._rr)
+
+        def rank(item):
+            i, h = item
+            coldness = 0 if model in h.loaded else 1 if model in h.installed else 2
+            return (h.outstanding + coldness * self.cold_penalty, (i - tie) % len(healthy))
+
+        return min(enumerate(healthy), key=rank)[1]
+
+    def choose(self, model: str, exclude: Sequence[OllamaHost] = ()) -> OllamaHost:
+        """진행 요청 수 + 콜드 패널티가 가장 작은 호스트 선택"""
+        with self._lock:
+            return self._choose_locked(model, exclude)
+
+    @contextmanager
+    def lease(self, model: str, exclude: Sequence[OllamaHost] = ()) -> Iterator[OllamaHost]:
+        """요청 1건 동안 호스트 점유 (진행 요청 수 / 실패 / 모델 상주 기록)"""
+        with self._lock:
+            host = self._choose_locked(model, exclude)
+            host.outstanding += 1
+        try:
+            yield host
+        except Exception as e:
+            if is_host_error(e):
+                with self._lock:
+                    host.failures += 1
+                    if host.failures >= MAX_CONSECUTIVE_FAILURES:
+                        host.healthy = False
+            raise
+        else:
+            with self._lock:
+                host.failures = 0
+                host.loaded.add(model)
+        finally:
+            with self._lock:
+                host.outstanding -= 1
+                host.last_used[model] = time.monotonic()
+
+    # ── 조회 ───────────────────────────────────────────────────────────────
+    def is_available(self) -> bool:
+        if all(h.last_probe is None for h in self.hosts):
+            self.probe_all()
+        return any(h.healthy for h in self.hosts)
+
+    def models(self) -> List[str]:
+        """정상 호스트에 설치된 모델 합집합"""
+        with self._lock:
+            return sorted(set().union(*(h.installed for h in self.hosts if h.healthy)))
+
+    def snapshot(self) -> List[dict]:
+        with self._lock:
+            return [
+                {
+                    "url": h.url,
+                    "healthy": h.healthy,
+                    "outstanding": h.outstanding,
+                    "loaded": sorted(h.loaded),
+                    "installed": len(h.installed),
+                }
+                for h in self.hosts
+            ]
+
+
+_pool: Optional[OllamaHostPool] = None
+_pool_key: Optional[tuple] = None
+_pool_lock = threading.Lock()
+
+
+def pool_hosts() -> List[str]:
+    """OLLAMA_HOSTS 호스트 목록 (미설정 시 빈 목록)"""
+    raw = os.getenv("OLLAMA_HOSTS", "")
+    return [h.strip() for h in raw.split(",") if h.strip()]
+
+
+def get_ollama_pool(hosts: Optional[Sequence[str]] = None) -> OllamaHostPool:
+    """프로세스 전역 호스트 풀 (최초 호출 시 백그라운드 프로브 시작)"""
+    global _pool, _pool_key
+    hosts = tuple(hosts or pool_hosts())
+    with _pool_lock:
+        if _pool is None or _pool_key != hosts:
+            if _pool is not None:
+                _pool.stop()
+            _pool = OllamaHostPool(
+                hosts,
+                probe_interval=float(os.getenv("OLLAMA_PROBE_INTERVAL", "10")),
+                keep_alive=os.getenv("OLLAMA_KEEP_ALIVE", "30m"),
+                cold_penalty=float(os.getenv("OLLAMA_COLD_PENALTY", "4")),
+            ).start()
+            _pool_key = hosts
+        return _pool
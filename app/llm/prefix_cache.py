@@ -0,0 +1,115 @@
+"""판독 지시문 prefix KV 캐시 (MedGemma)
+
+판독 템플릿(``PROMPT_TEMPLATES``)은 긴 고정 지시문을 공유한다. 프롬프트가
+템플릿으로 시작하면 지시문을 system 턴으로 분리해 이미지보다 앞에 두고
+(``split_instruction``), 사용자가 덧붙인 임상 정보 등 나머지 텍스트는 원래처럼
+이미지 뒤에 둔다. 첫 이미지 앞까지(chat template 머리말 + 지시문)의 key/value
+상태를 모델별로 한 번만 계산해 두고 요청마다 복사해 재사용하므로, 요청별로는
+이미지 토큰과 나머지 텍스트만 새로 prefill 한다.
+
+환경변수:
+  MEDGEMMA_PREFIX_CACHE_MB   캐시 메모리 상한 MB (기본 256, 0 = 비활성)
+"""
+
+import copy
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+
+def _cache_nbytes(past_key_values) -> int:
+    """KV 캐시 텐서 총 바이트 수"""
+    total = 0
+    for layer in getattr(past_key_values, "layers", None) or []:
+        for name in ("keys", "values"):
+            tensor = getattr(layer, name, None)
+            if tensor is not None:
+                total += tensor.numel() * tensor.element_size()
+    if total:
+        return total
+    # 구버전 DynamicCache (key_cache / value_cache 리스트)
+    for name in ("key_cache", "value_cache"):
+        for tensor in getattr(past_key_values, name, []) or []:
+            total += tensor.numel() * tensor.element_size()
+    return total
+
+
+class PrefixKVCache:
+    """(모델 id, prefix 토큰) → prefill된 KV 캐시, 메모리 상한 LRU"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple, Tuple[object, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, model_id: str, model, prefix_ids):
+        """prefix_ids (1 x P) 에 대한 KV 캐시 사본 반환 (없으면 prefill 후 저장)"""
+        import torch
+
+        key = (model_id, tuple(prefix_ids[0].tolist()))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(entry[0])
+            self.misses += 1
+
+        with torch.inference_mode():
+            out = model(input_ids=prefix_ids, use_cache=True)
+        past = out.past_key_values
+        size = _cache_nbytes(past)
+
+        with self._lock:
+            if size <= self.max_bytes and key not in self._entries:
+                self._entries[key] = (past, size)
+                self._bytes += size
+                while self._bytes > self.max_bytes and self._entries:
+                    _, (_, evicted) = self._entries.popitem(last=False)
+                    self._bytes -= evicted
+        return copy.deepcopy(past)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+def split_instruction(prompt: str) -> Tuple[Optional[str], str]:
+    """프롬프트 → (템플릿 지시문, 나머지 텍스트), 템플릿으로 시작하지 않으면 (None, 프롬프트)"""
+    from utils.prompt_templates import PROMPT_TEMPLATES
+
+    for template in sorted(PROMPT_TEMPLATES.values(), key=len, reverse=True):
+        if prompt.startswith(template):
+            return template, prompt[len(template):].strip()
+    return None, prompt
+
+
+_cache: Optional[PrefixKVCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_prefix_cache() -> Optional[PrefixKVCache]:
+    """프로세스 전역 prefix 캐시 (MEDGEMMA_PREFIX_CACHE_MB=0 이면 None)"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            mb = float(os.getenv("MEDGEMMA_PREFIX_CACHE_MB", "256"))
+            if mb <= 0:
+                return None
+            _cache = PrefixKVCache(int(mb * 1024 * 1024))
+        return _cache
+
@@ -0,0 +1,101 @@
+"""공급자별 동시성 제한 + 토큰 버킷 속도 제한 (프로세스 전역)"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+
+class TokenBucket:
+    """초당 rate개 토큰 충전, 최대 burst개 보관"""
+
+    def __init__(self, rate: float, burst: float = 1.0):
+        if rate <= 0:
+            raise ValueError("rate는 0보다 커야 합니다.")
+        self.rate = float(rate)
+        self.capacity = max(float(burst), 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens: float = 1.0, timeout: Optional[float] = None) -> bool:
+        """토큰 확보까지 대기 (timeout 초과 시 False)"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return True
+                wait = (tokens - self._tokens) / self.rate
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+
+class ProviderLimiter:
+    """동시 요청 수(semaphore) + 요청 속도(token bucket) 제한"""
+
+    def __init__(
+        self,
+        concurrency: int = 4,
+        rate: Optional[float] = None,
+        burst: float = 1.0,
+    ):
+        self.concurrency = max(1, int(concurrency))
+        self._semaphore = threading.BoundedSemaphore(self.concurrency)
+        self.bucket = TokenBucket(rate, burst) if rate else None
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """동시성 슬롯 확보 후 속도 제한 토큰 소비"""
+        with self._semaphore:
+            if self.bucket is not None:
+                self.bucket.acquire()
+            yield
+
+
+# 공급자 기본 제한값 (concurrency, 초당 요청 수)
+DEFAULT_PROVIDER_LIMITS: Dict[str, tuple] = {
+    "GPT": (8, 5.0),
+    "Gemini": (4, 2.0),
+    "Ollama": (2, None),
+    "MedGemma": (1, None),
+    "Fake": (16, None),
+}
+
+_limiters: Dict[str, ProviderLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_provider_limiter(
+    provider: str,
+    concurrency: Optional[int] = None,
+    rate: Optional[float] = None,
+    burst: Optional[float] = None,
+) -> ProviderLimiter:
+    """공급자별 프로세스 전역 limiter
+
+    설정값 없이 호출하면 기존 limiter(없으면 기본값)를 공유하고,
+    설정값을 주면 해당 공급자의 limiter를 새 설정으로 교체한다.
+    """
+    explicit = any(v is not None for v in (concurrency, rate, burst))
+    with _limiters_lock:
+        limiter = _limiters.get(provider)
+        if limiter is None or explicit:
+            default_conc, default_rate = DEFAULT_PROVIDER_LIMITS.get(provider, (4, None))
+            limiter = ProviderLimiter(
+                concurrency=concurrency or default_conc,
+                rate=rate if rate is not None else default_rate,
+                burst=burst if burst is not None else 1.0,
+            )
+            _limiters[provider] = limiter
+        return limiter
@@ -0,0 +1,101 @@
+"""LLM 호출 재시도 (429 / 5xx / 연결 오류, 지수 백오프 + jitter)"""
+
+import contextvars
+import random
+import time
+from typing import Callable, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# 현재 call_with_retry 시도 번호 (1부터, 호출 텔레메트리에서 읽음)
+current_attempt: contextvars.ContextVar[int] = contextvars.ContextVar(
+    "llm_retry_attempt", default=1
+)
+
+RETRYABLE_STATUS = {408, 409, 425, 429, 500, 502, 503, 504}
+
+# SDK별 상태 코드 없는 일시적 오류 (클래스 이름 기준, SDK 임포트 회피)
+_TRANSIENT_ERROR_NAMES = {
+    "APIConnectionError",
+    "APITimeoutError",
+    "ConnectionError",
+    "ConnectTimeout",
+    "ReadTimeout",
+    "Timeout",
+    "TimeoutError",
+    "ServiceUnavailable",
+    "DeadlineExceeded",
+    "ConnectError",
+    "RemoteProtocolError",
+}
+
+
+def get_status_code(exc: BaseException) -> Optional[int]:
+    """예외에서 HTTP 상태 코드 추출 (openai / google / requests / httpx 공통)"""
+    for attr in ("status_code", "code", "status"):
+        value = getattr(exc, attr, None)
+        if isinstance(value, int) and 100 <= value < 600:
+            return int(value)
+    response = getattr(exc, "response", None)
+    if response is not None:
+        value = getattr(response, "status_code", None)
+        if isinstance(value, int):
+            return value
+    return None
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """재시도 가능한 오류 여부"""
+    status = get_status_code(exc)
+    if status is not None:
+        return status in RETRYABLE_STATUS
+    return any(cls.__name__ in _TRANSIENT_ERROR_NAMES for cls in type(exc).__mro__)
+
+
+def retry_after_seconds(exc: BaseException) -> Optional[float]:
+    """응답 헤더의 Retry-After(초) 값"""
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    try:
+        return max(0.0, float(headers.get("retry-after")))
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 60.0) -> float:
+    """attempt(0부터)번째 재시도 대기 시간 (full jitter)"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def call_with_retry(
+    fn: Callable[[], T],
+    max_retries: int = 5,
+    base_delay: float = 1.0,
+    max_delay: float = 60.0,
+    on_retry: Optional[Callable[[int, BaseException, float], None]] = None,
+) -> Tuple[T, int]:
+    """fn() 호출, 재시도 가능한 오류는 백오프 후 재시도
+
+    Returns:
+        (결과, 시도 횟수)
+    """
+    attempt = 0
+    while True:
+        token = current_attempt.set(attempt + 1)
+        try:
+            return fn(), attempt + 1
+        except Exception as e:
+            if attempt >= max_retries or not is_retryable(e):
+                raise
+            delay = retry_after_seconds(e)
+            if delay is None:
+                delay = backoff_delay(attempt, base_delay, max_delay)
+            delay = min(delay, max_delay)
+            if on_retry is not None:
+                on_retry(attempt + 1, e, delay)
+            time.sleep(delay)
+            attempt += 1
+        finally:
+            current_attempt.reset(token)
@@ -0,0 +1,370 @@
+"""지연 인식 공급자 라우터 (hedged request + circuit breaker)
+
+순서가 정해진 백엔드 목록 위에서 ``BaseLLMClient``를 구현한다.
+
+  - 백엔드별 최근 TTFT / 오류율을 롤링 윈도우로 기록
+  - 첫 토큰이 TTFT 백분위 기한(기본 p95) 안에 오지 않으면 다음 백엔드에
+    같은 요청을 한 번 더 보내고(hedge), 먼저 첫 토큰을 낸 쪽을 채택
+  - 첫 토큰 전에 실패하면 즉시 다음 백엔드로 전환 (failover)
+  - 연속 실패한 백엔드는 회로를 열어 일정 시간 제외, 이후 1건으로 재시험
+
+환경변수 (``get_router``):
+  LLM_ROUTER_BACKENDS         공급자 이름 목록, 우선순위 순 (예: "GPT,Gemini,Ollama")
+  LLM_ROUTER_HEDGE_PERCENTILE hedge 기한 TTFT 백분위 (기본 95)
+  LLM_ROUTER_MAX_HEDGES       요청당 최대 hedge 수 (기본 1)
+  LLM_ROUTER_FAILURES         회로를 여는 연속 실패 수 (기본 5)
+  LLM_ROUTER_RESET_SEC        회로 열림 유지 시간 (기본 30)
+"""
+
+import os
+import queue
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional, Sequence
+
+from core.profiling import percentile
+
+from .base import BaseLLMClient
+
+
+class BackendStats:
+    """롤링 윈도우 TTFT / 성공·실패 기록 (스레드 안전)"""
+
+    def __init__(self, window: int = 100):
+        self._ttfts: deque = deque(maxlen=window)
+        self._outcomes: deque = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record_ttft(self, seconds: float) -> None:
+        with self._lock:
+            self._ttfts.append(seconds)
+
+    def record_outcome(self, ok: bool) -> None:
+        with self._lock:
+            self._outcomes.append(ok)
+
+    @property
+    def samples(self) -> int:
+        return len(self._ttfts)
+
+    def percentile(self, p: float) -> Optional[float]:
+        """TTFT 백분위 (nearest-rank), 기록 없으면 None"""
+        with self._lock:
+            values = list(self._ttfts)
+        return percentile(values, p)
+
+    def error_rate(self) -> Optional[float]:
+        with self._lock:
+            outcomes = list(self._outcomes)
+        if not outcomes:
+            return None
+        return 1 - sum(outcomes) / len(outcomes)
+
+
+class CircuitBreaker:
+    """연속 실패 기반 회로 차단기 (closed → open → half-open)"""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if time.monotonic() - self._opened_at >= self.reset_timeout:
+                return "half-open"
+            return "open"
+
+    def allow(self) -> bool:
+        """요청 허용 여부 — half-open에서는 재시험 요청 1건만 허용"""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < self.reset_timeout or self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._probing or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._probing = False
+
+    def release(self) -> None:
+        """재시험 요청이 결과 없이 취소된 경우 다음 요청이 재시험하도록 해제"""
+        with self._lock:
+            self._probing = False
+
+
+@dataclass
+class Backend:
+    name: str
+    client: BaseLLMClient
+    stats: BackendStats
+    breaker: CircuitBreaker
+
+
+@dataclass
+class _Attempt:
+    backend: Backend
+    started: float
+    cancel: threading.Event = field(default_factory=threading.Event)
+    first_token: Optional[float] = None
+
+
+class RouterClient(BaseLLMClient):
+    def __init__(
+        self,
+        backends: Dict[str, BaseLLMClient],
+        hedge_percentile: float = 95.0,
+        max_hedges: int = 1,
+        min_samples: int = 10,
+        default_hedge_delay: float = 3.0,
+        min_hedge_delay: float = 0.3,
+        window: int = 100,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+    ):
+        if not backends:
+            raise ValueError("라우터 백엔드가 비어 있습니다")
+        self.backends: List[Backend] = [
+            Backend(name, client, BackendStats(window),
+                    CircuitBreaker(failure_threshold, reset_timeout))
+            for name, client in backends.items()
+        ]
+        self.hedge_percentile = hedge_percentile
+        self.max_hedges = max_hedges
+        self.min_samples = min_samples
+        self.default_hedge_delay = default_hedge_delay
+        self.min_hedge_delay = min_hedge_delay
+
+    @property
+    def model_name(self) -> str:
+        return "router(" + ", ".join(
+            f"{b.name}:{b.client.model_name}" for b in self.backends
+        ) + ")"
+
+    @property
+    def supports_streaming(self) -> bool:
+        return True
+
+    def hedge_delay(self, backend: Backend) -> float:
+        """hedge 기한 — 기록이 충분하면 TTFT 백분위, 아니면 기본값"""
+        if backend.stats.samples < self.min_samples:
+            return self.default_hedge_delay
+        return max(self.min_hedge_delay, backend.stats.percentile(self.hedge_percentile))
+
+    def status(self) -> List[dict]:
+        """백엔드별 상태 (UI / 디버그 표시용)"""
+        return [
+            {
+                "name": b.name,
+                "model": b.client.model_name,
+                "circuit": b.breaker.state,
+                "samples": b.stats.samples,
+                "ttft_p50": b.stats.percentile(50),
+                "ttft_p95": b.stats.percentile(95),
+                "error_rate": b.stats.error_rate(),
+            }
+            for b in self.backends
+        ]
+
+    def analyze(self, image_bytes: bytes, prompt: str, **kwargs) -> str:
+        return self.analyze_images([image_bytes], prompt, **kwargs)
+
+    def stream_analyze(self, image_bytes: bytes, prompt: str, **kwargs) -> Iterator[str]:
+        return self.stream_analyze_images([image_bytes], prompt, **kwargs)
+
+    def analyze_images(self, images: List[bytes], prompt: str, **kwargs) -> str:
+        return "".join(self.stream_analyze_images(images, prompt, **kwargs))
+
+    def _worker(self, attempt: _Attempt, events: queue.Queue, images, prompt, kwargs) -> None:
+        backend = attempt.backend
+        client = backend.client
+        try:
+            if client.supports_streaming:
+                chunks = client.stream_analyze_images(images, prompt, **kwargs)
+            else:
+                chunks = iter([client.analyze_images(images, prompt, **kwargs)])
+            try:
+                for chunk in chunks:
+                    # hedge에서 진 요청도 첫 토큰 시간은 기록 (느린 백엔드 표본 누락 방지)
+                    if chunk and attempt.first_token is None:
+                        attempt.first_token = time.perf_counter()
+                        backend.stats.record_ttft(attempt.first_token - attempt.started)
+                    if attempt.cancel.is_set():
+                        break
+                    if not chunk:
+                        continue
+                    events.put((attempt, "chunk", chunk))
+            finally:
+                close = getattr(chunks, "close", None)
+                if close is not None:
+                    close()
+        except Exception as e:
+            if attempt.cancel.is_set():
+                backend.breaker.release()
+            else:
+                backend.stats.record_outcome(False)
+                backend.breaker.record_failure()
+            events.put((attempt, "error", e))
+            return
+
+        if attempt.cancel.is_set():
+            # hedge에서 진 요청: 첫 토큰 기록은 남기되 성패는 판단하지 않음
+            backend.breaker.release()
+        else:
+            backend.stats.record_outcome(True)
+            backend.breaker.record_success()
+        events.put((attempt, "done", None))
+
+    def stream_analyze_images(
+        self,
+        images: List[bytes],
+        prompt: str,
+        on_route: Optional[Callable[[dict], None]] = None,
+        **kwargs,
+    ) -> Iterator[str]:
+        """첫 토큰을 낸 백엔드의 스트림을 그대로 전달
+
+        ``on_route``가 주어지면 첫 토큰 시점에 요청 경로(백엔드, hedge 여부,
+        시도 순서, TTFT)를 넘긴다. 라우터는 세션 간에 공유되므로 경로는
+        인스턴스에 저장하지 않고 요청마다 콜백으로만 전달한다.
+        """
+        events: queue.Queue = queue.Queue()
+        attempts: List[_Attempt] = []
+        remaining = iter(self.backends)
+        started = time.perf_counter()
+
+        def launch() -> Optional[_Attempt]:
+            for backend in remaining:
+                if not backend.breaker.allow():
+                    continue
+                attempt = _Attempt(backend, time.perf_counter())
+                attempts.append(attempt)
+                threading.Thread(
+                    target=self._worker,
+                    args=(attempt, events, images, prompt, kwargs),
+                    name=f"router-{backend.name}",
+                    daemon=True,
+                ).start()
+                return attempt
+            return None
+
+        current = launch()
+        if current is None:
+            raise RuntimeError("사용 가능한 LLM 백엔드가 없습니다 (모든 회로 열림)")
+
+        hedges = 0
+        live = 1
+        winner: Optional[_Attempt] = None
+        deadline = current.started + self.hedge_delay(current.backend)
+        last_error: Optional[Exception] = None
+
+        try:
+            while True:
+                timeout = None
+                if winner is None and hedges < self.max_hedges:
+                    timeout = max(0.0, deadline - time.perf_counter())
+                try:
+                    attempt, kind, payload = events.get(timeout=timeout)
+                except queue.Empty:
+                    # 기한 초과: 다음 백엔드에 hedge 요청
+                    hedges += 1
+                    hedge = launch()
+                    if hedge is not None:
+                        live += 1
+                        deadline = hedge.started + self.hedge_delay(hedge.backend)
+                    continue
+
+                if winner is not None:
+                    if attempt is not winner:
+                        continue
+                    if kind == "chunk":
+                        yield payload
+                        continue
+                    if kind == "error":
+                        raise payload
+                    return
+
+                if kind == "chunk":
+                    winner = attempt
+                    for other in attempts:
+                        if other is not winner:
+                            other.cancel.set()
+                    if on_route is not None:
+                        on_route({
+                            "backend": winner.backend.name,
+                            "hedged": hedges > 0,
+                            "attempts": [a.backend.name for a in attempts],
+                            "ttft": time.perf_counter() - started,
+                        })
+                    yield payload
+                    continue
+
+                live -= 1
+                if kind == "done":
+                    # 빈 응답으로 정상 종료
+                    return
+                last_error = payload
+                if live == 0:
+                    # 첫 토큰 전 실패: 남은 백엔드로 즉시 전환
+                    failover = launch()
+                    if failover is None:
+                        raise last_error
+                    live += 1
+                    deadline = failover.started + self.hedge_delay(failover.backend)
+        finally:
+            for attempt in attempts:
+                attempt.cancel.set()
+
+
+_router: Optional[RouterClient] = None
+_router_key: Optional[tuple] = None
+_router_lock = threading.Lock()
+
+
+def router_backends() -> List[str]:
+    """LLM_ROUTER_BACKENDS에 지정된 공급자 이름 목록"""
+    raw = os.getenv("LLM_ROUTER_BACKENDS", "")
+    return [name.strip() for name in raw.split(",") if name.strip()]
+
+
+def get_router(providers: Optional[Sequence[str]] = None) -> RouterClient:
+    """프로세스 전역 라우터 (rerun / 세션 간 TTFT 통계·회로 상태 공유)
+
+    백엔드 목록이 바뀌면 새 라우터로 교체한다.
+    """
+    global _router, _router_key
+    from .factory import create_default_client
+
+    providers = tuple(providers or router_backends())
+    if not providers:
+        raise ValueError("LLM_ROUTER_BACKENDS가 설정되지 않았습니다")
+    with _router_lock:
+        if _router is None or _router_key != providers:
+            _router = RouterClient(
+                {name: create_default_client(name) for name in providers},
+                hedge_percentile=float(os.getenv("LLM_ROUTER_HEDGE_PERCENTILE", "95")),
+                max_hedges=int(os.getenv("LLM_ROUTER_MAX_HEDGES", "1")),
+                failure_threshold=int(os.getenv("LLM_ROUTER_FAILURES", "5")),
+                reset_timeout=float(os.getenv("LLM_ROUTER_RESET_SEC", "30")),
+            )
+            _router_key = providers
+        return _router
@@ -0,0 +1,209 @@
+"""확정된 뷰의 사전(speculative) 판독
+
+Viewer에서 현재 뷰 이미지가 debounce 시간 동안 바뀌지 않으면, 사용자가
+LLM 페이지에서 버튼을 누르기 전에 기본 템플릿 · 기본 공급자로 판독을
+백그라운드 작업(``jobs``)으로 미리 시작한다. 결과는 (이미지, 프롬프트,
+공급자, 모델, 생성 파라미터) 키로 캐시되며, 같은 조건으로 판독을 요청하면
+새로 호출하지 않고 진행 중이거나 끝난 작업에 연결한다.
+
+비용 보호:
+  - 사용자가 켠 경우에만 동작 (opt-in), 공급자는 LLM_SPECULATIVE_PROVIDER
+  - 사용자당 시간당 사전 판독 수 상한, 사용자당 진행 중 사전 판독 1건
+  - 뷰가 바뀌면 채택되지 않은 이전 사전 판독은 즉시 취소
+
+환경변수:
+  LLM_SPECULATIVE_PROVIDER       사전 판독 공급자 (예: GPT), 비우면 기능 비활성
+  LLM_SPECULATIVE_DEBOUNCE_SEC   뷰 확정으로 보는 무변경 시간 (기본 3)
+  LLM_SPECULATIVE_MAX_PER_HOUR   사용자당 시간당 사전 판독 상한 (기본 10)
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional, Tuple
+
+from .base import BaseLLMClient
+from .jobs import CANCELLED, ERROR, Job, JobManager, get_job_manager
+
+# (client, prompt) 를 만드는 함수 — 타이머가 만료될 때만 호출 (클라이언트 생성 지연)
+RequestFactory = Callable[[], Tuple[BaseLLMClient, str]]
+
+# 키 → 작업 캐시 크기
+CACHE_SIZE = 64
+
+
+# 결과에 영향을 주는 클라이언트 생성 파라미터 (텔레메트리 래퍼는 내부 클라이언트로 위임)
+GENERATION_PARAMS = ("temperature", "max_tokens", "max_new_tokens")
+
+
+def generation_params(client: BaseLLMClient) -> Dict[str, object]:
+    return {
+        name: getattr(client, name)
+        for name in GENERATION_PARAMS
+        if getattr(client, name, None) is not None
+    }
+
+
+def speculation_key(image_bytes: bytes, prompt: str, provider: str, client: BaseLLMClient) -> str:
+    params = json.dumps(generation_params(client), sort_keys=True)
+    h = hashlib.sha256()
+    for part in (
+        image_bytes, prompt.encode(), provider.encode(), client.model_name.encode(), params.encode()
+    ):
+        h.update(hashlib.sha256(part).digest())
+    return h.hexdigest()
+
+
+@dataclass
+class _UserState:
+    image_hash: Optional[str] = None
+    timer: Optional[threading.Timer] = None
+    job: Optional[Job] = None          # 채택 전 사전 판독
+    started: deque = field(default_factory=deque)   # 사전 판독 시작 시각 (1시간 창)
+
+
+class SpeculativeAnalyzer:
+    def __init__(
+        self,
+        manager: JobManager,
+        provider: str,
+        debounce_sec: float = 3.0,
+        max_per_hour: int = 10,
+    ):
+        self.manager = manager
+        self.provider = provider
+        self.debounce_sec = debounce_sec
+        self.max_per_hour = max_per_hour
+        self._users: Dict[str, _UserState] = {}
+        self._cache: "OrderedDict[str, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"started": 0, "hits": 0, "cancelled": 0, "skipped_budget": 0, "failed": 0}
+
+    def observe(self, owner: str, image_bytes: Optional[bytes], make_request: RequestFactory) -> None:
+        """현재 뷰 이미지 통지 — 바뀌었으면 이전 사전 판독 취소 후 debounce 타이머 재시작"""
+        image_hash = hashlib.sha256(image_bytes).hexdigest() if image_bytes else None
+        with self._lock:
+            state = self._users.setdefault(owner, _UserState())
+            if image_hash == state.image_hash:
+                return
+            state.image_hash = image_hash
+            self._cancel_stale_locked(state)
+            if image_hash is None:
+                return
+            state.timer = threading.Timer(
+                self.debounce_sec, self._fire, args=(owner, image_hash, image_bytes, make_request)
+            )
+            state.timer.daemon = True
+            state.timer.start()
+
+    def stop(self, owner: str) -> None:
+        """사용자가 기능을 끈 경우: 대기 타이머와 채택 전 사전 판독 취소"""
+        with self._lock:
+            state = self._users.get(owner)
+            if state is not None:
+                state.image_hash = None
+                self._cancel_stale_locked(state)
+
+    def _cancel_stale_locked(self, state: _UserState) -> None:
+        if state.timer is not None:
+            state.timer.cancel()
+            state.timer = None
+        if state.job is not None:
+            if self.manager.cancel(state.job.id):
+                self.stats["cancelled"] += 1
+            state.job = None
+
+    def _fire(self, owner: str, image_hash: str, image_bytes: bytes, make_request: RequestFactory) -> None:
+        now = time.monotonic()
+        with self._lock:
+            state = self._users.get(owner)
+            if state is None or state.image_hash != image_hash or state.job is not None:
+                return
+            while state.started and now - state.started[0] > 3600:
+                state.started.popleft()
+            if len(state.started) >= self.max_per_hour:
+                self.stats["skipped_budget"] += 1
+                return
+            state.started.append(now)
+
+        try:
+            client, prompt = make_request()
+            key = speculation_key(image_bytes, prompt, self.provider, client)
+            with self._lock:
+                if key in self._cache and self._cache[key].status not in (ERROR, CANCELLED):
+                    state.started.pop()   # 이미 캐시된 뷰 (되돌아온 경우) — 비용 없음
+                    return
+            # 사전 판독은 별도 소유자로 실행해 사용자 작업 상한을 차지하지 않음
+            job = self.manager.submit_analysis(
+                f"{owner}:speculative", client, [image_bytes], prompt,
+                label=f"{self.provider} · {client.model_name} (사전 판독)",
+            )
+        except Exception:
+            # 작업이 시작되지 않았으므로 예산을 돌려주고 실패만 기록
+            with self._lock:
+                if state.started and state.started[-1] == now:
+                    state.started.pop()
+                self.stats["failed"] += 1
+            return
+
+        with self._lock:
+            if state.image_hash != image_hash:
+                # 제출 사이에 뷰가 바뀜
+                self.manager.cancel(job.id)
+                return
+            state.job = job
+            self._cache[key] = job
+            self._cache.move_to_end(key)
+            while len(self._cache) > CACHE_SIZE:
+                self._cache.popitem(last=False)
+            self.stats["started"] += 1
+
+    def claim(
+        self, owner: str, image_bytes: bytes, prompt: str, provider: str, client: BaseLLMClient
+    ) -> Optional[Job]:
+        """같은 조건(모델 · 생성 파라미터 포함)의 사전 판독이 있으면 채택 (사용자 작업 목록으로 이동)"""
+        if provider != self.provider:
+            return None
+        key = speculation_key(image_bytes, prompt, provider, client)
+        with self._lock:
+            job = self._cache.get(key)
+            if job is None or job.status in (ERROR, CANCELLED):
+                return None
+            if job.owner not in (owner, f"{owner}:speculative"):
+                return None   # 다른 사용자의 사전 판독은 공유하지 않음
+            state = self._users.get(owner)
+            if state is not None and state.job is job:
+                state.job = None   # 채택된 작업은 뷰가 바뀌어도 취소하지 않음
+            self.manager.reassign(job, owner)
+            job.label = job.label.replace(" (사전 판독)", " (사전 판독 채택)")
+            self.stats["hits"] += 1
+            return job
+
+
+_analyzer: Optional[SpeculativeAnalyzer] = None
+_analyzer_lock = threading.Lock()
+
+
+def speculative_provider() -> Optional[str]:
+    return os.getenv("LLM_SPECULATIVE_PROVIDER") or None
+
+
+def get_speculative_analyzer() -> Optional[SpeculativeAnalyzer]:
+    """프로세스 전역 사전 판독기 (LLM_SPECULATIVE_PROVIDER 미설정 시 None)"""
+    global _analyzer
+    provider = speculative_provider()
+    if provider is None:
+        return None
+    with _analyzer_lock:
+        if _analyzer is None or _analyzer.provider != provider:
+            _analyzer = SpeculativeAnalyzer(
+                get_job_manager(),
+                provider,
+                debounce_sec=float(os.getenv("LLM_SPECULATIVE_DEBOUNCE_SEC", "3")),
+                max_per_hour=int(os.getenv("LLM_SPECULATIVE_MAX_PER_HOUR", "10")),
+            )
+        return _analyzer
@@ -0,0 +1,96 @@
+"""스트리밍 응답 지표 (요청 1건 단위)
+
+첫 토큰까지 시간(TTFT), 생성 속도, 청크 간 간격을 기록한다. 청크 도착
+시각만 사용하므로 어느 클라이언트의 스트림에도 붙일 수 있다.
+
+토큰 수는 공급자마다 청크 크기가 달라(토큰 1개 ~ 문장 단위) 청크 수 대신
+문자 수 / ``CHARS_PER_TOKEN`` 으로 추정한다.
+"""
+
+import math
+import time
+from typing import List, Optional
+
+from core.profiling import percentile
+
+# 토큰 수 추정용 평균 문자 수 (영문 기준, 한국어는 과대 추정)
+CHARS_PER_TOKEN = 4
+
+
+class StreamMetrics:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.first_chunk: Optional[float] = None
+        self.last_chunk: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.chunks = 0
+        self.chars = 0
+        self.gaps: List[float] = []      # 청크 간 간격 (초)
+
+    def record(self, chunk: str) -> None:
+        now = time.perf_counter()
+        if self.first_chunk is None:
+            self.first_chunk = now
+        else:
+            self.gaps.append(now - self.last_chunk)
+        self.last_chunk = now
+        self.chunks += 1
+        self.chars += len(chunk)
+
+    def finish(self) -> "StreamMetrics":
+        if self.finished is None:
+            self.finished = time.perf_counter()
+        return self
+
+    @property
+    def ttft_s(self) -> Optional[float]:
+        return None if self.first_chunk is None else self.first_chunk - self.started
+
+    @property
+    def total_s(self) -> float:
+        return (self.finished or time.perf_counter()) - self.started
+
+    @property
+    def approx_tokens(self) -> int:
+        return math.ceil(self.chars / CHARS_PER_TOKEN)
+
+    @property
+    def tokens_per_s(self) -> Optional[float]:
+        """첫 토큰 이후 생성 속도 (청크가 2개 이상일 때)"""
+        if self.chunks < 2:
+            return None
+        span = self.last_chunk - self.first_chunk
+        return self.approx_tokens / span if span > 0 else None
+
+    def gap_percentile(self, p: float) -> Optional[float]:
+        return percentile(self.gaps, p)
+
+    def as_dict(self) -> dict:
+        return {
+            "ttft_s": self.ttft_s,
+            "total_s": self.total_s,
+            "chunks": self.chunks,
+            "chars": self.chars,
+            "approx_tokens": self.approx_tokens,
+            "tokens_per_s": self.tokens_per_s,
+            "gap_p50_s": self.gap_percentile(50),
+            "gap_p95_s": self.gap_percentile(95),
+            "gap_max_s": max(self.gaps) if self.gaps else None,
+        }
+
+    def describe(self) -> str:
+        """판독문 아래 표시용 한 줄 요약"""
+        parts = []
+        if self.ttft_s is not None:
+            parts.append(f"첫 토큰 {self.ttft_s:.2f}s")
+        parts.append(f"전체 {self.total_s:.2f}s")
+        if self.tokens_per_s is not None:
+            parts.append(f"약 {self.tokens_per_s:.0f} tok/s")
+        if self.gaps:
+            parts.append(
+                f"청크 간격 p50 {self.gap_percentile(50) * 1000:.0f}ms / "
+                f"p95 {self.gap_percentile(95) * 1000:.0f}ms / "
+                f"최대 {max(self.gaps) * 1000:.0f}ms"
+            )
+        parts.append(f"청크 {self.chunks}개 · {self.chars:,}자")
+        return " · ".join(parts)
@@ -0,0 +1,521 @@
+"""LLM 호출 텔레메트리 (공급자별 지연 · 토큰 · 전송량 · 비용)
+
+``instrument(client, provider)``로 감싼 클라이언트의 모든 호출(analyze /
+stream / async)을 1건씩 ``CallRecord``로 기록한다.
+
+  - 프로세스 전역 최근 기록 (``get_telemetry_store``, 최대 ``maxlen``건)
+  - 선택적 로컬 싱크: ``*.jsonl`` 또는 ``*.db`` / ``*.sqlite`` (SQLite)
+  - 공급자 · 모델별 요약: 지연 / TTFT 백분위, 오류율, 재시도, 토큰, tok/s, 비용
+
+토큰 수와 전송 이미지 크기는 클라이언트가 호출 중 ``report_usage``로 알려준
+공급자 보고값을 사용한다 (보고가 없으면 비어 있음). Ollama / MedGemma 용량
+계획을 위해 호스트와 모델 로드 시간도 함께 남긴다.
+
+환경변수:
+  LLM_TELEMETRY        1(기본) | 0 (계측 끔)
+  LLM_TELEMETRY_SINK   기록을 누적할 파일 경로 (.jsonl / .db)
+  LLM_PRICES           모델별 단가 덮어쓰기 JSON, 100만 토큰당 USD
+                       예: {"gpt-4o": [2.5, 10]}
+
+Usage (app/ 디렉터리에서, 싱크 파일 요약):
+    python -m llm.telemetry logs/llm_calls.jsonl
+"""
+
+import contextvars
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, fields
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+from core.profiling import percentile
+
+from .base import BaseLLMClient
+from .retry import current_attempt, get_status_code
+
+# 모델 이름 접두사 → (입력, 출력) USD / 100만 토큰. 로컬 모델은 0
+PRICES: Dict[str, Tuple[float, float]] = {
+    "gpt-4o-mini": (0.15, 0.6),
+    "gpt-4o": (2.5, 10.0),
+    "gemini-1.5-flash": (0.075, 0.3),
+    "gemini-1.5-pro": (1.25, 5.0),
+    "gemini-2.0-flash": (0.1, 0.4),
+}
+
+LOCAL_PROVIDERS = ("MedGemma", "Ollama", "Fake")
+
+
+@dataclass
+class CallRecord:
+    ts: float
+    provider: str
+    model: str
+    op: str                              # analyze / stream / aanalyze / astream
+    images: int
+    prompt_chars: int
+    image_bytes: Optional[int] = None    # 전송 이미지 크기 합 (base64 기준)
+    prompt_tokens: Optional[int] = None
+    completion_tokens: Optional[int] = None
+    output_chars: int = 0
+    ttft_s: Optional[float] = None
+    latency_s: float = 0.0
+    ok: bool = True
+    cancelled: bool = False              # 소비자가 스트림을 중간에 닫음
+    error_class: Optional[str] = None
+    status_code: Optional[int] = None
+    attempt: int = 1                     # call_with_retry 시도 번호
+    host: Optional[str] = None           # Ollama 응답 호스트
+    load_s: Optional[float] = None       # 모델 로드 시간 (Ollama load_duration)
+
+
+# ── 클라이언트 → 텔레메트리 사용량 보고 ─────────────────────────────────────────
+_usage: contextvars.ContextVar[Optional[dict]] = contextvars.ContextVar(
+    "llm_call_usage", default=None
+)
+
+_USAGE_FIELDS = {"image_bytes", "prompt_tokens", "completion_tokens", "host", "load_s"}
+
+
+def report_usage(**values) -> None:
+    """현재 계측 중인 호출에 사용량 기록 (계측 밖이면 무시)
+
+    같은 호출 중 여러 번 불러도 되며, None 값은 무시한다.
+    """
+    usage = _usage.get()
+    if usage is not None:
+        usage.update({k: v for k, v in values.items() if v is not None and k in _USAGE_FIELDS})
+
+
+def base64_size(n: int) -> int:
+    """n bytes를 base64로 인코딩한 길이"""
+    return 4 * ((n + 2) // 3)
+
+
+# ── 가격 ─────────────────────────────────────────────────────────────────────
+def _load_prices() -> Dict[str, Tuple[float, float]]:
+    prices = dict(PRICES)
+    override = os.getenv("LLM_PRICES")
+    if override:
+        try:
+            prices.update({k: (float(v[0]), float(v[1])) for k, v in json.loads(override).items()})
+        except (ValueError, TypeError, IndexError, AttributeError):
+            pass
+    return prices
+
+
+def price_for(provider: str, model: str) -> Optional[Tuple[float, float]]:
+    """(입력, 출력) USD / 100만 토큰 — 가장 긴 접두사 일치, 로컬은 0, 모르면 None"""
+    if provider in LOCAL_PROVIDERS:
+        return (0.0, 0.0)
+    prices = _load_prices()
+    matches = [key for key in prices if model.startswith(key)]
+    return prices[max(matches, key=len)] if matches else None
+
+
+def cost_usd(record: CallRecord) -> Optional[float]:
+    price = price_for(record.provider, record.model)
+    if price is None or record.prompt_tokens is None:
+        return None
+    return (
+        record.prompt_tokens * price[0] + (record.completion_tokens or 0) * price[1]
+    ) / 1_000_000
+
+
+# ── 싱크 ─────────────────────────────────────────────────────────────────────
+class JsonlSink:
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._repair_tail()
+
+    def _repair_tail(self) -> None:
+        # 기록 도중 중단되어 마지막 줄이 개행 없이 끝난 경우 다음 레코드와 붙지 않도록 개행 보정
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            return
+        with open(self.path, "rb+") as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                f.write(b"\n")
+
+    def write(self, record: CallRecord) -> None:
+        line = json.dumps(asdict(record), ensure_ascii=False)
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+    def read(self) -> List[CallRecord]:
+        """기록 순회 (중단 / 동시 기록으로 깨진 줄은 무시)"""
+        if not os.path.exists(self.path):
+            return []
+        records = []
+        with open(self.path, encoding="utf-8", errors="replace") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    records.append(CallRecord(**json.loads(line)))
+                except (json.JSONDecodeError, TypeError):
+                    continue
+        return records
+
+
+class SqliteSink:
+    _COLUMNS = [f.name for f in fields(CallRecord)]
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS llm_calls ({', '.join(self._COLUMNS)})"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=5.0)
+
+    def write(self, record: CallRecord) -> None:
+        row = asdict(record)
+        placeholders = ", ".join("?" for _ in self._COLUMNS)
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                f"INSERT INTO llm_calls VALUES ({placeholders})",
+                [row[c] for c in self._COLUMNS],
+            )
+
+    def read(self) -> List[CallRecord]:
+        if not os.path.exists(self.path):
+            return []
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT {', '.join(self._COLUMNS)} FROM llm_calls ORDER BY ts"
+            ).fetchall()
+        records = []
+        for row in rows:
+            values = dict(zip(self._COLUMNS, row))
+            values["ok"], values["cancelled"] = bool(values["ok"]), bool(values["cancelled"])
+            records.append(CallRecord(**values))
+        return records
+
+
+def open_sink(path: str):
+    """확장자로 싱크 선택 (.db / .sqlite / .sqlite3 → SQLite, 그 외 JSONL)"""
+    if path.endswith((".db", ".sqlite", ".sqlite3")):
+        return SqliteSink(path)
+    return JsonlSink(path)
+
+
+# ── 저장소 / 요약 ────────────────────────────────────────────────────────────
+def summarize(records: List[CallRecord]) -> List[dict]:
+    """공급자 · 모델별 요약 (호출 수 내림차순)"""
+    groups: Dict[Tuple[str, str], List[CallRecord]] = {}
+    for r in records:
+        groups.setdefault((r.provider, r.model), []).append(r)
+
+    rows = []
+    for (provider, model), group in groups.items():
+        done = [r for r in group if r.ok and not r.cancelled]
+        latencies = [r.latency_s for r in done]
+        ttfts = [r.ttft_s for r in done if r.ttft_s is not None]
+        image_bytes = [r.image_bytes for r in group if r.image_bytes is not None]
+        completion = [r for r in done if r.completion_tokens is not None and r.latency_s > 0]
+        costs = [c for c in (cost_usd(r) for r in group) if c is not None]
+        errors: Dict[str, int] = {}
+        for r in group:
+            if not r.ok:
+                errors[r.error_class] = errors.get(r.error_class, 0) + 1
+        rows.append({
+            "provider": provider,
+            "model": model,
+            "count": len(group),
+            "error_rate": sum(not r.ok for r in group) / len(group),
+            "cancelled": sum(r.cancelled for r in group),
+            "retries": sum(r.attempt > 1 for r in group),
+            "latency_p50_s": percentile(latencies, 50),
+            "latency_p95_s": percentile(latencies, 95),
+            "latency_p99_s": percentile(latencies, 99),
+            "ttft_p50_s": percentile(ttfts, 50),
+            "ttft_p95_s": percentile(ttfts, 95),
+            "image_kb_mean": (sum(image_bytes) / len(image_bytes) / 1024) if image_bytes else None,
+            "prompt_tokens": sum(r.prompt_tokens or 0 for r in group),
+            "completion_tokens": sum(r.completion_tokens or 0 for r in group),
+            "tokens_per_s": (
+                sum(r.completion_tokens for r in completion) / sum(r.latency_s for r in completion)
+                if completion else None
+            ),
+            "cost_usd": sum(costs) if costs else None,
+            "error_classes": errors,
+        })
+    return sorted(rows, key=lambda r: -r["count"])
+
+
+class TelemetryStore:
+    """최근 호출 기록 (프로세스 전역, 스레드 안전)"""
+
+    def __init__(self, maxlen: int = 5000, sink=None):
+        self._records: deque = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+        self.sink = sink
+
+    def add(self, record: CallRecord) -> None:
+        with self._lock:
+            self._records.append(record)
+        if self.sink is not None:
+            try:
+                self.sink.write(record)
+            except Exception:
+                pass  # 싱크 실패가 판독을 막지 않도록
+
+    def records(self) -> List[CallRecord]:
+        with self._lock:
+            return list(self._records)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._records.clear()
+
+    def summary(self) -> List[dict]:
+        return summarize(self.records())
+
+
+_store: Optional[TelemetryStore] = None
+_store_lock = threading.Lock()
+
+
+def telemetry_enabled() -> bool:
+    return os.getenv("LLM_TELEMETRY", "1").lower() not in ("0", "false", "no")
+
+
+def get_telemetry_store() -> TelemetryStore:
+    """프로세스 전역 저장소 (LLM_TELEMETRY_SINK 설정 시 파일에도 누적)"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            path = os.getenv("LLM_TELEMETRY_SINK")
+            _store = TelemetryStore(sink=open_sink(path) if path else None)
+        return _store
+
+
+# ── 계측 래퍼 ────────────────────────────────────────────────────────────────
+class _Call:
+    """호출 1건 측정 — usage는 클라이언트의 report_usage가 채운다"""
+
+    def __init__(self, provider: str, model: str, op: str, images: List[bytes], prompt: str):
+        self.started = time.perf_counter()
+        self.record = CallRecord(
+            ts=time.time(), provider=provider, model=model, op=op,
+            images=len(images), prompt_chars=len(prompt), attempt=current_attempt.get(),
+        )
+        self.usage: dict = {}
+
+    def chunk(self, text: str) -> None:
+        if text and self.record.ttft_s is None:
+            self.record.ttft_s = time.perf_counter() - self.started
+        self.record.output_chars += len(text or "")
+
+    def finish(self, error: Optional[BaseException] = None, cancelled: bool = False) -> CallRecord:
+        r = self.record
+        r.latency_s = time.perf_counter() - self.started
+        for key, value in self.usage.items():
+            setattr(r, key, value)
+        r.cancelled = cancelled
+        if error is not None:
+            r.ok = False
+            r.error_class = type(error).__name__
+            r.status_code = get_status_code(error)
+        get_telemetry_store().add(r)
+        return r
+
+
+class TelemetryClient(BaseLLMClient):
+    """클라이언트 호출을 ``CallRecord``로 기록하는 래퍼
+
+    그 밖의 속성(``get_available_models``, ``pool`` 등)은 내부 클라이언트로
+    위임한다.
+    """
+
+    def __init__(self, client: BaseLLMClient, provider: str):
+        self.client = client
+        self.provider = provider
+
+    def __getattr__(self, name):
+        if name == "client":
+            raise AttributeError(name)
+        return getattr(self.client, name)
+
+    @property
+    def model_name(self) -> str:
+        return self.client.model_name
+
+    @property
+    def supports_streaming(self) -> bool:
+        return self.client.supports_streaming
+
+    def is_available(self) -> bool:
+        return self.client.is_available()
+
+    def _start(self, op: str, images: List[bytes], prompt: str) -> _Call:
+        return _Call(self.provider, self.client.model_name, op, images, prompt)
+
+    def _call(self, op: str, images: List[bytes], prompt: str, fn) -> str:
+        call = self._start(op, images, prompt)
+        token = _usage.set(call.usage)
+        try:
+            text = fn()
+        except BaseException as e:
+            call.finish(error=e)
+            raise
+        finally:
+            _usage.reset(token)
+        call.record.output_chars = len(text or "")   # 블로킹 호출은 TTFT 없음
+        call.finish()
+        return text
+
+    def _stream(self, op: str, images: List[bytes], prompt: str, make) -> Iterator[str]:
+        call = self._start(op, images, prompt)
+        # 매 next()마다 usage 컨텍스트를 설정 (같은 스레드에서 여러 스트림을 번갈아 소비해도 안전)
+        token = _usage.set(call.usage)
+        try:
+            chunks = iter(make())
+        except BaseException as e:
+            call.finish(error=e)
+            raise
+        finally:
+            _usage.reset(token)
+
+        while True:
+            token = _usage.set(call.usage)
+            try:
+                chunk = next(chunks)
+            except StopIteration:
+                call.finish()
+                return
+            except BaseException as e:
+                call.finish(error=e)
+                raise
+            finally:
+                _usage.reset(token)
+            call.chunk(chunk)
+            try:
+                yield chunk
+            except GeneratorExit:
+                close = getattr(chunks, "close", None)
+                if close is not None:
+                    close()
+                call.finish(cancelled=True)
+                raise
+
+    def analyze(self, image_bytes: bytes, prompt: str, **kwargs) -> str:
+        return self._call(
+            "analyze", [image_bytes], prompt,
+            lambda: self.client.analyze(image_bytes, prompt, **kwargs),
+        )
+
+    def analyze_images(self, images: List[bytes], prompt: str, **kwargs) -> str:
+        return self._call(
+            "analyze", images, prompt,
+            lambda: self.client.analyze_images(images, prompt, **kwargs),
+        )
+
+    def stream_analyze(self, image_bytes: bytes, prompt: str, **kwargs) -> Iterator[str]:
+        return self._stream(
+            "stream", [image_bytes], prompt,
+            lambda: self.client.stream_analyze(image_bytes, prompt, **kwargs),
+        )
+
+    def stream_analyze_images(
+        self, images: List[bytes], prompt: str, **kwargs
+    ) -> Iterator[str]:
+        return self._stream(
+            "stream", images, prompt,
+            lambda: self.client.stream_analyze_images(images, prompt, **kwargs),
+        )
+
+    async def aanalyze(self, image_bytes: bytes, prompt: str, **kwargs) -> str:
+        call = self._start("aanalyze", [image_bytes], prompt)
+        # 코루틴은 태스크 컨텍스트에서 실행 — to_thread 폴백도 컨텍스트를 복사해 usage 공유
+        token = _usage.set(call.usage)
+        try:
+            text = await self.client.aanalyze(image_bytes, prompt, **kwargs)
+        except BaseException as e:
+            call.finish(error=e)
+            raise
+        finally:
+            _usage.reset(token)
+        call.record.output_chars = len(text or "")
+        call.finish()
+        return text
+
+    async def astream_analyze(
+        self, image_bytes: bytes, prompt: str, **kwargs
+    ) -> AsyncIterator[str]:
+        call = self._start("astream", [image_bytes], prompt)
+        chunks = self.client.astream_analyze(image_bytes, prompt, **kwargs).__aiter__()
+        while True:
+            token = _usage.set(call.usage)
+            try:
+                chunk = await chunks.__anext__()
+            except StopAsyncIteration:
+                call.finish()
+                return
+            except BaseException as e:
+                call.finish(error=e)
+                raise
+            finally:
+                _usage.reset(token)
+            call.chunk(chunk)
+            try:
+                yield chunk
+            except GeneratorExit:
+                aclose = getattr(chunks, "aclose", None)
+                if aclose is not None:
+                    await aclose()
+                call.finish(cancelled=True)
+                raise
+
+
+def instrument(client: BaseLLMClient, provider: str) -> BaseLLMClient:
+    """호출 텔레메트리 래퍼 (LLM_TELEMETRY=0이거나 이미 감싼 경우 그대로)"""
+    if not telemetry_enabled() or isinstance(client, TelemetryClient):
+        return client
+    return TelemetryClient(client, provider)
+
+
+# ── CLI: 싱크 파일 요약 ──────────────────────────────────────────────────────
+def _fmt(value, scale: float = 1.0, digits: int = 2) -> str:
+    return "-" if value is None else f"{value * scale:.{digits}f}"
+
+
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    path = argv[0] if argv else os.getenv("LLM_TELEMETRY_SINK")
+    if not path:
+        print("Usage: python -m llm.telemetry <sink.jsonl|sink.db>")
+        return 2
+    rows = summarize(open_sink(path).read())
+    if not rows:
+        print("기록 없음")
+        return 0
+    print(f"{'공급자':<10} {'모델':<28} {'호출':>5} {'오류율':>6} {'재시도':>5} "
+          f"{'p50 s':>7} {'p95 s':>7} {'p99 s':>7} {'TTFT95':>7} {'img KB':>7} "
+          f"{'입력 tok':>9} {'출력 tok':>9} {'tok/s':>6} {'USD':>8}")
+    for r in rows:
+        print(f"{r['provider']:<10} {r['model'][:28]:<28} {r['count']:>5} "
+              f"{r['error_rate']:>6.1%} {r['retries']:>5} "
+              f"{_fmt(r['latency_p50_s']):>7} {_fmt(r['latency_p95_s']):>7} "
+              f"{_fmt(r['latency_p99_s']):>7} {_fmt(r['ttft_p95_s']):>7} "
+              f"{_fmt(r['image_kb_mean'], digits=0):>7} {r['prompt_tokens']:>9} "
+              f"{r['completion_tokens']:>9} {_fmt(r['tokens_per_s'], digits=1):>6} "
+              f"{_fmt(r['cost_usd'], digits=4):>8}")
+        if r["error_classes"]:
+            print(f"{'':<10} 오류: " + ", ".join(f"{k}×{v}" for k, v in r["error_classes"].items()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
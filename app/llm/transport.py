@@ -0,0 +1,256 @@
+"""프로세스 전역 HTTP 전송 계층 (keep-alive 커넥션 풀 공유)
+
+클라이언트 인스턴스나 Streamlit 세션이 새로 만들어져도 커넥션 풀과 SDK
+클라이언트는 프로세스 단위로 재사용되어 반복 호출 시 TCP/TLS 연결 비용이 없다.
+
+환경변수:
+  LLM_POOL_CONNECTIONS   호스트별 풀 개수 (기본 10)
+  LLM_POOL_MAXSIZE       풀당 최대 커넥션 수 (기본 32)
+  LLM_CONNECT_TIMEOUT    연결 타임아웃 초 (기본 5)
+  LLM_READ_TIMEOUT       응답 타임아웃 초 (기본 300)
+  LLM_KEEPALIVE_EXPIRY   유휴 커넥션 유지 시간 초 (기본 60)
+  GEMINI_API_ENDPOINT    Gemini REST 엔드포인트 (기본: SDK 기본 gRPC 엔드포인트)
+"""
+
+import asyncio
+import os
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class TransportConfig:
+    pool_connections: int = 10
+    pool_maxsize: int = 32
+    connect_timeout: float = 5.0
+    read_timeout: float = 300.0
+    keepalive_expiry: float = 60.0
+
+    @classmethod
+    def from_env(cls) -> "TransportConfig":
+        return cls(
+            pool_connections=int(os.getenv("LLM_POOL_CONNECTIONS", cls.pool_connections)),
+            pool_maxsize=int(os.getenv("LLM_POOL_MAXSIZE", cls.pool_maxsize)),
+            connect_timeout=float(os.getenv("LLM_CONNECT_TIMEOUT", cls.connect_timeout)),
+            read_timeout=float(os.getenv("LLM_READ_TIMEOUT", cls.read_timeout)),
+            keepalive_expiry=float(os.getenv("LLM_KEEPALIVE_EXPIRY", cls.keepalive_expiry)),
+        )
+
+
+_lock = threading.RLock()
+_config: Optional[TransportConfig] = None
+_session = None
+_httpx_client = None
+_async_httpx_clients: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_async_sdk_clients: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_sdk_clients: Dict[Tuple, Any] = {}
+_genai_config: Optional[Tuple[str, Optional[str]]] = None   # 현재 적용된 (api_key, endpoint)
+_json_cache: Dict[str, Tuple[float, Any]] = {}
+
+
+def get_config() -> TransportConfig:
+    global _config
+    with _lock:
+        if _config is None:
+            _config = TransportConfig.from_env()
+        return _config
+
+
+def _close_async_client(loop, client) -> None:
+    """다른 루프에 묶인 AsyncClient 닫기 (실행 중이면 그 루프에 예약)"""
+    if loop.is_closed():
+        return
+    try:
+        if loop.is_running():
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+        else:
+            loop.run_until_complete(client.aclose())
+    except Exception:
+        pass
+
+
+def configure(config: TransportConfig) -> None:
+    """전송 설정 변경 (기존 풀은 닫고 다음 사용 시 재생성)"""
+    global _config, _session, _httpx_client, _genai_config
+    with _lock:
+        _config = config
+        if _session is not None:
+            _session.close()
+            _session = None
+        if _httpx_client is not None:
+            _httpx_client.close()
+            _httpx_client = None
+        async_clients = list(_async_httpx_clients.items())
+        _async_httpx_clients.clear()
+        _async_sdk_clients.clear()
+        _sdk_clients.clear()
+        _genai_config = None
+    for loop, client in async_clients:
+        _close_async_client(loop, client)
+
+
+async def aclose_async_clients() -> None:
+    """현재 이벤트 루프의 공유 AsyncClient 닫기
+
+    ``asyncio.run`` 등으로 만든 루프를 끝내기 전에 호출한다 (루프가 사라지면
+    약한 참조만 지워지고 커넥션은 닫히지 않음).
+    """
+    loop = asyncio.get_running_loop()
+    with _lock:
+        client = _async_httpx_clients.pop(loop, None)
+        _async_sdk_clients.pop(loop, None)
+    if client is not None:
+        await client.aclose()
+
+
+def request_timeout() -> Tuple[float, float]:
+    """requests용 (connect, read) 타임아웃"""
+    cfg = get_config()
+    return cfg.connect_timeout, cfg.read_timeout
+
+
+def get_session():
+    """공유 requests.Session (HTTPAdapter 커넥션 풀)"""
+    global _session
+    with _lock:
+        if _session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            cfg = get_config()
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=cfg.pool_connections,
+                pool_maxsize=cfg.pool_maxsize,
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _session = session
+        return _session
+
+
+def _httpx_limits_and_timeout():
+    import httpx
+
+    cfg = get_config()
+    limits = httpx.Limits(
+        max_connections=cfg.pool_connections * cfg.pool_maxsize,
+        max_keepalive_connections=cfg.pool_maxsize,
+        keepalive_expiry=cfg.keepalive_expiry,
+    )
+    timeout = httpx.Timeout(cfg.read_timeout, connect=cfg.connect_timeout)
+    return limits, timeout
+
+
+def get_httpx_client():
+    """공유 동기 httpx.Client"""
+    global _httpx_client
+    with _lock:
+        if _httpx_client is None:
+            import httpx
+
+            limits, timeout = _httpx_limits_and_timeout()
+            _httpx_client = httpx.Client(limits=limits, timeout=timeout)
+        return _httpx_client
+
+
+def get_async_httpx_client():
+    """현재 이벤트 루프 전용 공유 httpx.AsyncClient
+
+    AsyncClient는 생성된 이벤트 루프에 묶이므로 루프별로 하나씩 유지한다.
+    """
+    import httpx
+
+    loop = asyncio.get_running_loop()
+    with _lock:
+        client = _async_httpx_clients.get(loop)
+        if client is None:
+            limits, timeout = _httpx_limits_and_timeout()
+            client = httpx.AsyncClient(limits=limits, timeout=timeout)
+            _async_httpx_clients[loop] = client
+        return client
+
+
+def get_openai_client(api_key: str, base_url: Optional[str] = None):
+    """(api_key, base_url)별 공유 OpenAI 클라이언트"""
+    key = ("openai", api_key, base_url)
+    with _lock:
+        client = _sdk_clients.get(key)
+        if client is None:
+            from openai import OpenAI
+
+            client = OpenAI(
+                api_key=api_key, base_url=base_url, http_client=get_httpx_client()
+            )
+            _sdk_clients[key] = client
+        return client
+
+
+def get_async_openai_client(api_key: str, base_url: Optional[str] = None):
+    """(api_key, base_url, 이벤트 루프)별 공유 AsyncOpenAI 클라이언트"""
+    loop = asyncio.get_running_loop()
+    key = ("openai-async", api_key, base_url)
+    with _lock:
+        clients = _async_sdk_clients.setdefault(loop, {})
+        client = clients.get(key)
+        if client is None:
+            from openai import AsyncOpenAI
+
+            client = AsyncOpenAI(
+                api_key=api_key,
+                base_url=base_url,
+                http_client=get_async_httpx_client(),
+            )
+            clients[key] = client
+        return client
+
+
+def genai_endpoint() -> Optional[str]:
+    """Gemini REST 엔드포인트 (설정 시 gRPC 대신 REST 전송)"""
+    return os.getenv("GEMINI_API_ENDPOINT") or None
+
+
+def get_genai(api_key: str):
+    """API 키로 configure된 google.generativeai 모듈 (gRPC 채널 재사용)
+
+    ``GEMINI_API_ENDPOINT``가 설정되면 REST 전송으로 해당 엔드포인트에 연결한다
+    (프록시 / 로컬 가짜 서버, ``http://`` 지원). ``genai.configure``는 모듈
+    전역 설정이라 동시에 하나의 (키, 엔드포인트)만 유효하다 — 같은 설정이면
+    다시 configure하지 않고, 바뀌면 전역 설정을 교체한다.
+    """
+    global _genai_config
+    import google.generativeai as genai
+
+    config = (api_key, genai_endpoint())
+    with _lock:
+        if _genai_config != config:
+            options = {}
+            if config[1]:
+                options = {"transport": "rest", "client_options": {"api_endpoint": config[1]}}
+            genai.configure(api_key=api_key, **options)
+            _genai_config = config
+        return genai
+
+
+def get_json_cached(url: str, ttl: float = 10.0, timeout: float = 3.0) -> Optional[Any]:
+    """GET 응답 JSON을 ttl초 동안 캐시 (실패 시 None, 실패도 캐시)
+
+    Ollama ``/api/tags`` 같은 상태 조회를 여러 곳에서 반복 호출해도
+    ttl 동안 실제 요청은 1회만 발생한다.
+    """
+    now = time.monotonic()
+    with _lock:
+        cached = _json_cache.get(url)
+        if cached is not None and now - cached[0] < ttl:
+            return cached[1]
+    try:
+        resp = get_session().get(url, timeout=(get_config().connect_timeout, timeout))
+        data = resp.json() if resp.status_code == 200 else None
+    except Exception:
+        data = None
+    with _lock:
+        _json_cache[url] = (time.monotonic(), data)
+    return data
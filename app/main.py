@@ -1,5 +1,9 @@
+import os
+
 import streamlit as st
 
+from utils.warmup import start_warmup
+
 st.set_page_config(
     page_title="Medical Readings",
     page_icon="🏥",
@@ -20,6 +24,14 @@ for key, val in _defaults.items():
     if key not in st.session_state:
         st.session_state[key] = val
 
+# MedGemma 사전 로드 (프로세스당 1회, 백그라운드)
+if os.getenv("MEDGEMMA_WARMUP", "").lower() in ("1", "true", "yes"):
+    from llm.medgemma_client import warmup_medgemma
+    warmup_medgemma()
+
+# 무거운 모듈 사전 임포트 / 초기화 (APP_WARMUP, 프로세스당 1회, 백그라운드)
+start_warmup()
+
 # ── 홈 페이지 ──────────────────────────────────────────────────────────────────
 st.title("Medical Readings")
 st.markdown("#### AI 기반 의료 영상 판독 서비스")
@@ -7,8 +7,13 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import streamlit as st
 
 from components.ct_viewer import render_ct_viewer
+from components.debug_panel import begin_rerun, render_debug_panel
 from components.xray_viewer import render_xray_viewer
 from core.dicom_loader import load_nifti, load_xray
+from llm.speculative import get_speculative_analyzer
+from utils.prompt_templates import DEFAULT_TEMPLATE, PROMPT_TEMPLATES
+from utils.session import user_id
+from utils.warmup import start_warmup
 
 st.set_page_config(
     page_title="Viewer - Medical Readings",
@@ -23,10 +28,17 @@ for key, val in {
     "ct_volume": None,
     "ct_spacing": None,
     "current_image_bytes": None,
+    "speculative_enabled": False,
 }.items():
     if key not in st.session_state:
         st.session_state[key] = val
 
+# 직접 이 페이지로 진입한 경우에도 워밍업 시작 (APP_WARMUP, 프로세스당 1회)
+start_warmup()
+
+# 단계별 지연 계측 (세션 레지스트리 연결, 패널은 페이지 끝에서 표시)
+begin_rerun()
+
 # ── 페이지 헤더 ──────────────────────────────────────────────────────────────
 st.title("Medical Image Viewer")
 
@@ -108,3 +120,42 @@ else:
 if st.session_state.get("current_image_bytes"):
     st.markdown("---")
     st.success("현재 뷰 이미지가 저장되었습니다. LLM Analysis 페이지에서 판독을 요청하세요.")
+
+# ── 사전 판독 (opt-in) ───────────────────────────────────────────────────────
+# 뷰가 debounce 시간 동안 바뀌지 않으면 기본 템플릿으로 백그라운드 판독을 미리
+# 시작 → LLM 페이지에서 같은 조건으로 요청하면 그 작업에 바로 연결
+speculative = get_speculative_analyzer()
+if speculative is not None:
+    enabled = st.checkbox(
+        f"사전 판독 ({speculative.provider}, 기본 템플릿)",
+        key="speculative_enabled",
+        help=(
+            f"뷰가 {speculative.debounce_sec:g}초 동안 바뀌지 않으면 판독을 미리 시작합니다. "
+            f"시간당 최대 {speculative.max_per_hour}회, 뷰를 바꾸면 이전 사전 판독은 취소됩니다."
+        ),
+    )
+    view_modality = st.session_state.get("modality")
+    if enabled and view_modality in DEFAULT_TEMPLATE:
+        from llm.factory import create_client
+
+        provider = speculative.provider
+        template = PROMPT_TEMPLATES[DEFAULT_TEMPLATE[view_modality]]
+        # LLM 페이지에서 고른 모델 / 파라미터 (방문 전이면 페이지 기본값 = 클라이언트 기본값)
+        params = dict(st.session_state.get("llm_client_params", {}).get(provider) or {})
+        if provider == "Ollama" and "model" not in params:
+            # 페이지 기본값은 설치된 첫 모델 (없으면 클라이언트 기본 llava:13b)
+            from llm.availability import get_availability_service
+
+            installed = get_availability_service().snapshot()["Ollama"].models
+            if installed:
+                params["model"] = installed[0]
+        speculative.observe(
+            user_id(),
+            st.session_state.get("current_image_bytes"),
+            lambda: (create_client(provider, **params), template),
+        )
+    else:
+        speculative.stop(user_id())
+
+# ── 디버그 패널 (?debug=1 또는 APP_PROFILING=1) ─────────────────────────────
+render_debug_panel("viewer")
@@ -1,14 +1,19 @@
 import os
 import sys
+import time
 
 # 앱 루트를 sys.path에 추가
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import streamlit as st
 
+from components.debug_panel import begin_rerun, render_debug_panel
+from components.stream_renderer import StreamRenderer
 from core.dicom_loader import extract_pixel_array, get_window_defaults, load_xray
 from core.image_processor import apply_windowing, array_to_png_bytes
-from utils.prompt_templates import PROMPT_TEMPLATES
+from utils.prompt_templates import DEFAULT_TEMPLATE, PROMPT_TEMPLATES
+from utils.session import user_id
+from utils.warmup import start_warmup
 
 st.set_page_config(
     page_title="LLM Analysis - Medical Readings",
@@ -20,47 +25,245 @@ st.set_page_config(
 for key, val in {
     "current_image_bytes": None,
     "last_report": "",
+    "active_job_id": None,
+    "compare_job_id": None,
 }.items():
     if key not in st.session_state:
         st.session_state[key] = val
 
+# 직접 이 페이지로 진입한 경우에도 워밍업 시작 (APP_WARMUP, 프로세스당 1회)
+start_warmup()
+
+# 단계별 지연 계측 (세션 레지스트리 연결, 패널은 페이지 끝에서 표시)
+begin_rerun()
+
 
 # ── LLM 가용성 확인 ──────────────────────────────────────────────────────────
-@st.cache_data(ttl=30, show_spinner=False)
 def check_availability() -> dict:
-    avail = {}
+    """공급자별 상태 스냅샷 (백그라운드 확인 결과만 읽음, 블로킹 없음)
+
+    패키지는 find_spec으로만 확인 — torch / transformers는 MedGemma로 실제
+    판독할 때 처음 임포트된다.
+    """
+    from llm.availability import get_availability_service
+    return get_availability_service().snapshot()
+
+
+# LLM 선택 → 이미지 최적화 공급자 프로필 (llm.image_payload.PROFILES)
+PROVIDER_PROFILES = {
+    "GPT": "openai",
+    "Gemini": "gemini",
+    "MedGemma": "medgemma",
+    "Ollama": "ollama",
+}
+
+
+def image_profile(llm: str) -> str:
+    """LLM 선택 → 공급자 프로필 (라우터는 최우선 백엔드 기준)"""
+    if llm == "Router":
+        from llm.router import router_backends
+        llm = router_backends()[0]
+    return PROVIDER_PROFILES.get(llm, "openai")
+
+
+def build_slab_parts(slabs, prompt: str):
+    """슬랩별 map 요청 + 요약용 전체 개요 이미지 (판독은 작업 워커에서 실행)"""
+
+    from core.montage import build_montage
+    from core.slabs import render_slab
+    from llm.image_payload import pixels_for_token_budget
+    from llm.map_reduce import MapPart, part_prompt
+
+    volume = st.session_state.ct_volume
+    spacing = st.session_state.get("ct_spacing")
+    z_mm = (spacing or (1.0, 1.0, 1.0))[0]
+    wc, ww = st.session_state.get("ct_window") or (40, 400)
+    max_pixels = pixels_for_token_budget(image_profile(selected_llm))
+
+    parts = []
+    for slab in slabs:
+        slab_montage = render_slab(volume, slab, wc, ww, spacing, max_pixels=max_pixels)
+        parts.append(MapPart(
+            label=slab.describe(z_mm),
+            images=[array_to_png_bytes(slab_montage.images[0])],
+            prompt=part_prompt(prompt, slab.describe(z_mm), slab_montage.captions[0]),
+        ))
+
+    overview = build_montage(volume, wc, ww, spacing=spacing, max_pixels=max_pixels)
+    return parts, [array_to_png_bytes(img) for img in overview.images]
+
+
+def render_slab_parts(job) -> None:
+    """슬랩 판독 결과를 완료 순서대로 표시 (map 단계가 진행 중이면 끝날 때까지 갱신)"""
+    total = job.meta["part_total"]
+    progress = st.progress(0.0, text="슬랩 판독 중...")
+    shown = 0
+    while True:
+        results = job.meta["parts"]
+        for result in results[shown:]:
+            icon = "✅" if result.ok else "⚠️"
+            with st.expander(f"{icon} {result.label} ({result.elapsed_s:.1f}s)"):
+                st.markdown(result.text if result.ok else f"분석 실패: {result.error}")
+        shown = len(results)
+        if "map_s" in job.meta or job.is_finished:
+            break
+        progress.progress(shown / total, text=f"슬랩 {shown}/{total} 완료")
+        job.wait(0.5)
+    progress.empty()
+
+    map_s = job.meta.get("map_s")
+    if map_s is not None:
+        results = job.meta["parts"]
+        st.caption(
+            f"슬랩 {total}개 병렬 판독 {map_s:.1f}s "
+            f"(가장 느린 슬랩 {max((r.elapsed_s for r in results), default=0.0):.1f}s, "
+            f"합계 {sum(r.elapsed_s for r in results):.1f}s)"
+        )
+
+
+def _comparison_columns(names):
+    cols = st.columns(len(names))
+    return {
+        name: {"header": col.container(), "body": col.empty(), "metrics": col.empty()}
+        for name, col in zip(names, cols)
+    }
+
+
+def _show_metrics(area, stats: dict) -> None:
+    if stats.get("error"):
+        area.error(stats["error"])
+        return
+    ttft = stats.get("ttft_s")
+    area.caption(
+        f"TTFT {ttft:.2f}s · 전체 {stats['total_s']:.2f}s · {stats['chars']:,}자"
+        if ttft is not None
+        else f"전체 {stats['total_s']:.2f}s · {stats['chars']:,}자"
+    )
 
-    avail["GPT"] = bool(os.getenv("OPENAI_API_KEY"))
-    avail["Gemini"] = bool(os.getenv("GOOGLE_API_KEY"))
 
-    try:
-        import torch  # noqa: F401
-        import transformers  # noqa: F401
-        avail["MedGemma"] = True
-    except ImportError:
-        avail["MedGemma"] = False
+def attach_comparison(manager, job) -> None:
+    """비교 작업에 연결 — 열마다 모델 응답을 버퍼 처음부터 이어서 표시"""
+    if not job.is_finished and st.button("⏹ 비교 중단", key=f"job_stop_{job.id}"):
+        manager.cancel(job.id)
+
+    columns = job.meta["columns"]
+    areas = _comparison_columns(list(columns))
+    renderers = {}
+    for name, column in columns.items():
+        areas[name]["header"].markdown(f"**{name}** · `{column['model']}`")
+        areas[name]["body"].markdown("대기 중..." if job.status == "queued" else "분석 중...")
+        renderers[name] = StreamRenderer(areas[name]["body"])
+
+    offsets = dict.fromkeys(columns, 0)
+    shown = set()
+    while True:
+        finished = job.is_finished
+        for name, column in columns.items():
+            chunks = column["chunks"][offsets[name]:]
+            offsets[name] += len(chunks)
+            for chunk in chunks:
+                renderers[name].feed(chunk, record=False)
+            if column["stats"] is not None and name not in shown:
+                shown.add(name)
+                renderers[name].finish()
+                _show_metrics(areas[name]["metrics"], column["stats"])
+        if finished:
+            break
+        job.wait(0.5)
+    for name in columns:
+        if name not in shown:
+            renderers[name].finish()
+
+    if job.status == "done":
+        slowest = max((c["stats"]["total_s"] for c in columns.values()), default=0.0)
+        st.caption(
+            f"전체 {job.finished - job.started:.2f}s (가장 느린 모델 {slowest:.2f}s)"
+        )
+    elif job.status == "error":
+        st.error(f"비교 실패: {job.error}")
+    elif job.status == "cancelled":
+        st.info("비교가 중단되었습니다.")
 
-    try:
-        import requests
-        host = os.getenv("OLLAMA_HOST", "http://localhost:11434")
-        resp = requests.get(f"{host}/api/tags", timeout=2)
-        avail["Ollama"] = resp.status_code == 200
-    except Exception:
-        avail["Ollama"] = False
 
-    return avail
+def _view_job(job) -> None:
+    """작업 목록 '보기' 콜백 — 비교 작업은 비교 모드로, 나머지는 판독 결과로 연결"""
+    if job.meta.get("kind") == "compare":
+        st.session_state.compare_job_id = job.id
+        st.session_state.compare_mode = True
+    else:
+        st.session_state.active_job_id = job.id
+        st.session_state.compare_mode = False
+
+
+def render_job_list(manager, owner: str) -> None:
+    """사용자 작업 목록 (보기 / 취소)"""
+    jobs = manager.list(owner)
+    if not jobs:
+        return
+    status_icon = {
+        "queued": "⏳", "running": "▶️", "done": "✅", "error": "⚠️", "cancelled": "⏹",
+    }
+    with st.expander(f"작업 목록 ({len(jobs)})"):
+        for job in jobs:
+            c1, c2, c3 = st.columns([6, 1, 1])
+            end = job.finished or time.time()
+            elapsed = f"{end - (job.started or job.created):.1f}s"
+            c1.markdown(
+                f"{status_icon.get(job.status, '')} **{job.label}** · "
+                f"{time.strftime('%H:%M:%S', time.localtime(job.created))} · {elapsed}"
+            )
+            c2.button("보기", key=f"job_view_{job.id}", on_click=_view_job, args=(job,))
+            if not job.is_finished and c3.button("취소", key=f"job_cancel_{job.id}"):
+                manager.cancel(job.id)
+                st.rerun()
+
+
+def attach_job(manager, job, placeholder) -> None:
+    """작업 스트림에 연결 — rerun / 페이지 이동 후에도 버퍼 처음부터 이어서 표시"""
+    if not job.is_finished:
+        if st.button("⏹ 판독 중단", key=f"job_stop_{job.id}"):
+            manager.cancel(job.id)
+        placeholder.markdown("대기 중..." if job.status == "queued" else "분석 중...")
+        if job.meta.get("kind") == "slabs":
+            render_slab_parts(job)
+            placeholder.markdown("요약 중...")
+        # 지표는 작업 워커가 기록 — 재연결 시 버퍼 재생은 측정하지 않음
+        StreamRenderer(placeholder).consume(job.stream(), record=False)
+    else:
+        if job.meta.get("kind") == "slabs":
+            render_slab_parts(job)
+        placeholder.markdown(job.text or " ")
+    if job.status == "done":
+        st.session_state.last_report = job.text
+        if job.metrics is not None:
+            st.caption(f"{job.label} · {job.metrics.describe()}")
+        route = job.meta.get("route")
+        if route:
+            st.caption(
+                f"응답 백엔드: {route['backend']}"
+                + (" (hedge)" if route["hedged"] else "")
+                + f" · 시도: {' → '.join(route['attempts'])}"
+            )
+    elif job.status == "error":
+        st.error(f"분석 실패: {job.error}")
+    elif job.status == "cancelled":
+        st.info("판독이 중단되었습니다.")
 
 
 # ── 사이드바: LLM 설정 ────────────────────────────────────────────────────────
 with st.sidebar:
     st.header("LLM 설정")
 
-    availability = check_availability()
+    provider_status = check_availability()
+    availability = {name: status.available for name, status in provider_status.items()}
 
     # 상태 표시
-    for name, avail in availability.items():
-        icon = "🟢" if avail else "🔴"
-        st.markdown(f"{icon} **{name}**")
+    for name, status in provider_status.items():
+        icon = "🟡" if status.pending else "🟢" if status.available else "🔴"
+        st.markdown(f"{icon} **{name}**" + (f" — {status.detail}" if status.detail else ""))
+    if st.button("상태 새로고침", key="availability_refresh"):
+        from llm.availability import get_availability_service
+        get_availability_service().refresh()
 
     st.markdown("---")
 
@@ -70,9 +273,22 @@ with st.sidebar:
         key="selected_llm_radio",
     )
 
-    if not availability[selected_llm]:
+    if provider_status[selected_llm].pending:
+        st.info(f"{selected_llm} 상태를 확인하는 중입니다. 잠시 후 다시 시도하세요.")
+    elif not availability[selected_llm]:
         st.warning(f"{selected_llm}를 사용할 수 없습니다.\n환경변수 또는 서비스를 확인하세요.")
 
+    compare_mode = st.checkbox("모델 비교 모드", key="compare_mode")
+    compare_llms = []
+    if compare_mode:
+        available_llms = [
+            name for name, avail in availability.items() if avail and name != "Router"
+        ]
+        compare_llms = st.multiselect(
+            "비교할 LLM", available_llms, default=available_llms, key="compare_llms"
+        )
+        st.caption("선택한 LLM에 동시에 요청합니다 (기본 모델: 환경변수 *_MODEL).")
+
     st.markdown("---")
     st.subheader("모델 파라미터")
 
@@ -101,24 +317,35 @@ with st.sidebar:
             )
 
     elif selected_llm == "Ollama":
-        ollama_model = "llava:13b"
-        try:
-            import requests as _req
-            host = os.getenv("OLLAMA_HOST", "http://localhost:11434")
-            resp = _req.get(f"{host}/api/tags", timeout=3)
-            if resp.status_code == 200:
-                model_list = [m["name"] for m in resp.json().get("models", [])]
-                if model_list:
-                    ollama_model = st.selectbox("Model", model_list)
-                else:
-                    st.info("설치된 모델 없음\n`ollama pull llava:13b`")
-                    ollama_model = st.text_input("Model name", "llava:13b")
-            else:
-                ollama_model = st.text_input("Model name", "llava:13b")
-        except Exception:
+        # 백그라운드 확인에서 받아 둔 모델 목록 (rerun마다 /api/tags 조회하지 않음)
+        model_list = provider_status["Ollama"].models
+        if model_list:
+            ollama_model = st.selectbox("Model", model_list)
+        else:
+            if availability["Ollama"]:
+                st.info("설치된 모델 없음\n`ollama pull llava:13b`")
             ollama_model = st.text_input("Model name", "llava:13b")
         temperature = st.slider("Temperature", 0.0, 1.0, 0.3, 0.05)
 
+    elif selected_llm == "Router":
+        from llm.router import router_backends
+        st.caption(
+            "백엔드 (우선순위): " + " → ".join(router_backends()) + "\n\n"
+            "첫 토큰이 늦으면 다음 백엔드로 hedge 요청, 연속 실패 시 회로 차단"
+        )
+
+    # 선택한 모델 파라미터 — Viewer 사전 판독도 같은 설정으로 클라이언트를 만들도록 보관
+    client_params = {}
+    if selected_llm == "GPT":
+        client_params = {"model": gpt_model, "temperature": temperature, "max_tokens": int(max_tokens)}
+    elif selected_llm == "Gemini":
+        client_params = {"model": gemini_model, "temperature": temperature, "max_tokens": int(max_tokens)}
+    elif selected_llm == "MedGemma":
+        client_params = {"model": medgemma_model, "max_new_tokens": int(max_new_tokens)}
+    elif selected_llm == "Ollama":
+        client_params = {"model": ollama_model, "temperature": temperature}
+    st.session_state.setdefault("llm_client_params", {})[selected_llm] = client_params
+
 
 # ── 메인 콘텐츠 ──────────────────────────────────────────────────────────────
 st.title("LLM Image Analysis")
@@ -139,6 +366,77 @@ with left_col:
     else:
         st.info("Viewer 페이지에서 이미지를 로드하거나, 아래에서 직접 업로드하세요.")
 
+    # CT: 현재 단면 대신 다중 슬라이스 몽타주 전송
+    montage = None
+    slabs = None
+    has_ct = (
+        st.session_state.get("modality") == "ct"
+        and st.session_state.get("ct_volume") is not None
+    )
+    if has_ct:
+        input_mode = st.radio(
+            "CT 입력",
+            ["현재 단면", "다중 슬라이스 몽타주", "전체 볼륨 (슬랩 분할)"],
+            horizontal=True,
+            key="ct_input_mode",
+        )
+        if input_mode == "다중 슬라이스 몽타주":
+            from core.montage import build_montage
+            from llm.image_payload import pixels_for_token_budget
+
+            c1, c2, c3 = st.columns(3)
+            counts = {
+                "axial": c1.number_input("Axial", 0, 24, 8, key="mt_axial"),
+                "sagittal": c2.number_input("Sagittal", 0, 12, 4, key="mt_sagittal"),
+                "coronal": c3.number_input("Coronal", 0, 12, 4, key="mt_coronal"),
+            }
+            strategy = st.selectbox(
+                "슬라이스 선택", ["variance", "even"],
+                format_func=lambda s: {"variance": "내용 분산 기준", "even": "등간격"}[s],
+            )
+            token_budget = st.number_input(
+                "이미지 토큰 예산", 256, 8192, 1536, step=256, key="mt_tokens"
+            )
+            per_plane = st.checkbox("평면별 이미지로 분리", value=False)
+
+            if sum(counts.values()) > 0:
+                provider = image_profile(selected_llm)
+                wc, ww = st.session_state.get("ct_window") or (40, 400)
+                montage = build_montage(
+                    st.session_state.ct_volume,
+                    wc,
+                    ww,
+                    spacing=st.session_state.get("ct_spacing"),
+                    counts=counts,
+                    max_pixels=pixels_for_token_budget(provider, int(token_budget)),
+                    strategy=strategy,
+                    per_plane=per_plane,
+                )
+                for img, caption in zip(montage.images, montage.captions):
+                    st.image(img, caption=caption, use_column_width=True)
+
+        elif input_mode == "전체 볼륨 (슬랩 분할)":
+            from core.slabs import split_slabs
+
+            c1, c2, c3 = st.columns(3)
+            split_mode = c1.selectbox(
+                "분할 방식", ["region", "fixed"],
+                format_func=lambda m: {"region": "부위 기준", "fixed": "고정 길이"}[m],
+            )
+            slab_mm = c2.number_input("슬랩 두께 (mm)", 20, 400, 80, step=10)
+            slab_concurrency = c3.number_input("동시 요청", 1, 16, 4)
+
+            z_mm = (st.session_state.get("ct_spacing") or (1.0, 1.0, 1.0))[0]
+            slabs = split_slabs(
+                st.session_state.ct_volume,
+                st.session_state.get("ct_spacing"),
+                mode=split_mode,
+                slab_mm=float(slab_mm),
+            )
+            st.caption(
+                f"슬랩 {len(slabs)}개: " + " · ".join(slab.describe(z_mm) for slab in slabs)
+            )
+
     with st.expander("직접 업로드 (DICOM / PNG / JPG)", expanded=not bool(current_bytes)):
         direct_upload = st.file_uploader(
             "파일 선택",
@@ -165,7 +463,11 @@ with left_col:
 with right_col:
     st.subheader("판독 요청")
 
-    prompt_key = st.selectbox("프롬프트 템플릿", list(PROMPT_TEMPLATES.keys()))
+    template_names = list(PROMPT_TEMPLATES.keys())
+    default_key = DEFAULT_TEMPLATE.get(st.session_state.get("modality"), template_names[0])
+    prompt_key = st.selectbox(
+        "프롬프트 템플릿", template_names, index=template_names.index(default_key)
+    )
     prompt = st.text_area(
         "프롬프트",
         value=PROMPT_TEMPLATES[prompt_key],
@@ -173,22 +475,34 @@ with right_col:
         key="llm_prompt_area",
     )
 
-    can_analyze = availability[selected_llm] and bool(
-        st.session_state.get("current_image_bytes")
-    )
+    has_input = bool(montage or slabs or st.session_state.get("current_image_bytes"))
+    if compare_mode:
+        can_analyze = has_input and bool(compare_llms) and not slabs
+        button_label = f"🔍 {len(compare_llms)}개 LLM 비교 판독"
+    else:
+        can_analyze = has_input and availability[selected_llm]
+        button_label = f"🔍 {selected_llm}로 판독 요청"
 
     analyze_btn = st.button(
-        f"🔍 {selected_llm}로 판독 요청",
+        button_label,
         type="primary",
         disabled=not can_analyze,
         use_container_width=True,
     )
 
-    if not st.session_state.get("current_image_bytes"):
+    if not has_input:
         st.warning("이미지를 먼저 불러오세요.")
-    elif not availability[selected_llm]:
+    elif compare_mode and slabs:
+        st.warning("전체 볼륨 (슬랩 분할) 입력은 비교 모드에서 지원하지 않습니다.")
+    elif compare_mode and not compare_llms:
+        st.warning("비교할 LLM을 선택하세요.")
+    elif not compare_mode and not availability[selected_llm]:
         st.warning(f"{selected_llm}가 사용 불가 상태입니다.")
 
+    from llm.jobs import JobLimitError, get_job_manager
+    job_manager = get_job_manager()
+    render_job_list(job_manager, user_id())
+
     st.markdown("---")
     st.subheader("판독 결과")
 
@@ -199,58 +513,73 @@ with right_col:
         report_placeholder.markdown(st.session_state.last_report)
 
     if analyze_btn:
-        image_bytes = st.session_state.current_image_bytes
-        report_text = ""
+        if montage is not None:
+            images = [array_to_png_bytes(img) for img in montage.images]
+            request_prompt = (
+                prompt + "\n\nImage layout:\n"
+                + "\n".join(f"- Image {i + 1}: {c}" for i, c in enumerate(montage.captions))
+            )
+        else:
+            images = [st.session_state.current_image_bytes]
+            request_prompt = prompt
 
+    if analyze_btn and not compare_mode:
         try:
-            # 클라이언트 인스턴스 생성
-            if selected_llm == "GPT":
-                from llm.gpt_client import GPTClient
-                client = GPTClient(
-                    model=gpt_model,
-                    temperature=temperature,
-                    max_tokens=int(max_tokens),
-                )
-            elif selected_llm == "Gemini":
-                from llm.gemini_client import GeminiClient
-                client = GeminiClient(
-                    model=gemini_model,
-                    temperature=temperature,
-                    max_tokens=int(max_tokens),
-                )
-            elif selected_llm == "MedGemma":
-                from llm.medgemma_client import MedGemmaClient
-                client = MedGemmaClient(
-                    model=medgemma_model,
-                    max_new_tokens=int(max_new_tokens),
-                )
-            elif selected_llm == "Ollama":
-                from llm.ollama_client import OllamaClient
-                client = OllamaClient(
-                    model=ollama_model,
-                    temperature=temperature,
+            # 클라이언트 인스턴스 생성 (팩토리에서 호출 텔레메트리 래핑,
+            # 라우터 백엔드는 라우터 생성 시 이미 래핑됨)
+            if selected_llm == "Router":
+                from llm.router import get_router
+                client = get_router()
+            else:
+                from llm.factory import create_client
+                client = create_client(selected_llm, **client_params)
+
+            # 전체 볼륨: 슬랩별 병렬 판독 → 요약 호출 (작업 1건)
+            if slabs:
+                parts, overview = build_slab_parts(slabs, prompt)
+                job = job_manager.submit_map_reduce(
+                    user_id(),
+                    client,
+                    parts,
+                    overview,
+                    prompt,
+                    label=f"{selected_llm} · {client.model_name} (슬랩 {len(parts)}개)",
+                    concurrency=int(slab_concurrency),
                 )
+                st.session_state.active_job_id = job.id
 
-            # 스트리밍 또는 블로킹 분석
-            if client.supports_streaming:
-                report_placeholder.markdown("분석 중...")
-                for chunk in client.stream_analyze(image_bytes, prompt):
-                    report_text += chunk
-                    report_placeholder.markdown(report_text + " ▌")
-                report_placeholder.markdown(report_text)
+            # 백그라운드 작업으로 제출 (rerun / 페이지 이동과 무관하게 진행)
             else:
-                with st.spinner(f"{selected_llm} 분석 중..."):
-                    report_text = client.analyze(image_bytes, prompt)
-                report_placeholder.markdown(report_text)
-
-            st.session_state.last_report = report_text
-
+                # Viewer에서 같은 조건으로 시작된 사전 판독이 있으면 연결
+                from llm.speculative import get_speculative_analyzer
+                speculative = get_speculative_analyzer()
+                job = None
+                if speculative is not None and montage is None:
+                    job = speculative.claim(
+                        user_id(), images[0], request_prompt, selected_llm, client
+                    )
+                if job is None:
+                    job = job_manager.submit_analysis(
+                        user_id(),
+                        client,
+                        images,
+                        request_prompt,
+                        label=f"{selected_llm} · {client.model_name}",
+                    )
+                st.session_state.active_job_id = job.id
+
+        except JobLimitError as e:
+            st.warning(str(e))
         except Exception as e:
             st.error(f"분석 실패: {e}")
-            report_text = ""
+
+    # 진행 중 / 선택한 작업에 연결 (rerun, 페이지 이동 후 재연결)
+    active_job = job_manager.get(st.session_state.get("active_job_id"))
+    if active_job is not None and not compare_mode:
+        attach_job(job_manager, active_job, report_placeholder)
 
     # 다운로드 버튼
-    if st.session_state.get("last_report"):
+    if st.session_state.get("last_report") and not compare_mode:
         st.download_button(
             "📄 판독문 다운로드 (.md)",
             data=st.session_state.last_report,
@@ -258,3 +587,39 @@ with right_col:
             mime="text/markdown",
             use_container_width=True,
         )
+
+
+# ── 모델 비교 결과 (전체 폭) ──────────────────────────────────────────────────
+if compare_mode:
+    st.markdown("---")
+    st.subheader("모델 비교")
+
+    if analyze_btn:
+        from llm.factory import create_default_client
+
+        clients = {}
+        for name in compare_llms:
+            try:
+                clients[name] = create_default_client(name)
+            except Exception as e:
+                st.error(f"{name} 클라이언트 생성 실패: {e}")
+        if clients:
+            try:
+                job = job_manager.submit_comparison(
+                    user_id(),
+                    clients,
+                    images,
+                    request_prompt,
+                    label=f"모델 비교 · {', '.join(clients)}",
+                )
+                st.session_state.compare_job_id = job.id
+            except JobLimitError as e:
+                st.warning(str(e))
+
+    # 진행 중 / 선택한 비교 작업에 연결
+    compare_job = job_manager.get(st.session_state.get("compare_job_id"))
+    if compare_job is not None:
+        attach_comparison(job_manager, compare_job)
+
+# ── 디버그 패널 (?debug=1 또는 APP_PROFILING=1) ─────────────────────────────
+render_debug_panel("llm_analysis")
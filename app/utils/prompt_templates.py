@@ -60,3 +60,9 @@ PROMPT_TEMPLATES = {
     "X-ray (한국어)": XRAY_PROMPT_KO,
     "CT (한국어)": CT_PROMPT_KO,
 }
+
+# 모달리티별 기본 템플릿 (LLM 페이지 초기 선택 / 사전 판독)
+DEFAULT_TEMPLATE = {
+    "xray": "X-ray (English)",
+    "ct": "CT (English)",
+}
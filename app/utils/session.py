@@ -0,0 +1,16 @@
+"""세션 유틸리티 - 페이지 간 공유하는 사용자 식별"""
+
+import uuid
+
+import streamlit as st
+
+
+def user_id() -> str:
+    """작업 소유자 id — URL 쿼리(uid)에 보관해 새로고침 후에도 같은 작업 목록 유지"""
+    uid = st.query_params.get("uid") or st.session_state.get("user_id")
+    if not uid:
+        uid = uuid.uuid4().hex[:12]
+    if st.query_params.get("uid") != uid:
+        st.query_params["uid"] = uid
+    st.session_state.user_id = uid
+    return uid
@@ -0,0 +1,78 @@
+"""서버 시작 후 백그라운드 워밍업 (무거운 모듈 사전 임포트 / 초기화)
+
+페이지는 matplotlib · pydicom · LLM SDK를 첫 사용 시점에 임포트한다.
+워밍업을 켜면 첫 세션이 시작될 때 백그라운드 스레드가 이 모듈들을 미리
+임포트하고 렌더러 · HTTP 세션 · 가용성 서비스를 초기화해, 이후 첫 뷰어
+렌더링 / 첫 판독 요청이 임포트 비용을 치르지 않게 한다.
+
+환경변수:
+  APP_WARMUP   1이면 워밍업 실행 (기본 비활성)
+"""
+
+import importlib
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+# 사전 임포트 대상 (미설치 패키지는 건너뜀)
+WARMUP_MODULES = (
+    "pydicom",
+    "nibabel",
+    "matplotlib.pyplot",
+    "requests",
+    "openai",
+    "google.generativeai",
+)
+
+_thread: Optional[threading.Thread] = None
+_lock = threading.Lock()
+timings: Dict[str, float] = {}   # 단계 → 소요 초 (실패 / 미설치는 -1)
+
+
+def warmup_enabled() -> bool:
+    return os.getenv("APP_WARMUP", "").lower() in ("1", "true", "yes")
+
+
+def _step(name: str, fn) -> None:
+    started = time.perf_counter()
+    try:
+        fn()
+        timings[name] = time.perf_counter() - started
+    except Exception:
+        timings[name] = -1.0
+
+
+def _warmup() -> None:
+    for module in WARMUP_MODULES:
+        _step(f"import {module}", lambda m=module: importlib.import_module(m))
+
+    def render():
+        import numpy as np
+
+        from core.renderer import render_xray_png
+        render_xray_png(np.zeros((8, 8), dtype=np.uint8))   # Agg 백엔드 / 폰트 캐시
+
+    def transport():
+        from llm import transport
+        transport.get_session()
+
+    def availability():
+        from llm.availability import get_availability_service
+        get_availability_service()
+
+    _step("render", render)
+    _step("transport", transport)
+    _step("availability", availability)
+
+
+def start_warmup(force: bool = False) -> Optional[threading.Thread]:
+    """프로세스당 1회 워밍업 스레드 시작 (APP_WARMUP 미설정 시 None)"""
+    global _thread
+    if not (force or warmup_enabled()):
+        return None
+    with _lock:
+        if _thread is None:
+            _thread = threading.Thread(target=_warmup, name="app-warmup", daemon=True)
+            _thread.start()
+        return _thread